@@ -5,7 +5,20 @@ from flask import Flask
 from . import config
 from .blueprints import register_blueprints
 from .cli import register_cli_commands
-from .extensions import csrf, db, limiter, login_manager, mail, migrate
+from .extensions import (
+    bracket_events,
+    cache,
+    csrf,
+    db,
+    hashing_executor,
+    limiter,
+    login_manager,
+    mail,
+    mail_queue,
+    metrics,
+    migrate,
+    sql_instrumentation,
+)
 
 
 def create_app(config_name: Optional[str] = None) -> Flask:
@@ -23,12 +36,21 @@ def create_app(config_name: Optional[str] = None) -> Flask:
 def register_extensions(app: Flask) -> None:
     db.init_app(app)
     migrate.init_app(app, db)
+    sql_instrumentation.init_app(app, db)
+    metrics.init_app(app, db)
     login_manager.init_app(app)
     login_manager.login_view = "auth.login"
     login_manager.login_message_category = "warning"
     mail.init_app(app)
+    mail_queue.init_app(app)
     csrf.init_app(app)
     limiter.init_app(app)
+    cache.init_app(app)
+    bracket_events.init_app(app)
+    hashing_executor.init_app(app)
+    # mapper events that drop cached pages when tournaments change
+    from .services import invalidation  # noqa: F401
+
     # user loader for Flask-Login
     from .models import User
 
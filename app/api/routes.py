@@ -0,0 +1,273 @@
+"""Read-only JSON API (``/api/v1``) for the mobile and scoreboard clients.
+
+* ``?fields=id,name,start_at`` returns only the listed fields, and only
+  those columns are loaded;
+* the bracket comes as arrays under a ``columns`` header instead of nested
+  objects, and is cached per bracket version like ``bracket.json``;
+* every response carries a weak ETag, so ``If-None-Match`` gets a 304
+  whatever encoding was used;
+* bodies of at least ``API_GZIP_MIN_SIZE`` bytes are gzipped for clients
+  that accept it.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import datetime
+from typing import Optional
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request, url_for
+from marshmallow import Schema
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import HTTPException
+
+from ..extensions import cache, db
+from ..models import Match, Tournament, TournamentParticipant
+from ..services.cache import BRACKETS, make_etag, not_modified, with_etag
+from ..services.pagination import keyset_paginate
+from ..services.search import search_tournaments
+from .schemas import (
+    BRACKET_MATCH_COLUMNS,
+    BRACKET_PLAYER_COLUMNS,
+    MatchSchema,
+    ParticipantSchema,
+    TournamentSchema,
+)
+from .spec import build_spec
+
+api_bp = Blueprint("api", __name__)
+
+
+@api_bp.errorhandler(HTTPException)
+def _json_error(error: HTTPException):
+    return jsonify({"error": error.name, "message": error.description}), error.code
+
+
+@api_bp.after_request
+def _gzip(response: Response) -> Response:
+    min_size = current_app.config.get("API_GZIP_MIN_SIZE")
+    if (
+        min_size is None
+        or response.status_code != 200
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    if "gzip" not in request.accept_encodings:
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+    # mtime=0 keeps the output, and so its length, the same for equal bodies
+    response.set_data(
+        gzip.compress(body, compresslevel=current_app.config.get("API_GZIP_LEVEL", 6), mtime=0)
+    )
+    response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def _selected_fields(schema: type[Schema]) -> Optional[tuple[str, ...]]:
+    raw = request.args.get("fields", "")
+    names = tuple(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    if not names:
+        return None
+    unknown = [name for name in names if name not in schema._declared_fields]
+    if unknown:
+        abort(400, description=f"Unknown fields: {', '.join(unknown)}.")
+    return names
+
+
+def _columns(model, names: Optional[tuple[str, ...]], *required: str):
+    """``load_only`` option for the selected fields plus the ``required`` keys."""
+    if names is None:
+        return None
+    return load_only(*(getattr(model, name) for name in dict.fromkeys(names + required)))
+
+
+def _json(payload, etag: Optional[str] = None) -> Response:
+    """Serialise ``payload``, tagged with ``etag`` or a digest of the body."""
+    body = json.dumps(payload, separators=(",", ":"))
+    etag = etag or make_etag(body)
+    response = not_modified(etag, weak=True)
+    if response is not None:
+        return response
+    return with_etag(Response(body, mimetype="application/json"), etag, weak=True)
+
+
+def _page_size() -> int:
+    default = current_app.config.get("TOURNAMENTS_PER_PAGE", 10)
+    size = request.args.get("limit", default, type=int)
+    return max(1, min(size, current_app.config.get("API_MAX_PAGE_SIZE", 100)))
+
+
+def _tournament_or_404(tournament_id: int, *columns) -> tuple:
+    row = (
+        db.session.query(*columns).filter(Tournament.id == tournament_id).first()
+        if columns
+        else db.session.get(Tournament, tournament_id)
+    )
+    if row is None:
+        abort(404, description="Tournament not found.")
+    return row
+
+
+@api_bp.get("/tournaments")
+def list_tournaments():
+    """Upcoming tournaments, by start date or by relevance with ``q``."""
+    only = _selected_fields(TournamentSchema)
+    per_page = _page_size()
+    q = request.args.get("q", "").strip()
+
+    query = Tournament.query.filter(Tournament.start_at >= datetime.utcnow())
+    option = _columns(Tournament, only, "id", "start_at")
+    if option is not None:
+        query = query.options(option)
+
+    # The next-page link keeps the page size and field selection
+    link_args = {"limit": per_page, "fields": request.args.get("fields") or None}
+    if q:
+        # Relevance has no stable key to seek on, so results use page numbers
+        pagination = search_tournaments(query, q).paginate(
+            page=request.args.get("page", 1, type=int), per_page=per_page, error_out=False
+        )
+        items = pagination.items
+        next_link = (
+            url_for(".list_tournaments", q=q, page=pagination.next_num, **link_args)
+            if pagination.has_next
+            else None
+        )
+    else:
+        page = keyset_paginate(query, request.args.get("cursor"), per_page)
+        items = page.items
+        next_link = (
+            url_for(".list_tournaments", cursor=page.next_cursor, **link_args)
+            if page.has_next
+            else None
+        )
+
+    return _json(
+        {"items": TournamentSchema(only=only, many=True).dump(items), "links": {"next": next_link}}
+    )
+
+
+@api_bp.get("/tournaments/<int:tournament_id>")
+def tournament_detail(tournament_id: int):
+    only = _selected_fields(TournamentSchema)
+    tournament = _tournament_or_404(tournament_id)
+    etag = make_etag(
+        "api-tournament",
+        tournament.id,
+        tournament.updated_at,
+        tournament.participant_count,
+        tournament.bracket_version,
+        only,
+    )
+    response = not_modified(etag, weak=True)
+    if response is not None:
+        return response
+    return _json(TournamentSchema(only=only).dump(tournament), etag)
+
+
+@api_bp.get("/tournaments/<int:tournament_id>/participants")
+def tournament_participants(tournament_id: int):
+    only = _selected_fields(ParticipantSchema)
+    _tournament_or_404(tournament_id, Tournament.id)
+    query = TournamentParticipant.query.filter_by(tournament_id=tournament_id).order_by(
+        TournamentParticipant.ranking.asc()
+    )
+    option = _columns(TournamentParticipant, only, "id")
+    if option is not None:
+        query = query.options(option)
+    return _json({"items": ParticipantSchema(only=only, many=True).dump(query.all())})
+
+
+@api_bp.get("/tournaments/<int:tournament_id>/matches")
+def tournament_matches(tournament_id: int):
+    """Every match as an object; ``/bracket`` is the compact form."""
+    only = _selected_fields(MatchSchema)
+    _tournament_or_404(tournament_id, Tournament.id)
+    query = Match.query.filter_by(tournament_id=tournament_id).order_by(
+        Match.round_number.asc(), Match.bracket_position.asc(), Match.id.asc()
+    )
+    if request.args.get("stage"):
+        query = query.filter(Match.stage == request.args["stage"])
+    option = _columns(Match, only, "id")
+    if option is not None:
+        query = query.options(option)
+    return _json({"items": MatchSchema(only=only, many=True).dump(query.all())})
+
+
+@api_bp.get("/matches/<int:match_id>")
+def match_detail(match_id: int):
+    only = _selected_fields(MatchSchema)
+    match = db.session.get(Match, match_id)
+    if match is None:
+        abort(404, description="Match not found.")
+    return _json(MatchSchema(only=only).dump(match))
+
+
+def _compact_bracket(tournament_id: int) -> dict:
+    # Plain column tuples: no ORM objects, no joins, one row per array
+    matches = (
+        db.session.query(*(getattr(Match, name) for name in BRACKET_MATCH_COLUMNS))
+        .filter(Match.tournament_id == tournament_id)
+        .order_by(Match.round_number.asc(), Match.bracket_position.asc(), Match.id.asc())
+        .all()
+    )
+    players = (
+        db.session.query(
+            *(getattr(TournamentParticipant, name) for name in BRACKET_PLAYER_COLUMNS)
+        )
+        .filter(
+            TournamentParticipant.tournament_id == tournament_id,
+            TournamentParticipant.status != TournamentParticipant.STATUS_WAITLISTED,
+        )
+        .order_by(TournamentParticipant.ranking.asc())
+        .all()
+    )
+    return {
+        "players": {"columns": BRACKET_PLAYER_COLUMNS, "rows": [list(row) for row in players]},
+        "matches": {"columns": BRACKET_MATCH_COLUMNS, "rows": [list(row) for row in matches]},
+    }
+
+
+@api_bp.get("/tournaments/<int:tournament_id>/bracket")
+def tournament_bracket(tournament_id: int):
+    """The bracket as arrays, revalidated and cached on its version."""
+    status, version, bracket_format = _tournament_or_404(
+        tournament_id, Tournament.status, Tournament.bracket_version, Tournament.bracket_format
+    )
+    etag = make_etag("api-bracket", tournament_id, version)
+    response = not_modified(etag, weak=True)
+    if response is not None:
+        return response
+
+    body = cache.get_or_set(
+        BRACKETS,
+        (tournament_id, version, "api"),
+        lambda: json.dumps(
+            {
+                "tournament_id": tournament_id,
+                "status": status,
+                "format": bracket_format,
+                "version": version,
+                **(
+                    _compact_bracket(tournament_id)
+                    if status != Tournament.STATUS_DRAFT
+                    else {
+                        "players": {"columns": BRACKET_PLAYER_COLUMNS, "rows": []},
+                        "matches": {"columns": BRACKET_MATCH_COLUMNS, "rows": []},
+                    }
+                ),
+            },
+            separators=(",", ":"),
+        ),
+        ttl=current_app.config.get("CACHE_BRACKET_TTL"),
+    )
+    return with_etag(Response(body, mimetype="application/json"), etag, weak=True)
+
+
+@api_bp.get("/openapi.json")
+def openapi():
+    return jsonify(build_spec())
@@ -0,0 +1,71 @@
+"""Marshmallow schemas of the read-only API.
+
+Every field maps to the model column of the same name, so a ``fields``
+selection can also narrow the columns loaded from the database.
+"""
+from __future__ import annotations
+
+from marshmallow import Schema, fields
+
+
+class TournamentSchema(Schema):
+    id = fields.Integer()
+    name = fields.String()
+    discipline = fields.String()
+    description = fields.String(allow_none=True)
+    venue_name = fields.String(allow_none=True)
+    location_lat = fields.Float(allow_none=True)
+    location_lng = fields.Float(allow_none=True)
+    google_maps_url = fields.String(allow_none=True)
+    start_at = fields.DateTime()
+    signup_deadline = fields.DateTime()
+    max_participants = fields.Integer()
+    participant_count = fields.Integer()
+    status = fields.String()
+    bracket_format = fields.String()
+    bracket_version = fields.Integer()
+    bracket_size = fields.Integer(allow_none=True)
+    total_rounds = fields.Integer(allow_none=True)
+    organizer_id = fields.Integer()
+    created_at = fields.DateTime()
+    updated_at = fields.DateTime()
+
+
+class ParticipantSchema(Schema):
+    id = fields.Integer()
+    tournament_id = fields.Integer()
+    user_id = fields.Integer()
+    license_number = fields.String()
+    ranking = fields.Integer()
+    seed = fields.Integer(allow_none=True)
+    status = fields.String()
+
+
+class MatchSchema(Schema):
+    id = fields.Integer()
+    tournament_id = fields.Integer()
+    stage = fields.String()
+    round_number = fields.Integer()
+    bracket_position = fields.Integer()
+    player_a_id = fields.Integer(allow_none=True)
+    player_b_id = fields.Integer(allow_none=True)
+    winner_id = fields.Integer(allow_none=True)
+    next_match_id = fields.Integer(allow_none=True)
+    next_slot = fields.String(allow_none=True)
+    loser_next_match_id = fields.Integer(allow_none=True)
+    loser_next_slot = fields.String(allow_none=True)
+    updated_at = fields.DateTime()
+
+
+#: Columns of the compact bracket, in order: one array per match.
+BRACKET_MATCH_COLUMNS = (
+    "id",
+    "stage",
+    "round_number",
+    "bracket_position",
+    "player_a_id",
+    "player_b_id",
+    "winner_id",
+)
+#: Columns of the players listed next to the compact bracket.
+BRACKET_PLAYER_COLUMNS = ("id", "ranking", "license_number", "seed")
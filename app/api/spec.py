@@ -0,0 +1,112 @@
+"""OpenAPI description of ``/api/v1``, built from the Marshmallow schemas."""
+from __future__ import annotations
+
+from apispec import APISpec
+from apispec.ext.marshmallow import MarshmallowPlugin
+
+from .schemas import MatchSchema, ParticipantSchema, TournamentSchema
+
+_FIELDS = {
+    "name": "fields",
+    "in": "query",
+    "schema": {"type": "string"},
+    "description": "Comma-separated fields to return.",
+}
+_ID = {"in": "path", "required": True, "schema": {"type": "integer"}}
+
+
+def _list_of(schema: str) -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            "items": {"type": "array", "items": {"$ref": f"#/components/schemas/{schema}"}}
+        },
+    }
+
+
+def _ok(description: str, schema: dict) -> dict:
+    return {
+        "200": {"description": description, "content": {"application/json": {"schema": schema}}},
+        "304": {"description": "Not modified (If-None-Match)."},
+    }
+
+
+def build_spec() -> dict:
+    spec = APISpec(
+        title="Tournaments API",
+        version="1",
+        openapi_version="3.0.3",
+        plugins=[MarshmallowPlugin()],
+    )
+    spec.components.schema("Tournament", schema=TournamentSchema)
+    spec.components.schema("Participant", schema=ParticipantSchema)
+    spec.components.schema("Match", schema=MatchSchema)
+
+    tournament_id = {"name": "tournament_id", **_ID}
+    spec.path(
+        path="/api/v1/tournaments",
+        operations={
+            "get": {
+                "summary": "Upcoming tournaments.",
+                "parameters": [
+                    _FIELDS,
+                    {"name": "q", "in": "query", "schema": {"type": "string"}},
+                    {"name": "cursor", "in": "query", "schema": {"type": "string"}},
+                    {"name": "page", "in": "query", "schema": {"type": "integer"}},
+                    {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+                ],
+                "responses": _ok("Tournaments and the next page link.", _list_of("Tournament")),
+            }
+        },
+    )
+    spec.path(
+        path="/api/v1/tournaments/{tournament_id}",
+        operations={
+            "get": {
+                "parameters": [tournament_id, _FIELDS],
+                "responses": _ok("The tournament.", {"$ref": "#/components/schemas/Tournament"}),
+            }
+        },
+    )
+    spec.path(
+        path="/api/v1/tournaments/{tournament_id}/participants",
+        operations={
+            "get": {
+                "parameters": [tournament_id, _FIELDS],
+                "responses": _ok("Participants by ranking.", _list_of("Participant")),
+            }
+        },
+    )
+    spec.path(
+        path="/api/v1/tournaments/{tournament_id}/matches",
+        operations={
+            "get": {
+                "parameters": [
+                    tournament_id,
+                    _FIELDS,
+                    {"name": "stage", "in": "query", "schema": {"type": "string"}},
+                ],
+                "responses": _ok("Matches by round and position.", _list_of("Match")),
+            }
+        },
+    )
+    spec.path(
+        path="/api/v1/tournaments/{tournament_id}/bracket",
+        operations={
+            "get": {
+                "summary": "Players and matches as arrays, in the order of their columns.",
+                "parameters": [tournament_id],
+                "responses": _ok("Compact bracket.", {"type": "object"}),
+            }
+        },
+    )
+    spec.path(
+        path="/api/v1/matches/{match_id}",
+        operations={
+            "get": {
+                "parameters": [{"name": "match_id", **_ID}, _FIELDS],
+                "responses": _ok("The match.", {"$ref": "#/components/schemas/Match"}),
+            }
+        },
+    )
+    return spec.to_dict()
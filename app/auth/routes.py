@@ -55,6 +55,9 @@ def login():
                 flash("Please confirm your account before logging in.", "warning")
                 return redirect(url_for("auth.login"))
             login_user(user)
+            if db.session.is_modified(user):
+                # verify_password upgraded the stored hash
+                db.session.commit()
             flash("Logged in successfully.", "success")
             return redirect(url_for("core.index"))
         flash("Invalid credentials.", "danger")
@@ -1,7 +1,7 @@
 from itsdangerous import URLSafeTimedSerializer
 from flask import current_app
 from flask_mail import Message
-from ..extensions import mail
+from ..extensions import mail_queue
 
 
 def _get_serializer():
@@ -38,13 +38,9 @@ def send_confirmation_email(to_email: str, confirm_url: str) -> None:
         "This link expires in 24 hours."
     )
     msg = Message(subject=subject, sender=sender, recipients=[to_email], body=body)
-    try:
-        mail.send(msg)
-    except Exception:
-        # Mail server might not be configured in development. Silently log instead.
-        current_app.logger.info(
-            "Confirmation email (dev): %s -> %s", to_email, confirm_url
-        )
+    # Delivered in the background; undeliverable mail is logged with its body
+    # (and link) by the mail queue, as before when no server is configured.
+    mail_queue.send(msg)
 
 
 def send_password_reset_email(to_email: str, reset_url: str) -> None:
@@ -56,9 +52,4 @@ def send_password_reset_email(to_email: str, reset_url: str) -> None:
         "If you did not request this, you can ignore this email."
     )
     msg = Message(subject=subject, sender=sender, recipients=[to_email], body=body)
-    try:
-        mail.send(msg)
-    except Exception:
-        current_app.logger.info(
-            "Password reset email (dev): %s -> %s", to_email, reset_url
-        )
+    mail_queue.send(msg)
@@ -1,5 +1,6 @@
 from flask import Flask
 
+from .api.routes import api_bp
 from .auth.routes import auth_bp
 from .core.routes import core_bp
 from .matches.routes import matches_bp
@@ -13,3 +14,4 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(tournaments_bp, url_prefix="/tournaments")
     app.register_blueprint(matches_bp, url_prefix="/matches")
     app.register_blueprint(users_bp, url_prefix="/me")
+    app.register_blueprint(api_bp, url_prefix="/api/v1")
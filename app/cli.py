@@ -1,9 +1,22 @@
 import click
 from flask import Flask
-from sqlalchemy import func
 
 from .extensions import db
 
+SEED_PASSWORD = "Password123!"
+
+
+def _set_seed_passwords(users: list) -> None:
+    """Hash the passwords of freshly created seed users in one batch.
+
+    The batch is spread over the hashing pool when PASSWORD_HASH_WORKERS
+    is set, instead of hashing user after user.
+    """
+    from .services.passwords import hash_passwords
+
+    for user, hashed in zip(users, hash_passwords([SEED_PASSWORD] * len(users))):
+        user.password_hash = hashed
+
 
 def register_cli_commands(app: Flask) -> None:
     @app.cli.command("create-admin")
@@ -27,6 +40,194 @@ def register_cli_commands(app: Flask) -> None:
         db.session.commit()
         click.echo("Admin user created")
 
+    @app.cli.command("seed-due-brackets")
+    @click.option("--loop", is_flag=True, help="Keep running as a scheduler worker.")
+    @click.option("--interval", default=60, show_default=True, help="Seconds between runs.")
+    def seed_due_brackets(loop: bool, interval: int) -> None:
+        """Seed the bracket of every tournament whose signup deadline has passed."""
+        import time
+
+        from .services.seeding import seed_due_tournaments
+
+        while True:
+            seeded = seed_due_tournaments()
+            if seeded:
+                click.echo(f"Seeded tournaments: {', '.join(str(tid) for tid in seeded)}")
+            elif not loop:
+                click.echo("No tournaments to seed.")
+            if not loop:
+                return
+            db.session.remove()
+            time.sleep(interval)
+
+    @app.cli.command("rebuild-pending-matches")
+    def rebuild_pending_matches_command() -> None:
+        """Recompute the materialised pending_matches table used by /me."""
+        from .services.dashboard import rebuild_pending_matches
+
+        count = rebuild_pending_matches()
+        db.session.commit()
+        click.echo(f"Pending matches rebuilt: {count} rows.")
+
+    @app.cli.command("signup-load-test")
+    @click.option(
+        "--engine",
+        "engines",
+        multiple=True,
+        help="Signup engine to measure (repeatable; default: all).",
+    )
+    @click.option("--applicants", default=200, show_default=True)
+    @click.option("--seats", default=64, show_default=True)
+    @click.option("--threads", default=16, show_default=True)
+    def signup_load_test(
+        engines: tuple[str, ...], applicants: int, seats: int, threads: int
+    ) -> None:
+        """Hammer a throwaway tournament with concurrent signups and compare engines."""
+        from .services.signup_load import run_signup_load
+        from .services.signups import ENGINES
+
+        for engine in engines or sorted(ENGINES):
+            report = run_signup_load(
+                app, engine, applicants=applicants, seats=seats, threads=threads
+            )
+            click.echo(report.summary())
+
+    @app.cli.command("report-load-test")
+    @click.option("--matches", default=64, show_default=True, help="A power of two.")
+    @click.option("--threads", default=16, show_default=True, help="An even number.")
+    def report_load_test(matches: int, threads: int) -> None:
+        """Have both players of every match report at once; check for lost updates."""
+        from .services.report_load import run_report_load
+
+        try:
+            report = run_report_load(app, matches=matches, threads=threads)
+        except ValueError as exc:
+            raise click.BadParameter(str(exc)) from exc
+        click.echo(report.summary())
+
+    @app.cli.command("tune-password-hashing")
+    @click.option(
+        "--target-ms", default=250, show_default=True, help="Verification time to aim for."
+    )
+    @click.option(
+        "--memory", "memory_cost", default=65536, show_default=True, help="Argon2 memory in KiB."
+    )
+    @click.option(
+        "--parallelism", default=None, type=int, help="Argon2 lanes (default: configured)."
+    )
+    def tune_password_hashing(target_ms: int, memory_cost: int, parallelism) -> None:
+        """Find the Argon2 costs that make one login take about --target-ms here."""
+        from .services.passwords import (
+            Argon2Hasher,
+            calibrate_argon2,
+            get_hasher,
+            time_verification,
+        )
+
+        current = get_hasher()
+        click.echo(
+            f"Configured {current}: {time_verification(current) * 1000:.1f} ms per verification"
+        )
+        result = calibrate_argon2(
+            target_ms / 1000,
+            memory_cost=memory_cost,
+            parallelism=parallelism or app.config["ARGON2_PARALLELISM"],
+        )
+        click.echo(
+            f"Argon2id t={result.time_cost} m={result.memory_cost} p={result.parallelism}: "
+            f"{result.seconds * 1000:.1f} ms per verification"
+        )
+        click.echo("Set in the environment:")
+        for line in result.config_lines():
+            click.echo(f"  {line}")
+        if isinstance(current, Argon2Hasher) and (
+            current.time_cost, current.memory_cost, current.parallelism
+        ) != (result.time_cost, result.memory_cost, result.parallelism):
+            click.echo("Existing hashes are upgraded to the new costs as users log in.")
+
+    @app.cli.command("smtp-stub")
+    @click.option("--host", default="127.0.0.1", show_default=True)
+    @click.option("--port", default=1025, show_default=True)
+    def smtp_stub(host: str, port: int) -> None:
+        """Run a local SMTP server that accepts and prints every message."""
+        import time
+
+        from .services.smtp_stub import SMTPStub
+
+        stub = SMTPStub(host, port)
+        click.echo(f"SMTP stub listening on {stub.host}:{stub.port}")
+        seen = 0
+        stub.start()
+        try:
+            while True:
+                time.sleep(0.5)
+                for received in stub.messages[seen:]:
+                    click.echo(f"--- {received.sender} -> {', '.join(received.recipients)}")
+                    click.echo(received.data.decode("utf-8", "replace"))
+                    seen += 1
+        except KeyboardInterrupt:
+            stub.stop()
+
+    @app.cli.command("seed-load")
+    @click.option("--users", default=10_000, show_default=True)
+    @click.option("--tournaments", default=500, show_default=True)
+    @click.option(
+        "--chunk-size", default=100, show_default=True, help="Tournaments per transaction."
+    )
+    @click.option("--workers", default=4, show_default=True, help="Parallel writers (1 on SQLite).")
+    @click.option("--seed", type=int, default=None, help="Random seed, for repeatable data.")
+    def seed_load(users: int, tournaments: int, chunk_size: int, workers: int, seed) -> None:
+        """Bulk-generate users, tournaments and played brackets for load testing."""
+        from .services.load_data import LoadPlan, generate_load_data
+
+        if users < 2:
+            raise click.BadParameter("at least 2 users are needed", param_hint="--users")
+        plan = LoadPlan(
+            users=users,
+            tournaments=tournaments,
+            chunk_size=chunk_size,
+            workers=workers,
+            seed=seed,
+        )
+        click.echo(f"Generated {generate_load_data(app, plan).summary()}")
+
+    @app.cli.command("enter-results")
+    @click.argument("tournament_id", type=int)
+    @click.argument("sheet", type=click.File("r"), default="-")
+    @click.option("--partial", is_flag=True, help="Record the valid rows even if others fail.")
+    @click.option("--dry-run", is_flag=True, help="Only validate the sheet.")
+    def enter_results(tournament_id: int, sheet, partial: bool, dry_run: bool) -> None:
+        """Record a score sheet: CSV lines "match_id,winner" (stdin by default).
+
+        The winner is a participant id or the slot "a"/"b"; blank lines,
+        "#" comments and a header line are skipped.
+        """
+        import csv
+
+        from .services.batch_results import ResultRow, apply_results, parse_winner
+
+        rows = []
+        for line_number, record in enumerate(csv.reader(sheet), 1):
+            if not record or not record[0].strip() or record[0].lstrip().startswith("#"):
+                continue
+            try:
+                rows.append(ResultRow(int(record[0]), parse_winner(record[1])))
+            except (IndexError, ValueError):
+                if line_number == 1:
+                    continue  # header
+                raise click.BadParameter(f"line {line_number}: expected match_id,winner")
+
+        result = apply_results(tournament_id, rows, partial=partial, dry_run=dry_run)
+        for outcome in result.outcomes:
+            detail = f" ({outcome.message})" if outcome.message else ""
+            click.echo(f"match {outcome.match_id}: {outcome.status}{detail}")
+        summary = ", ".join(
+            f"{count} {status}" for status, count in sorted(result.counts().items())
+        )
+        click.echo(f"{'Applied' if result.applied else 'Not applied'}: {summary or 'no rows'}.")
+        if not result.ok and not result.applied:
+            raise click.exceptions.Exit(1)
+
     @app.cli.command("seed-demo-data")
     def seed_demo_data() -> None:
         """Populate the database with demo users, tournaments, and participants."""
@@ -44,19 +245,22 @@ def register_cli_commands(app: Flask) -> None:
             ("Anna", "Bianchi", "anna@example.com"),
             ("Mastrm", "Enterprise", "mastrm.enterprise@gmail.com"),
         ]
+        existing = {
+            user.email
+            for user in User.query.filter(User.email.in_([e for _, _, e in demo_specs]))
+        }
         for first_name, last_name, email in demo_specs:
-            user = User.query.filter_by(email=email).first()
-            if not user:
+            if email not in existing:
                 user = User(
                     first_name=first_name,
                     last_name=last_name,
                     email=email,
                     is_active=True,
                 )
-                user.set_password("Password123!")
                 db.session.add(user)
                 users.append(user)
 
+        _set_seed_passwords(users)
         db.session.commit()
 
         if not users:
@@ -187,7 +391,8 @@ def register_cli_commands(app: Flask) -> None:
         from datetime import datetime
 
         from .models import User, Tournament, TournamentParticipant, Match
-        from .tournaments.routes import _ensure_round1_bracket, _advance_winner
+        from .services.advancement import advance_winner
+        from .services.seeding import seed_tournament
 
         # 1) Ensure organizer exists
         organizer_email = "mario.mastrulli@example.com"
@@ -199,7 +404,7 @@ def register_cli_commands(app: Flask) -> None:
                 email=organizer_email,
                 is_active=True,
             )
-            organizer.set_password("Password123!")
+            organizer.set_password(SEED_PASSWORD)
             db.session.add(organizer)
             db.session.commit()
             click.echo(f"Created organizer user {organizer_email} (id={organizer.id}).")
@@ -231,6 +436,9 @@ def register_cli_commands(app: Flask) -> None:
         # 3) Clear existing participants & matches for a clean scenario
         Match.query.filter_by(tournament_id=tournament.id).delete()
         TournamentParticipant.query.filter_by(tournament_id=tournament.id).delete()
+        tournament.status = Tournament.STATUS_DRAFT
+        # Bulk deletes skip the counter events
+        tournament.participant_count = 0
         db.session.commit()
 
         # 4) Create the 10 specific participants (ranking & license number)
@@ -249,21 +457,29 @@ def register_cli_commands(app: Flask) -> None:
 
         created_participants: list[TournamentParticipant] = []
 
-        for ranking, license_number in participants_spec:
-            # Create (or reuse) a simple user for each ranking
+        # Create (or reuse) a simple user for each ranking
+        emails = [f"player_{ranking}@example.com" for ranking, _ in participants_spec]
+        users_by_email = {
+            user.email: user for user in User.query.filter(User.email.in_(emails))
+        }
+        new_users = []
+        for ranking, _ in participants_spec:
             email = f"player_{ranking}@example.com"
-            user = User.query.filter_by(email=email).first()
-            if not user:
+            if email not in users_by_email:
                 user = User(
                     first_name=f"Player{ranking}",
                     last_name="Test",
                     email=email,
                     is_active=True,
                 )
-                user.set_password("Password123!")
                 db.session.add(user)
-                db.session.flush()
+                users_by_email[email] = user
+                new_users.append(user)
+        _set_seed_passwords(new_users)
+        db.session.flush()
 
+        for ranking, license_number in participants_spec:
+            user = users_by_email[f"player_{ranking}@example.com"]
             participant = TournamentParticipant(
                 tournament_id=tournament.id,
                 user_id=user.id,
@@ -280,8 +496,7 @@ def register_cli_commands(app: Flask) -> None:
         )
 
         # 5) Generate Round 1 bracket ignoring the signup deadline
-        created_round1 = _ensure_round1_bracket(tournament.id, ignore_deadline=True)
-        db.session.commit()
+        created_round1 = seed_tournament(tournament.id, ignore_deadline=True)
 
         if not created_round1:
             click.echo("Round 1 bracket was not created (maybe already present).")
@@ -304,7 +519,7 @@ def register_cli_commands(app: Flask) -> None:
                 continue
 
             match.winner_id = match.player_a_id
-            _advance_winner(match)
+            advance_winner(match)
 
             if match.player_a is not None:
                 winners_info.append(
@@ -320,76 +535,29 @@ def register_cli_commands(app: Flask) -> None:
         else:
             click.echo("No winners were assigned in Round 1 (check participants/matches).")
 
-        # 7) Auto-play later rounds until a single champion exists.
-        max_iterations = 10
-        champion_reported = False
-
-        for _ in range(max_iterations):
-            max_round = (
-                db.session.query(func.max(Match.round_number))
-                .filter_by(tournament_id=tournament.id)
-                .scalar()
-            )
-            if not max_round:
-                break
+        # 7) Auto-play the remaining matches round by round until a champion
+        # exists: player A wins, or the only player present in the match.
+        remaining = (
+            Match.query.filter_by(tournament_id=tournament.id, winner_id=None)
+            .order_by(Match.round_number.asc(), Match.bracket_position.asc())
+            .all()
+        )
+        for match in remaining:
+            match.winner_id = match.player_a_id or match.player_b_id
+            advance_winner(match)
+        db.session.commit()
 
-            latest_matches = (
-                Match.query.filter_by(
-                    tournament_id=tournament.id, round_number=max_round
-                )
-                .order_by(Match.bracket_position.asc())
-                .all()
+        final_match = (
+            Match.query.filter_by(tournament_id=tournament.id)
+            .order_by(Match.round_number.desc())
+            .first()
+        )
+        if final_match is not None and final_match.winner is not None:
+            click.echo(
+                "Champion: "
+                f"#{final_match.winner.ranking} ({final_match.winner.license_number})"
             )
-            if not latest_matches:
-                break
-
-            # If there's a single match in the latest round, treat it as final
-            # and set the winner without advancing further.
-            if len(latest_matches) == 1:
-                final_match = latest_matches[0]
-                if final_match.winner_id is None:
-                    if final_match.player_a_id and final_match.player_b_id:
-                        final_match.winner_id = final_match.player_a_id
-                    elif final_match.player_a_id and not final_match.player_b_id:
-                        final_match.winner_id = final_match.player_a_id
-                    elif final_match.player_b_id and not final_match.player_a_id:
-                        final_match.winner_id = final_match.player_b_id
-                    db.session.commit()
-
-                if final_match.winner is not None:
-                    click.echo(
-                        "Champion: "
-                        f"#{final_match.winner.ranking} ({final_match.winner.license_number})"
-                    )
-                    champion_reported = True
-                break
-
-            progressed_any = False
-            for match in latest_matches:
-                if match.winner_id is not None:
-                    continue
-
-                # If both players are present, arbitrarily let player A win.
-                if match.player_a_id and match.player_b_id:
-                    match.winner_id = match.player_a_id
-                    _advance_winner(match)
-                    progressed_any = True
-                # If only one player is present, treat it as a bye win.
-                elif match.player_a_id and not match.player_b_id:
-                    match.winner_id = match.player_a_id
-                    _advance_winner(match)
-                    progressed_any = True
-                elif match.player_b_id and not match.player_a_id:
-                    match.winner_id = match.player_b_id
-                    _advance_winner(match)
-                    progressed_any = True
-
-            db.session.commit()
-
-            if not progressed_any:
-                break
-
-        if not champion_reported:
+        else:
             click.echo("Bracket progressed, but no single champion could be determined.")
 
         click.echo(
@@ -428,24 +596,31 @@ def register_cli_commands(app: Flask) -> None:
         to_create = min(num_participants, available_slots)
         max_ranking = max((p.ranking for p in existing_participants), default=0)
 
-        created_users = 0
         created_participants = 0
 
-        for i in range(to_create):
-            ranking = max_ranking + i + 1
-            email = f"player_{tournament.id}_{ranking}@example.com"
-            user = User.query.filter_by(email=email).first()
-            if not user:
+        rankings = [max_ranking + i + 1 for i in range(to_create)]
+        emails = {ranking: f"player_{tournament.id}_{ranking}@example.com" for ranking in rankings}
+        users_by_email = {
+            user.email: user for user in User.query.filter(User.email.in_(emails.values()))
+        }
+        new_users = []
+        for ranking in rankings:
+            if emails[ranking] not in users_by_email:
                 user = User(
                     first_name="Player",
                     last_name=str(ranking),
-                    email=email,
+                    email=emails[ranking],
                     is_active=True,
                 )
-                user.set_password("Password123!")
                 db.session.add(user)
-                created_users += 1
-
+                users_by_email[user.email] = user
+                new_users.append(user)
+        _set_seed_passwords(new_users)
+        db.session.flush()
+        created_users = len(new_users)
+
+        for ranking in rankings:
+            user = users_by_email[emails[ranking]]
             license_number = f"LIC-T{tournament.id:03d}-{ranking:03d}"
 
             # Avoid duplicate license numbers in the same tournament
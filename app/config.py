@@ -27,22 +27,123 @@ class BaseConfig:
     MAIL_USERNAME = os.getenv("MAIL_USERNAME")
     MAIL_PASSWORD = os.getenv("MAIL_PASSWORD")
     MAIL_DEFAULT_SENDER = os.getenv("MAIL_DEFAULT_SENDER", "noreply@example.com")
+    # Outgoing mail leaves the request: "thread" (in-process dispatcher),
+    # "celery" (worker via REDIS_URL, falls back to "thread") or "sync"
+    MAIL_QUEUE_BACKEND = os.getenv("MAIL_QUEUE_BACKEND", "thread")
+    MAIL_QUEUE_WORKERS = 2
+    # Messages sent per SMTP connection, and how long to wait to fill one
+    MAIL_BATCH_SIZE = 50
+    MAIL_BATCH_WINDOW = 0.5
+    # Transient SMTP failures: retries, waiting backoff * 2 ** (n - 1) seconds
+    MAIL_MAX_RETRIES = 5
+    MAIL_RETRY_BACKOFF = 2.0
+    # Seconds a "thread" dispatcher keeps sending queued mail at process exit
+    MAIL_SHUTDOWN_TIMEOUT = 10.0
+
+    # Password hashing: "argon2" or "pbkdf2"; pick the Argon2 costs with
+    # ``flask tune-password-hashing``. Hashes made with other settings are
+    # upgraded on the next login.
+    PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2")
+    ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 3))
+    ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 65536))
+    ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 4))
+    PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", 0))
+    # Hash in a pool of this many processes (0: inline in the request). A
+    # request waits PASSWORD_HASH_WAIT seconds at most for one of the
+    # PASSWORD_HASH_MAX_PENDING slots (default 4 per worker), then gets a 503.
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 0))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 0))
+    PASSWORD_HASH_WAIT = 2.0
 
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
     RATELIMIT_STORAGE_URL = REDIS_URL
 
+    # Fragment/response cache: "redis" (falls back to "local" when Redis is
+    # unreachable) or "local" for a per-process LRU
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "redis")
+    CACHE_REDIS_URL = REDIS_URL
+    CACHE_KEY_PREFIX = "tournaments"
+    CACHE_DEFAULT_TTL = 60
+    CACHE_LOCAL_MAX_ENTRIES = 512
+    # Rendered brackets are keyed on their version, so they can live longer
+    CACHE_BRACKET_TTL = 3600
+
+    # Live bracket updates (Server-Sent Events): "redis" pub/sub reaches
+    # viewers on every worker (falls back to "local", this process only).
+    # Streams send a comment every EVENTS_KEEPALIVE seconds and close after
+    # EVENTS_STREAM_TIMEOUT; browsers reconnect on their own. A process
+    # serves at most EVENTS_MAX_STREAMS streams (keep it below the worker's
+    # threads); further viewers get a 503 asking them to retry after
+    # EVENTS_RETRY_AFTER seconds.
+    EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "redis")
+    EVENTS_REDIS_URL = REDIS_URL
+    EVENTS_KEEPALIVE = 15
+    EVENTS_STREAM_TIMEOUT = 300
+    EVENTS_MAX_PENDING = 100
+    EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", 8))
+    EVENTS_RETRY_AFTER = 15
+
+    # Player result reports are compare-and-swap updates on Match.version:
+    # a report that lost the race re-reads and retries this many times,
+    # waiting up to MATCH_REPORT_BACKOFF * 2 ** n seconds (randomised)
+    MATCH_REPORT_RETRIES = 5
+    MATCH_REPORT_BACKOFF = 0.005
+
+    # Serve "my next matches" from the materialised pending_matches table
+    # (backfill it with ``flask rebuild-pending-matches`` before enabling)
+    DASHBOARD_PENDING_TABLE = bool(int(os.getenv("DASHBOARD_PENDING_TABLE", 0)))
+
+    # Signups: "seat_claim" (conditional counter update) or "locking"
+    # (row lock + COUNT); full tournaments put applicants on a waitlist
+    SIGNUP_ENGINE = os.getenv("SIGNUP_ENGINE", "seat_claim")
+    SIGNUP_WAITLIST = True
+
+    # SQL accounting per request and endpoint (services.instrumentation):
+    # statements slower than SQL_SLOW_QUERY_MS are logged with parameters;
+    # the Server-Timing header and /_debug/sql are for development only
+    SQL_INSTRUMENTATION = True
+    SQL_SLOW_QUERY_MS = int(os.getenv("SQL_SLOW_QUERY_MS", 100))
+    SQL_STATS_HEADER = False
+    SQL_STATS_ENDPOINT = False
+
+    # Prometheus metrics at /metrics (needs prometheus_client); under
+    # Gunicorn also set PROMETHEUS_MULTIPROC_DIR, see gunicorn.conf.py.
+    # Off by default; with METRICS_TOKEN set, scrapes must send it as
+    # "Authorization: Bearer <token>"
+    METRICS_ENABLED = bool(int(os.getenv("METRICS_ENABLED", 0)))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+    # JSON API (/api/v1): largest ?limit accepted, and bodies of at least
+    # API_GZIP_MIN_SIZE bytes are gzipped (None: never)
+    API_MAX_PAGE_SIZE = 100
+    API_GZIP_MIN_SIZE = 1024
+    API_GZIP_LEVEL = 6
+
     # Pagination
     TOURNAMENTS_PER_PAGE = 10
+    # Seconds the approximate listing total is cached for (None: no total)
+    TOURNAMENTS_TOTAL_TTL = 60
 
 
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
+    SQL_STATS_HEADER = True
+    SQL_STATS_ENDPOINT = True
 
 
 class TestingConfig(BaseConfig):
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = "sqlite+pysqlite:///:memory:"
+    SQLALCHEMY_DATABASE_URI = os.getenv("TEST_DATABASE_URL", "sqlite+pysqlite:///:memory:")
     WTF_CSRF_ENABLED = False
+    CACHE_BACKEND = "local"
+    EVENTS_BACKEND = "local"
+    MAIL_QUEUE_BACKEND = "sync"
+    SQL_STATS_HEADER = True
+    METRICS_ENABLED = True
+    # Cheap hashes keep the suite fast
+    ARGON2_TIME_COST = 1
+    ARGON2_MEMORY_COST = 1024
+    ARGON2_PARALLELISM = 1
 
 
 class ProductionConfig(BaseConfig):
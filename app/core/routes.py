@@ -1,33 +1,48 @@
 from datetime import datetime
+from typing import Optional
 
 from flask import Blueprint, current_app, render_template, request
 
+from ..extensions import cache
 from ..models import Tournament
+from ..services.cache import LISTINGS
+from ..services.pagination import cached_total, keyset_paginate
 
 
 core_bp = Blueprint("core", __name__)
 
 
-@core_bp.get("/")
-def index():
-    page = request.args.get("page", 1, type=int)
+def _render_upcoming(cursor: Optional[str]) -> str:
     per_page = current_app.config.get("TOURNAMENTS_PER_PAGE", 10)
 
-    query = (
-        Tournament.query.filter(Tournament.start_at >= datetime.utcnow())
-        .order_by(Tournament.start_at.asc())
-    )
+    query = Tournament.query.filter(Tournament.start_at >= datetime.utcnow())
 
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    # Keyset pagination: deep pages cost the same as the first one
+    pagination = keyset_paginate(query, cursor, per_page)
+    total = cached_total(
+        "upcoming_tournaments",
+        query.order_by(None).count,
+        current_app.config.get("TOURNAMENTS_TOTAL_TTL"),
+    )
 
     return render_template(
-        "index.html",
+        "_upcoming_list.html",
         tournaments=pagination.items,
         page=pagination.page,
         per_page=per_page,
         has_next=pagination.has_next,
         has_prev=pagination.has_prev,
-        next_page=pagination.next_num,
-        prev_page=pagination.prev_num,
-        total=pagination.total,
+        next_cursor=pagination.next_cursor,
+        prev_cursor=pagination.prev_cursor,
+        total=total,
     )
+
+
+@core_bp.get("/")
+@cache.cached_response(LISTINGS)
+def index():
+    cursor = request.args.get("cursor")
+    # The list is the same for every visitor; only the layout around it
+    # (navigation, flashed messages) is rendered per request.
+    listing = cache.fragment(LISTINGS, ("index", cursor), lambda: _render_upcoming(cursor))
+    return render_template("index.html", listing=listing)
@@ -6,10 +6,29 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import CSRFProtect
 from flask_migrate import Migrate
 
+from .services.bracket_events import BracketEvents
+from .services.cache import Cache
+from .services.hashing_pool import HashingExecutor
+from .services.instrumentation import SQLInstrumentation
+from .services.mailer import MailQueue
+from .services.metrics import Metrics
+
+
+def _include_in_autogenerate(obj, name, type_, reflected, compare_to) -> bool:
+    # The full-text search column and its index are created by raw DDL on
+    # PostgreSQL only, so autogenerate must not try to drop them.
+    return name not in {"search_vector", "ix_tournaments_search_vector"}
+
 
 db = SQLAlchemy()
-migrate = Migrate()
+migrate = Migrate(include_object=_include_in_autogenerate)
 login_manager = LoginManager()
 mail = Mail()
 csrf = CSRFProtect()
 limiter = Limiter(key_func=get_remote_address)
+cache = Cache()
+mail_queue = MailQueue()
+hashing_executor = HashingExecutor()
+sql_instrumentation = SQLInstrumentation()
+metrics = Metrics()
+bracket_events = BracketEvents()
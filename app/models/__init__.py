@@ -2,9 +2,19 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from werkzeug.security import check_password_hash, generate_password_hash
-
+from sqlalchemy import DDL, event
 from ..extensions import db
+from ..services.bracket_engine import (
+    STAGE_FINAL,
+    STAGE_LOSERS,
+    STAGE_MAIN,
+    SingleElimination,
+    get_format,
+)
+from ..services.passwords import check_password, hash_password
+
+# Names of the last rounds of a single-elimination bracket, final first
+ROUND_NAMES = ("Finale", "Semifinale", "Quarti di finale")
 
 
 class TimestampMixin:
@@ -31,10 +41,17 @@ class User(TimestampMixin, db.Model):
     tournaments = db.relationship("Tournament", back_populates="organizer", lazy="dynamic")
 
     def set_password(self, raw_password: str) -> None:
-        self.password_hash = generate_password_hash(raw_password, method="pbkdf2:sha256")
+        self.password_hash = hash_password(raw_password)
 
     def verify_password(self, raw_password: str) -> bool:
-        return check_password_hash(self.password_hash, raw_password)
+        """Check ``raw_password``, upgrading an outdated hash in place.
+
+        The caller commits; a rehash shows up as a pending change.
+        """
+        valid, needs_rehash = check_password(self.password_hash, raw_password)
+        if valid and needs_rehash:
+            self.set_password(raw_password)
+        return valid
 
     def get_id(self) -> str:
         return str(self.id)
@@ -51,6 +68,16 @@ class User(TimestampMixin, db.Model):
 
 class Tournament(TimestampMixin, db.Model):
     __tablename__ = "tournaments"
+    __table_args__ = (
+        # Upcoming listings filter and page on (start_at, id)
+        db.Index("ix_tournaments_start_at_id", "start_at", "id"),
+    )
+
+    # Lifecycle: draft -> seeded -> running -> completed
+    STATUS_DRAFT = "draft"
+    STATUS_SEEDED = "seeded"
+    STATUS_RUNNING = "running"
+    STATUS_COMPLETED = "completed"
 
     id = db.Column(db.Integer, primary_key=True)
     organizer_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -65,7 +92,20 @@ class Tournament(TimestampMixin, db.Model):
     signup_deadline = db.Column(db.DateTime, nullable=False)
     max_participants = db.Column(db.Integer, nullable=False)
     sponsor_assets = db.Column(db.JSON, default=dict)
-    status = db.Column(db.String(50), default="draft", nullable=False)
+    status = db.Column(db.String(50), default=STATUS_DRAFT, nullable=False)
+    bracket_format = db.Column(
+        db.String(30), default="single_elimination", nullable=False
+    )
+    # Bumped whenever the published bracket changes (seeding, confirmed
+    # results); cached bracket renderings and ETags are keyed on it.
+    bracket_version = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    # Number of tournament_participants rows, kept in step by the mapper
+    # events below and by the signup seat claim (``services.signups``).
+    participant_count = db.Column(db.Integer, default=0, server_default="0", nullable=False)
+    # Shape of the main stage, stored when the bracket is seeded so round
+    # labels need no aggregate over the matches. NULL until then.
+    bracket_size = db.Column(db.Integer)
+    total_rounds = db.Column(db.Integer)
 
     organizer = db.relationship("User", back_populates="tournaments")
     participants = db.relationship(
@@ -79,31 +119,150 @@ class Tournament(TimestampMixin, db.Model):
         cascade="all, delete-orphan",
     )
 
+    def round_label(self, round_number: int, stage: str = STAGE_MAIN) -> str:
+        """Display name of a round ("Finale", "Semifinale", ... or "Round N")."""
+        if stage == STAGE_FINAL:
+            return "Finale"
+        if stage == STAGE_LOSERS:
+            return f"Losers round {round_number}"
+        if self.total_rounds and get_format(self.bracket_format).key == SingleElimination.key:
+            remaining = self.total_rounds - round_number
+            if 0 <= remaining < len(ROUND_NAMES):
+                return ROUND_NAMES[remaining]
+        return f"Round {round_number}"
+
+
+# PostgreSQL keeps a weighted full-text vector of the searchable fields in a
+# generated column (see ``services.search``); other databases use the
+# in-process index instead.
+TOURNAMENT_SEARCH_VECTOR_DDL = (
+    "ALTER TABLE tournaments ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(discipline, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+    ") STORED"
+)
+TOURNAMENT_SEARCH_INDEX_DDL = (
+    "CREATE INDEX ix_tournaments_search_vector ON tournaments USING GIN (search_vector)"
+)
+for _ddl in (TOURNAMENT_SEARCH_VECTOR_DDL, TOURNAMENT_SEARCH_INDEX_DDL):
+    event.listen(
+        Tournament.__table__, "after_create", DDL(_ddl).execute_if(dialect="postgresql")
+    )
+
 
 class TournamentParticipant(TimestampMixin, db.Model):
     __tablename__ = "tournament_participants"
     __table_args__ = (
         db.UniqueConstraint("tournament_id", "license_number", name="uq_license_per_tournament"),
         db.UniqueConstraint("tournament_id", "ranking", name="uq_ranking_per_tournament"),
+        db.Index("ix_participants_tournament_user", "tournament_id", "user_id"),
+        db.Index("ix_participants_user_id", "user_id"),
     )
 
+    # Waitlisted applicants signed up once the tournament was full: they hold
+    # no seat and are left out of the bracket.
+    STATUS_PENDING = "pending"
+    STATUS_WAITLISTED = "waitlisted"
+
     id = db.Column(db.Integer, primary_key=True)
     tournament_id = db.Column(db.Integer, db.ForeignKey("tournaments.id"), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     license_number = db.Column(db.String(50), nullable=False)
     ranking = db.Column(db.Integer, nullable=False)
-    status = db.Column(db.String(50), default="pending", nullable=False)
+    status = db.Column(db.String(50), default=STATUS_PENDING, nullable=False)
     seed = db.Column(db.Integer)
 
     tournament = db.relationship("Tournament", back_populates="participants")
     user = db.relationship("User")
 
 
+def _shift_participant_count(connection, tournament_id: int, delta: int) -> None:
+    tournaments = Tournament.__table__
+    connection.execute(
+        tournaments.update()
+        .where(tournaments.c.id == tournament_id)
+        .values(participant_count=tournaments.c.participant_count + delta)
+    )
+
+
+# ORM inserts, deletes and moves onto the waitlist keep
+# ``Tournament.participant_count`` (seats taken, i.e. participants not on the
+# waitlist) in the same transaction; Core statements (the signup seat claim,
+# waitlist promotions, bulk deletes) bypass these events and update the
+# counter themselves.
+def _holds_seat(status) -> bool:
+    return status != TournamentParticipant.STATUS_WAITLISTED
+
+
+@event.listens_for(TournamentParticipant, "after_insert")
+def _participant_added(mapper, connection, target: TournamentParticipant) -> None:
+    if _holds_seat(target.status):
+        _shift_participant_count(connection, target.tournament_id, 1)
+
+
+@event.listens_for(TournamentParticipant, "after_update")
+def _participant_changed(mapper, connection, target: TournamentParticipant) -> None:
+    history = db.inspect(target).attrs.status.history
+    if not history.has_changes() or not history.deleted:
+        return
+    before, after = _holds_seat(history.deleted[0]), _holds_seat(target.status)
+    if after and not before:
+        # Taking a seat needs the capacity check of the seat claim
+        raise ValueError(
+            "Waitlisted participants are promoted with services.signups.promote_waitlisted."
+        )
+    if before != after:
+        _shift_participant_count(connection, target.tournament_id, -1)
+
+
+def _tournament_deleted(target: TournamentParticipant) -> bool:
+    session = db.inspect(target).session
+    if session is None:
+        return False
+    key = db.inspect(Tournament).identity_key_from_primary_key((target.tournament_id,))
+    tournament = session.identity_map.get(key)
+    return tournament is not None and tournament in session.deleted
+
+
+@event.listens_for(TournamentParticipant, "after_delete")
+def _participant_removed(mapper, connection, target: TournamentParticipant) -> None:
+    # A tournament being deleted takes its counter along: skip one UPDATE
+    # per cascaded participant
+    if _holds_seat(target.status) and not _tournament_deleted(target):
+        _shift_participant_count(connection, target.tournament_id, -1)
+
+
 class Match(TimestampMixin, db.Model):
     __tablename__ = "matches"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "tournament_id",
+            "stage",
+            "round_number",
+            "bracket_position",
+            name="uq_match_position",
+        ),
+        # Matches still to be played, looked up by player slot (dashboard)
+        db.Index(
+            "ix_matches_pending_player_a",
+            "player_a_id",
+            postgresql_where=db.text("winner_id IS NULL"),
+            sqlite_where=db.text("winner_id IS NULL"),
+        ),
+        db.Index(
+            "ix_matches_pending_player_b",
+            "player_b_id",
+            postgresql_where=db.text("winner_id IS NULL"),
+            sqlite_where=db.text("winner_id IS NULL"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     tournament_id = db.Column(db.Integer, db.ForeignKey("tournaments.id"), nullable=False)
+    # "main", or "losers"/"final" for the double elimination brackets
+    stage = db.Column(db.String(20), default="main", nullable=False)
     round_number = db.Column(db.Integer, nullable=False)
     bracket_position = db.Column(db.Integer, nullable=False)
     player_a_id = db.Column(db.Integer, db.ForeignKey("tournament_participants.id"))
@@ -116,6 +275,18 @@ class Match(TimestampMixin, db.Model):
     player_b_reported_winner_id = db.Column(
         db.Integer, db.ForeignKey("tournament_participants.id")
     )
+    # Where the winner (and, in double elimination, the loser) plays next;
+    # filled in when the bracket is generated. Slots are "a" or "b".
+    next_match_id = db.Column(db.Integer, db.ForeignKey("matches.id", ondelete="SET NULL"))
+    next_slot = db.Column(db.String(1))
+    loser_next_match_id = db.Column(
+        db.Integer, db.ForeignKey("matches.id", ondelete="SET NULL")
+    )
+    loser_next_slot = db.Column(db.String(1))
+    # Optimistic concurrency: every statement changing the players, the
+    # reported winners or the winner bumps it, and result reports only
+    # apply if it still holds the value they read (``services.match_reports``)
+    version = db.Column(db.Integer, default=0, server_default="0", nullable=False)
 
     tournament = db.relationship("Tournament", back_populates="matches")
     player_a = db.relationship(
@@ -133,3 +304,22 @@ class Match(TimestampMixin, db.Model):
     player_b_reported_winner = db.relationship(
         "TournamentParticipant", foreign_keys=[player_b_reported_winner_id], uselist=False
     )
+
+
+class PendingMatch(db.Model):
+    """Materialised "matches this user still has to play" (dashboard).
+
+    One row per player of every match with both slots filled and no
+    winner. Only maintained when ``DASHBOARD_PENDING_TABLE`` is enabled
+    (see ``services.dashboard``).
+    """
+
+    __tablename__ = "pending_matches"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
+    match_id = db.Column(
+        db.Integer, db.ForeignKey("matches.id", ondelete="CASCADE"), primary_key=True
+    )
+    tournament_id = db.Column(
+        db.Integer, db.ForeignKey("tournaments.id", ondelete="CASCADE"), nullable=False
+    )
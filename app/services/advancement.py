@@ -0,0 +1,181 @@
+"""Moving players through the bracket once a match result is confirmed."""
+from __future__ import annotations
+
+from sqlalchemy import case, update
+
+from ..extensions import db
+from ..models import Match, Tournament
+from .bracket_builder import insert_specs
+from .bracket_events import publish_after_commit
+from .bracket_engine import STAGE_MAIN, BracketFormat, MatchSpec, get_format
+from .dashboard import refresh_pending_matches
+from .seeding import seed_ids
+
+
+def advance_winner(match: Match) -> None:
+    """Advance the winner of a match according to the tournament's format.
+
+    Elimination formats place the winner (and, in double elimination, the
+    loser) into the match they play next; pool formats pair the next Swiss
+    round once the current one is complete. Also moves the tournament to
+    ``running`` on its first result and to ``completed`` once it is over,
+    and bumps its bracket version. The caller commits; live viewers are
+    told once it does.
+    """
+    if not match.winner_id:
+        return
+
+    version = db.session.execute(
+        update(Tournament)
+        .where(Tournament.id == match.tournament_id)
+        .values(
+            bracket_version=Tournament.bracket_version + 1,
+            status=case(
+                (Tournament.status == Tournament.STATUS_SEEDED, Tournament.STATUS_RUNNING),
+                else_=Tournament.status,
+            ),
+        )
+        .returning(Tournament.bracket_version)
+    ).scalar_one()
+
+    update_event = {
+        "type": "match",
+        "match_id": match.id,
+        "winner_id": match.winner_id,
+        "bracket_version": version,
+    }
+    if match.next_match_id is not None or match.loser_next_match_id is not None:
+        advanced = _advance_by_pointer(match)
+        refresh_pending_matches([match.id, match.next_match_id, match.loser_next_match_id])
+        publish_after_commit(
+            db.session, match.tournament_id, {**update_event, "advanced": advanced, "reload": False}
+        )
+        return
+
+    # Finals have no pointer; brackets seeded before pointers existed are
+    # walked through the format instead.
+    fmt = get_format(match.tournament.bracket_format)
+    if fmt.elimination:
+        _advance_in_tree(match, fmt)
+    else:
+        _advance_pool(match, fmt)
+    refresh_pending_matches(tournament_id=match.tournament_id)
+    # The affected matches may not have ids yet: viewers refetch the bracket
+    publish_after_commit(
+        db.session, match.tournament_id, {**update_event, "advanced": [], "reload": True}
+    )
+
+
+def _claim_slot(match_id: int, slot: str, player_id: int) -> None:
+    """Put ``player_id`` into an empty slot with a single primary-key update.
+
+    The ``IS NULL`` guard keeps the update idempotent when two reports of
+    the same round land concurrently.
+    """
+    column = getattr(Match, f"player_{slot}_id")
+    db.session.execute(
+        update(Match)
+        .where(Match.id == match_id, column.is_(None))
+        .values({column: player_id, Match.version: Match.version + 1})
+    )
+
+
+def _advance_by_pointer(match: Match) -> list[dict]:
+    """Fill the next slots; returns them as ``{match_id, slot, participant_id}``."""
+    loser_id = match.player_b_id if match.winner_id == match.player_a_id else match.player_a_id
+    advanced = []
+    for match_id, slot, player_id in (
+        (match.next_match_id, match.next_slot, match.winner_id),
+        (match.loser_next_match_id, match.loser_next_slot, loser_id),
+    ):
+        if match_id is None or player_id is None:
+            continue
+        _claim_slot(match_id, slot, player_id)
+        advanced.append({"match_id": match_id, "slot": slot, "participant_id": player_id})
+    return advanced
+
+
+def _place(
+    match: Match, stage: str, round_number: int, bracket_position: int, slot: str, player_id: int
+) -> None:
+    next_match = Match.query.filter_by(
+        tournament_id=match.tournament_id,
+        stage=stage,
+        round_number=round_number,
+        bracket_position=bracket_position,
+    ).first()
+    if not next_match:
+        next_match = Match(
+            tournament_id=match.tournament_id,
+            stage=stage,
+            round_number=round_number,
+            bracket_position=bracket_position,
+        )
+        db.session.add(next_match)
+
+    column = f"player_{slot}_id"
+    if getattr(next_match, column) is None:
+        setattr(next_match, column, player_id)
+        next_match.version = (next_match.version or 0) + 1
+
+
+def _advance_in_tree(match: Match, fmt: BracketFormat) -> None:
+    # The bracket structure only depends on the field size, so it is rebuilt
+    # in memory to find where this match leads.
+    specs = fmt.build(seed_ids(match.tournament_id))
+    spec = next(
+        (
+            s
+            for s in specs
+            if s.key == (match.stage, match.round_number, match.bracket_position)
+        ),
+        None,
+    )
+
+    if spec is None or (spec.next_match is None and spec.winner is not None):
+        # Brackets seeded round by round before full-tree seeding: positions
+        # 1 and 2 feed position 1 of the next round, 3 and 4 position 2, ...
+        slot = "a" if match.bracket_position % 2 == 1 else "b"
+        _place(
+            match,
+            STAGE_MAIN,
+            match.round_number + 1,
+            (match.bracket_position + 1) // 2,
+            slot,
+            match.winner_id,
+        )
+        return
+
+    if spec.next_match is None:
+        match.tournament.status = Tournament.STATUS_COMPLETED
+        return
+
+    loser_id = match.player_b_id if match.winner_id == match.player_a_id else match.player_a_id
+    for target_index, slot, player_id in (
+        (spec.next_match, spec.next_slot, match.winner_id),
+        (spec.loser_next_match, spec.loser_next_slot, loser_id),
+    ):
+        if target_index is None or player_id is None:
+            continue
+        target = specs[target_index]
+        _place(match, target.stage, target.round_number, target.bracket_position, slot, player_id)
+
+
+def _advance_pool(match: Match, fmt: BracketFormat) -> None:
+    pending = Match.query.filter(
+        Match.tournament_id == match.tournament_id, Match.winner_id.is_(None)
+    ).count()
+    if pending:
+        return
+
+    played = [
+        MatchSpec(
+            m.stage, m.round_number, m.bracket_position, m.player_a_id, m.player_b_id, m.winner_id
+        )
+        for m in Match.query.filter_by(tournament_id=match.tournament_id)
+    ]
+    next_round = fmt.next_round(seed_ids(match.tournament_id), played)
+    if next_round:
+        insert_specs(match.tournament_id, next_round)
+    else:
+        match.tournament.status = Tournament.STATUS_COMPLETED
@@ -0,0 +1,327 @@
+"""Entering many match results at once (organizer score sheets).
+
+``apply_results`` validates a whole batch against an in-memory copy of the
+bracket, walking the rows in dependency order (a match after the matches
+feeding its slots), so a sheet may hold a second-round result whose
+players only come from first-round results on the same sheet. The valid
+results are then written with a handful of set-based statements in one
+transaction, whatever the size of the batch:
+
+* one ``UPDATE`` for the winners, guarded by ``winner_id IS NULL`` so a
+  result confirmed concurrently fails the batch instead of being
+  overwritten (it also bumps ``Match.version``, so a player report read
+  before the batch retries instead of overwriting it);
+* one ``UPDATE`` per slot (a/b) for the players moving on;
+* one ``UPDATE`` for the tournament (bracket version, status).
+
+Matches without a next-match pointer (finals, pool rounds, brackets seeded
+before pointers existed) are finished through ``advance_winner``. By
+default one invalid row rejects the batch; with ``partial=True`` the valid
+rows are applied anyway.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from typing import Iterable, Optional, Union
+
+from sqlalchemy import case, update
+
+from ..extensions import db
+from ..models import Match, Tournament
+from .advancement import advance_winner
+from .bracket_events import publish_after_commit
+from .dashboard import refresh_pending_matches
+
+# Row outcomes
+RECORDED = "recorded"
+VALID = "valid"  # dry run
+UNCHANGED = "unchanged"  # same winner already recorded
+REJECTED = "rejected"  # valid, but the batch was not applied
+NOT_FOUND = "not_found"
+DUPLICATE = "duplicate"
+NOT_READY = "not_ready"  # a player is still unknown
+INVALID_WINNER = "invalid_winner"
+ALREADY_DECIDED = "already_decided"
+CONFLICT = "conflict"  # changed by someone else while applying
+
+#: Outcomes of rows that did not fail validation.
+ACCEPTED = frozenset({RECORDED, VALID, UNCHANGED, REJECTED})
+
+_COLUMNS = (
+    "id",
+    "player_a_id",
+    "player_b_id",
+    "winner_id",
+    "next_match_id",
+    "next_slot",
+    "loser_next_match_id",
+    "loser_next_slot",
+)
+
+
+@dataclass(frozen=True)
+class ResultRow:
+    match_id: int
+    #: Participant id of the winner, or the winning slot ("a" or "b")
+    winner: Union[int, str]
+
+
+@dataclass
+class RowOutcome:
+    match_id: int
+    status: str
+    winner_id: Optional[int] = None
+    message: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ACCEPTED
+
+    def as_dict(self) -> dict:
+        return {
+            "match_id": self.match_id,
+            "status": self.status,
+            "winner_id": self.winner_id,
+            "message": self.message,
+        }
+
+
+@dataclass
+class BatchResult:
+    outcomes: list[RowOutcome] = field(default_factory=list)
+    applied: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return all(outcome.ok for outcome in self.outcomes)
+
+    def counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for outcome in self.outcomes:
+            counts[outcome.status] = counts.get(outcome.status, 0) + 1
+        return counts
+
+
+def parse_winner(raw: str) -> Union[int, str]:
+    """``"a"``/``"b"`` for a slot, otherwise a participant id."""
+    text = str(raw).strip().lower()
+    if text in ("a", "b"):
+        return text
+    return int(text)
+
+
+def _load_bracket(tournament_id: int) -> dict[int, dict]:
+    rows = (
+        db.session.query(*(getattr(Match, name) for name in _COLUMNS))
+        .filter(Match.tournament_id == tournament_id)
+        .all()
+    )
+    return {row.id: dict(zip(_COLUMNS, row)) for row in rows}
+
+
+def _dependency_order(rows: list[ResultRow], bracket: dict[int, dict]) -> list[ResultRow]:
+    """``rows`` with every match after the batch matches feeding into it."""
+    by_match = {row.match_id: row for row in rows}
+    sorter: TopologicalSorter = TopologicalSorter()
+    for match_id in by_match:
+        sorter.add(match_id)
+        for pointer in ("next_match_id", "loser_next_match_id"):
+            target = bracket.get(match_id, {}).get(pointer)
+            if target in by_match:
+                sorter.add(target, match_id)
+    return [by_match[match_id] for match_id in sorter.static_order()]
+
+
+def _place(bracket: dict[int, dict], match_id: Optional[int], slot: Optional[str], player_id):
+    target = bracket.get(match_id) if match_id is not None else None
+    if target is None or player_id is None:
+        return None
+    column = f"player_{slot}_id"
+    if target[column] is None:
+        target[column] = player_id
+        return match_id, slot, player_id
+    return None
+
+
+def _validate(tournament_id: int, rows: list[ResultRow]):
+    """Simulate the batch on the loaded bracket.
+
+    Returns the outcomes (in the order of ``rows``), the winners to write,
+    the ``(match id, slot, player)`` placements and the simulated bracket.
+    """
+    bracket = _load_bracket(tournament_id)
+    outcomes: dict[int, RowOutcome] = {}
+    winners: dict[int, int] = {}
+    placements: list[tuple[int, str, int]] = []
+    # The first row of each match (dict keeps the last value, hence reversed)
+    unique = list({row.match_id: row for row in reversed(rows)}.values())
+
+    for row in _dependency_order(unique, bracket):
+        match = bracket.get(row.match_id)
+        if match is None:
+            outcomes[row.match_id] = RowOutcome(
+                row.match_id, NOT_FOUND, message="No such match in this tournament."
+            )
+            continue
+        players = (match["player_a_id"], match["player_b_id"])
+        if None in players:
+            outcomes[row.match_id] = RowOutcome(
+                row.match_id, NOT_READY, message="Both players are not known yet."
+            )
+            continue
+        winner_id = match[f"player_{row.winner}_id"] if row.winner in ("a", "b") else row.winner
+        if winner_id not in players:
+            outcomes[row.match_id] = RowOutcome(
+                row.match_id, INVALID_WINNER, message="The winner does not play this match."
+            )
+            continue
+        if match["winner_id"] is not None:
+            same = match["winner_id"] == winner_id
+            outcomes[row.match_id] = RowOutcome(
+                row.match_id,
+                UNCHANGED if same else ALREADY_DECIDED,
+                match["winner_id"],
+                "" if same else "Another result is already recorded.",
+            )
+            continue
+
+        match["winner_id"] = winner_id
+        winners[row.match_id] = winner_id
+        loser_id = players[1] if winner_id == players[0] else players[0]
+        for placement in (
+            _place(bracket, match["next_match_id"], match["next_slot"], winner_id),
+            _place(bracket, match["loser_next_match_id"], match["loser_next_slot"], loser_id),
+        ):
+            if placement is not None:
+                placements.append(placement)
+        outcomes[row.match_id] = RowOutcome(row.match_id, VALID, winner_id)
+
+    # A match listed twice keeps its first row; the others are reported
+    reported: list[RowOutcome] = []
+    seen: set[int] = set()
+    for row in rows:
+        if row.match_id in seen:
+            reported.append(RowOutcome(row.match_id, DUPLICATE, message="Listed more than once."))
+        else:
+            seen.add(row.match_id)
+            reported.append(outcomes[row.match_id])
+    return reported, winners, placements, bracket
+
+
+def _write(
+    tournament_id: int,
+    winners: dict[int, int],
+    placements: list[tuple[int, str, int]],
+    bracket: dict[int, dict],
+) -> bool:
+    """Apply the validated batch; False when a winner was set concurrently."""
+    written = db.session.execute(
+        update(Match)
+        .where(Match.id.in_(winners), Match.winner_id.is_(None))
+        .values(winner_id=case(winners, value=Match.id), version=Match.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if written.rowcount != len(winners):
+        return False
+
+    for slot in ("a", "b"):
+        fills = {match_id: player for match_id, placed, player in placements if placed == slot}
+        if not fills:
+            continue
+        column = getattr(Match, f"player_{slot}_id")
+        db.session.execute(
+            update(Match)
+            .where(Match.id.in_(fills), column.is_(None))
+            .values({column: case(fills, value=Match.id), Match.version: Match.version + 1})
+            .execution_options(synchronize_session=False)
+        )
+
+    version = db.session.execute(
+        update(Tournament)
+        .where(Tournament.id == tournament_id)
+        .values(
+            bracket_version=Tournament.bracket_version + 1,
+            status=case(
+                (Tournament.status == Tournament.STATUS_SEEDED, Tournament.STATUS_RUNNING),
+                else_=Tournament.status,
+            ),
+        )
+        .returning(Tournament.bracket_version)
+    ).scalar_one()
+    # The ORM copies of the rows touched above are stale now
+    db.session.expire_all()
+
+    affected = set(winners) | {match_id for match_id, _, _ in placements}
+    refresh_pending_matches(affected)
+
+    # Matches without a pointer (finals, pool rounds, legacy brackets) are
+    # finished by the format; the players moving through pointers are known
+    for match_id, winner_id in winners.items():
+        source = bracket[match_id]
+        if source["next_match_id"] is None and source["loser_next_match_id"] is None:
+            advance_winner(db.session.get(Match, match_id))
+            continue
+        publish_after_commit(
+            db.session,
+            tournament_id,
+            {
+                "type": "match",
+                "match_id": match_id,
+                "winner_id": winner_id,
+                "bracket_version": version,
+                "advanced": [
+                    {"match_id": target, "slot": slot, "participant_id": player}
+                    for target, slot, player in placements
+                    if (target, slot) in _targets(source)
+                ],
+                "reload": False,
+            },
+        )
+    return True
+
+
+def _targets(match: dict) -> set[tuple[int, str]]:
+    return {
+        (match["next_match_id"], match["next_slot"]),
+        (match["loser_next_match_id"], match["loser_next_slot"]),
+    }
+
+
+def apply_results(
+    tournament_id: int,
+    rows: Iterable[ResultRow],
+    *,
+    partial: bool = False,
+    dry_run: bool = False,
+) -> BatchResult:
+    """Validate ``rows`` together and record them in one transaction.
+
+    Commits when something was applied and rolls back otherwise.
+    """
+    rows = list(rows)
+    outcomes, winners, placements, bracket = _validate(tournament_id, rows)
+    result = BatchResult(outcomes)
+
+    if dry_run or not winners or (not result.ok and not partial):
+        db.session.rollback()
+        if not dry_run:
+            for outcome in result.outcomes:
+                if outcome.status == VALID:
+                    outcome.status = REJECTED
+        return result
+
+    if not _write(tournament_id, winners, placements, bracket):
+        db.session.rollback()
+        for outcome in result.outcomes:
+            if outcome.status == VALID:
+                outcome.status = CONFLICT
+                outcome.message = "Results changed while applying; nothing was recorded."
+        return result
+
+    db.session.commit()
+    for outcome in result.outcomes:
+        if outcome.status == VALID:
+            outcome.status = RECORDED
+    result.applied = True
+    return result
@@ -0,0 +1,88 @@
+"""Persist generated brackets with one bulk insert.
+
+The matches come from the tournament's bracket format (see
+``bracket_engine``): for elimination formats every round exists from the
+start, byes are resolved immediately (the seeded player is already the
+winner of the round 1 match and sits in its round 2 slot) and later-round
+matches start with empty slots. Every match stores a pointer to the match
+its winner (and loser) plays next, which ``advance_winner`` follows.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional, Sequence
+
+from sqlalchemy import insert, update
+
+from ..extensions import db
+from ..models import Match
+from .bracket_engine import MatchSpec, get_format
+
+
+def build_rows(
+    tournament_id: int,
+    specs: Sequence[MatchSpec],
+    *,
+    now: Optional[datetime] = None,
+) -> list[dict]:
+    """Return the ``matches`` insert rows for ``specs``."""
+    now = now or datetime.utcnow()
+    return [
+        {
+            "tournament_id": tournament_id,
+            "stage": spec.stage,
+            "round_number": spec.round_number,
+            "bracket_position": spec.bracket_position,
+            "player_a_id": spec.player_a,
+            "player_b_id": spec.player_b,
+            "winner_id": spec.winner,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for spec in specs
+    ]
+
+
+def insert_specs(tournament_id: int, specs: Sequence[MatchSpec]) -> int:
+    """Write ``specs`` and return how many were written.
+
+    The rows go in with one executemany that returns the new ids in order;
+    a second executemany then stores the next-match pointers. The caller
+    owns the transaction and is expected to commit.
+    """
+    rows = build_rows(tournament_id, specs)
+    if not rows:
+        return 0
+
+    ids = (
+        db.session.execute(
+            insert(Match).returning(Match.id, sort_by_parameter_order=True), rows
+        )
+        .scalars()
+        .all()
+    )
+    links = [
+        {
+            "id": ids[index],
+            "next_match_id": ids[spec.next_match] if spec.next_match is not None else None,
+            "next_slot": spec.next_slot,
+            "loser_next_match_id": (
+                ids[spec.loser_next_match] if spec.loser_next_match is not None else None
+            ),
+            "loser_next_slot": spec.loser_next_slot,
+        }
+        for index, spec in enumerate(specs)
+        if spec.next_match is not None or spec.loser_next_match is not None
+    ]
+    if links:
+        db.session.execute(update(Match), links)
+    return len(rows)
+
+
+def insert_bracket(
+    tournament_id: int,
+    participant_ids: Sequence[int],
+    bracket_format: Optional[str] = None,
+) -> int:
+    """Generate the bracket of ``participant_ids`` (ordered by seed) and write it."""
+    return insert_specs(tournament_id, get_format(bracket_format).build(participant_ids))
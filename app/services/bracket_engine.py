@@ -0,0 +1,462 @@
+"""Pure-Python bracket formats.
+
+Every format turns a list of seeds (participant ids ordered by ranking, best
+first) into ``MatchSpec`` objects without touching the database, so large
+events can be generated and simulated quickly. The persistence side lives in
+``bracket_builder`` (inserting the specs) and ``advancement`` (moving winners
+and losers along once a result is confirmed).
+
+Elimination formats know their whole tree up front and link each match to
+the match its winner (and, for double elimination, its loser) plays next.
+Pool formats (round robin, Swiss) have no links; Swiss pairs each new round
+from the standings once the previous one is complete.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Hashable, Optional, Sequence
+
+STAGE_MAIN = "main"
+STAGE_LOSERS = "losers"
+STAGE_FINAL = "final"
+
+SLOT_A = "a"
+SLOT_B = "b"
+
+Seed = Hashable
+MatchKey = tuple[str, int, int]
+
+
+@dataclass
+class MatchSpec:
+    """One match of a generated bracket.
+
+    ``next_match`` / ``loser_next_match`` are indexes into the list returned
+    by ``BracketFormat.build``; the matching ``*_slot`` says whether the
+    player enters as player A or player B.
+    """
+
+    stage: str
+    round_number: int
+    bracket_position: int
+    player_a: Optional[Seed] = None
+    player_b: Optional[Seed] = None
+    winner: Optional[Seed] = None
+    next_match: Optional[int] = None
+    next_slot: Optional[str] = None
+    loser_next_match: Optional[int] = None
+    loser_next_slot: Optional[str] = None
+
+    @property
+    def key(self) -> MatchKey:
+        return (self.stage, self.round_number, self.bracket_position)
+
+    @property
+    def loser(self) -> Optional[Seed]:
+        if self.winner is None or self.player_a is None or self.player_b is None:
+            return None
+        return self.player_b if self.winner == self.player_a else self.player_a
+
+
+class BracketFormat:
+    """Interface implemented by every bracket format."""
+
+    key: str = ""
+    label: str = ""
+    #: True when ``build`` returns the whole event linked by next-match pointers.
+    elimination: bool = True
+
+    def build(self, seeds: Sequence[Seed]) -> list[MatchSpec]:
+        """Return the matches that can be scheduled before any result is known."""
+        raise NotImplementedError
+
+    def next_round(
+        self, seeds: Sequence[Seed], played: Sequence[MatchSpec]
+    ) -> list[MatchSpec]:
+        """Return the next round once every match in ``played`` has a winner.
+
+        Only formats that pair rounds from the standings need this; an empty
+        list means the event is over.
+        """
+        return []
+
+    def total_rounds(self, count: int) -> int:
+        """Rounds of the main stage for a field of ``count`` players."""
+        return max(1, (count - 1).bit_length())
+
+    def bracket_size(self, count: int) -> int:
+        """Slots of the main stage's first round (byes included)."""
+        return 1 << self.total_rounds(count)
+
+
+# --- Linking -----------------------------------------------------------------
+
+# A slot source is ("seed", seed), ("winner", draft_index), ("loser", draft_index)
+# or None for a slot that will never be filled.
+_Source = Optional[tuple[str, object]]
+
+
+@dataclass
+class _Draft:
+    stage: str
+    round_number: int
+    bracket_position: int
+    source_a: _Source
+    source_b: _Source
+    keep_bye: bool = False
+
+
+def _link(drafts: Sequence[_Draft]) -> list[MatchSpec]:
+    """Turn drafts (listed feeders first) into linked ``MatchSpec`` objects.
+
+    Byes in the first round (``keep_bye``) are kept as decided matches and
+    their player is placed straight into the next slot. Any other match that
+    can only ever receive one player is dropped and that player is routed to
+    where its winner would have gone; matches that can receive nobody are
+    dropped as well.
+    """
+    winner_out: list[_Source] = []
+    loser_out: list[_Source] = []
+    resolved: list[tuple[_Source, _Source]] = []
+    kept: dict[int, int] = {}
+
+    def resolve(source: _Source) -> _Source:
+        if source is None:
+            return None
+        kind, ref = source
+        if kind == "seed":
+            return ("player", ref) if ref is not None else None
+        return winner_out[ref] if kind == "winner" else loser_out[ref]
+
+    for index, draft in enumerate(drafts):
+        slots = (resolve(draft.source_a), resolve(draft.source_b))
+        live = [slot for slot in slots if slot is not None]
+        resolved.append(slots)
+        if len(live) == 2:
+            kept[index] = len(kept)
+            winner_out.append(("winner", index))
+            loser_out.append(("loser", index))
+        elif len(live) == 1 and draft.keep_bye and live[0][0] == "player":
+            kept[index] = len(kept)
+            winner_out.append(live[0])
+            loser_out.append(None)
+        else:
+            winner_out.append(live[0] if live else None)
+            loser_out.append(None)
+
+    specs = [
+        MatchSpec(
+            stage=drafts[index].stage,
+            round_number=drafts[index].round_number,
+            bracket_position=drafts[index].bracket_position,
+        )
+        for index in kept
+    ]
+    for index, spec_index in kept.items():
+        spec = specs[spec_index]
+        for slot, source in zip((SLOT_A, SLOT_B), resolved[index]):
+            if source is None:
+                continue
+            kind, ref = source
+            if kind == "player":
+                setattr(spec, f"player_{slot}", ref)
+            elif kind == "winner":
+                feeder = specs[kept[ref]]
+                feeder.next_match, feeder.next_slot = spec_index, slot
+            else:
+                feeder = specs[kept[ref]]
+                feeder.loser_next_match, feeder.loser_next_slot = spec_index, slot
+        if drafts[index].keep_bye and (spec.player_a is None) != (spec.player_b is None):
+            spec.winner = spec.player_a if spec.player_a is not None else spec.player_b
+    return specs
+
+
+# --- Elimination formats -----------------------------------------------------
+
+
+def seed_order(bracket_size: int) -> list[int]:
+    """Return the 1-based seeds in bracket order for a power-of-two size.
+
+    Adjacent entries play each other in round 1 (1 vs last, 2 vs
+    second-to-last, ...) and the order guarantees that seeds 1 and 2 can
+    only meet in the final.
+    """
+    order = [1]
+    while len(order) < bracket_size:
+        mirror = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, mirror - top)]
+    return order
+
+
+def _winners_bracket(seeds: Sequence[Seed], drafts: list[_Draft]) -> list[list[int]]:
+    """Append the drafts of a single-elimination tree, returning them per round."""
+    count = len(seeds)
+    total_rounds = max(1, (count - 1).bit_length())
+    bracket_size = 1 << total_rounds
+    slots = [seeds[seed - 1] if seed <= count else None for seed in seed_order(bracket_size)]
+
+    rounds: list[list[int]] = []
+    feeders: list[_Source] = [("seed", player) for player in slots]
+    for round_number in range(1, total_rounds + 1):
+        indexes = []
+        for position, pair in enumerate(range(0, len(feeders), 2), start=1):
+            indexes.append(len(drafts))
+            drafts.append(
+                _Draft(
+                    STAGE_MAIN,
+                    round_number,
+                    position,
+                    feeders[pair],
+                    feeders[pair + 1],
+                    keep_bye=round_number == 1,
+                )
+            )
+        rounds.append(indexes)
+        feeders = [("winner", index) for index in indexes]
+    return rounds
+
+
+class SingleElimination(BracketFormat):
+    key = "single_elimination"
+    label = "Single elimination"
+
+    def build(self, seeds: Sequence[Seed]) -> list[MatchSpec]:
+        if len(seeds) < 2:
+            return []
+        drafts: list[_Draft] = []
+        _winners_bracket(seeds, drafts)
+        return _link(drafts)
+
+
+class DoubleElimination(BracketFormat):
+    """Winners bracket, losers bracket and a single grand final (no reset)."""
+
+    key = "double_elimination"
+    label = "Double elimination"
+
+    def build(self, seeds: Sequence[Seed]) -> list[MatchSpec]:
+        if len(seeds) < 2:
+            return []
+        drafts: list[_Draft] = []
+        winners = _winners_bracket(seeds, drafts)
+
+        # Losers round 1 pairs the round 1 losers; each even losers round
+        # brings in the losers of the next winners round (in reverse order to
+        # delay rematches) and each odd round halves the field again.
+        if len(winners) == 1:
+            survivors: list[_Source] = [("loser", winners[0][0])]
+        else:
+            losers_round = 1
+            survivors = self._pair_up(drafts, losers_round, [("loser", i) for i in winners[0]])
+            for winners_round in range(2, len(winners) + 1):
+                dropped = [("loser", i) for i in reversed(winners[winners_round - 1])]
+                losers_round += 1
+                survivors = [
+                    ("winner", self._add(drafts, losers_round, position, survivor, newcomer))
+                    for position, (survivor, newcomer) in enumerate(
+                        zip(survivors, dropped), start=1
+                    )
+                ]
+                if winners_round < len(winners):
+                    losers_round += 1
+                    survivors = self._pair_up(drafts, losers_round, survivors)
+
+        drafts.append(
+            _Draft(STAGE_FINAL, 1, 1, ("winner", winners[-1][0]), survivors[0])
+        )
+        return _link(drafts)
+
+    @staticmethod
+    def _add(drafts: list[_Draft], round_number: int, position: int, a: _Source, b: _Source) -> int:
+        drafts.append(_Draft(STAGE_LOSERS, round_number, position, a, b))
+        return len(drafts) - 1
+
+    def _pair_up(
+        self, drafts: list[_Draft], round_number: int, sources: list[_Source]
+    ) -> list[_Source]:
+        return [
+            ("winner", self._add(drafts, round_number, position, sources[pair], sources[pair + 1]))
+            for position, pair in enumerate(range(0, len(sources), 2), start=1)
+        ]
+
+
+# --- Pool formats ------------------------------------------------------------
+
+
+class RoundRobin(BracketFormat):
+    """Everyone plays everyone once, scheduled with the circle method."""
+
+    key = "round_robin"
+    label = "Round robin"
+    elimination = False
+
+    def total_rounds(self, count: int) -> int:
+        return count - 1 if count % 2 == 0 else count
+
+    def bracket_size(self, count: int) -> int:
+        return count
+
+    def build(self, seeds: Sequence[Seed]) -> list[MatchSpec]:
+        if len(seeds) < 2:
+            return []
+        players: list[Optional[Seed]] = list(seeds)
+        if len(players) % 2:
+            players.append(None)
+        half = len(players) // 2
+
+        specs: list[MatchSpec] = []
+        for round_number in range(1, len(players)):
+            position = 0
+            for index in range(half):
+                player_a, player_b = players[index], players[-1 - index]
+                if player_a is None or player_b is None:
+                    continue
+                position += 1
+                specs.append(MatchSpec(STAGE_MAIN, round_number, position, player_a, player_b))
+            # Keep the first player fixed and rotate everybody else.
+            players = [players[0], players[-1], *players[1:-1]]
+        return specs
+
+
+def standings(seeds: Sequence[Seed], played: Sequence[MatchSpec]) -> list[tuple[Seed, int]]:
+    """Return ``(seed, wins)`` ordered by wins, then by original seeding."""
+    wins = {seed: 0 for seed in seeds}
+    for spec in played:
+        if spec.winner is not None:
+            wins[spec.winner] = wins.get(spec.winner, 0) + 1
+    rank = {seed: index for index, seed in enumerate(seeds)}
+    return sorted(wins.items(), key=lambda item: (-item[1], rank.get(item[0], len(rank))))
+
+
+class Swiss(BracketFormat):
+    """ceil(log2(n)) rounds, each pairing players with the same score.
+
+    Round 1 pairs the top half against the bottom half; later rounds are
+    paired from the standings avoiding rematches where possible. With an odd
+    field the lowest-ranked player without a bye yet gets one (a decided
+    match that counts as a win).
+    """
+
+    key = "swiss"
+    label = "Swiss system"
+    elimination = False
+
+    def bracket_size(self, count: int) -> int:
+        return count
+
+    def build(self, seeds: Sequence[Seed]) -> list[MatchSpec]:
+        if len(seeds) < 2:
+            return []
+        players = list(seeds)
+        specs = self._bye(players, set(), 1)
+        half = len(players) // 2
+        specs[:0] = [
+            MatchSpec(STAGE_MAIN, 1, index + 1, players[index], players[index + half])
+            for index in range(half)
+        ]
+        return self._renumber(specs)
+
+    def next_round(self, seeds: Sequence[Seed], played: Sequence[MatchSpec]) -> list[MatchSpec]:
+        last_round = max((spec.round_number for spec in played), default=0)
+        if last_round >= self.total_rounds(len(seeds)):
+            return []
+        round_number = last_round + 1
+
+        opponents: dict[Seed, set[Seed]] = {seed: set() for seed in seeds}
+        had_bye = set()
+        for spec in played:
+            if spec.player_a is not None and spec.player_b is not None:
+                opponents[spec.player_a].add(spec.player_b)
+                opponents[spec.player_b].add(spec.player_a)
+            elif spec.winner is not None:
+                had_bye.add(spec.winner)
+
+        players = [seed for seed, _ in standings(seeds, played)]
+        specs = self._bye(players, had_bye, round_number)
+        pairs = self._pair(players, opponents)
+        specs[:0] = [
+            MatchSpec(STAGE_MAIN, round_number, 0, player_a, player_b)
+            for player_a, player_b in pairs
+        ]
+        return self._renumber(specs)
+
+    @staticmethod
+    def _bye(players: list[Seed], had_bye: set, round_number: int) -> list[MatchSpec]:
+        """Remove the bye player from ``players`` and return its decided match."""
+        if len(players) % 2 == 0:
+            return []
+        candidates = [seed for seed in reversed(players) if seed not in had_bye]
+        player = candidates[0] if candidates else players[-1]
+        players.remove(player)
+        return [MatchSpec(STAGE_MAIN, round_number, 0, player, None, winner=player)]
+
+    @staticmethod
+    def _pair(
+        players: list[Seed], opponents: dict[Seed, set[Seed]]
+    ) -> list[tuple[Seed, Seed]]:
+        """Pair players top-down with the best-placed opponent not met yet.
+
+        Falls back to a rematch when every remaining opponent has already
+        been played.
+        """
+        remaining = list(players)
+        pairs = []
+        while remaining:
+            first = remaining.pop(0)
+            index = next(
+                (i for i, candidate in enumerate(remaining) if candidate not in opponents[first]),
+                0,
+            )
+            pairs.append((first, remaining.pop(index)))
+        return pairs
+
+    @staticmethod
+    def _renumber(specs: list[MatchSpec]) -> list[MatchSpec]:
+        for position, spec in enumerate(specs, start=1):
+            spec.bracket_position = position
+        return specs
+
+
+# --- Registry ----------------------------------------------------------------
+
+FORMATS: dict[str, BracketFormat] = {
+    fmt.key: fmt for fmt in (SingleElimination(), DoubleElimination(), RoundRobin(), Swiss())
+}
+DEFAULT_FORMAT = SingleElimination.key
+
+
+def get_format(key: Optional[str]) -> BracketFormat:
+    """Return the format registered under ``key`` (single elimination by default)."""
+    return FORMATS.get(key or DEFAULT_FORMAT, FORMATS[DEFAULT_FORMAT])
+
+
+def format_choices() -> list[tuple[str, str]]:
+    return [(fmt.key, fmt.label) for fmt in FORMATS.values()]
+
+
+def simulate(
+    fmt: BracketFormat,
+    seeds: Sequence[Seed],
+    pick_winner: Optional[Callable[[MatchSpec], Seed]] = None,
+) -> list[MatchSpec]:
+    """Play a whole event in memory and return every match with its winner.
+
+    ``pick_winner`` decides each match (player A wins by default). Useful to
+    check a format or to generate fully played brackets for large fields.
+    """
+    pick_winner = pick_winner or (lambda spec: spec.player_a)
+    played: list[MatchSpec] = []
+    batch = fmt.build(seeds)
+    while batch:
+        for spec in batch:
+            if spec.winner is None and spec.player_a is not None and spec.player_b is not None:
+                spec.winner = pick_winner(spec)
+            for target, slot, player in (
+                (spec.next_match, spec.next_slot, spec.winner),
+                (spec.loser_next_match, spec.loser_next_slot, spec.loser),
+            ):
+                if target is not None and player is not None:
+                    setattr(batch[target], f"player_{slot}", player)
+        played.extend(batch)
+        batch = fmt.next_round(seeds, played)
+    return played
@@ -0,0 +1,226 @@
+"""Live bracket updates, fanned out to Server-Sent Event streams.
+
+Writers queue an event on the session (``publish_after_commit``); it is
+published once the transaction commits, like cache invalidation, so
+viewers never hear about a result that was rolled back. Each tournament
+has its own channel on the broker: Redis pub/sub (``EVENTS_BACKEND =
+"redis"``), which reaches the streams held by every worker process, or
+an in-process broker when Redis is unreachable and in tests.
+
+Match events carry the match, its winner, the slots the players moved
+into and the bracket version they produced, which the detail page
+applies to the bracket in place; ``reload`` tells the client to fetch
+the bracket again instead (new round inserted, bracket walked through
+its format, seeding), as does a version gap.
+"""
+from __future__ import annotations
+
+import json
+import queue
+import threading
+from typing import Optional
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING = "bracket_events"
+
+
+def channel(tournament_id: int) -> str:
+    prefix = current_app.config.get("CACHE_KEY_PREFIX", "tournaments")
+    return f"{prefix}:events:{tournament_id}"
+
+
+class LocalSubscription:
+    def __init__(self, broker: "LocalBroker", name: str, max_pending: int) -> None:
+        self._broker = broker
+        self._name = name
+        self._messages: queue.Queue[str] = queue.Queue(max_pending)
+        #: Set when messages were dropped because the viewer fell behind
+        self.overflowed = False
+
+    def put(self, message: str) -> None:
+        try:
+            self._messages.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout: float) -> Optional[str]:
+        try:
+            return self._messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._broker._unsubscribe(self._name, self)
+
+
+class LocalBroker:
+    """In-process fan-out: only reaches streams served by this process."""
+
+    def __init__(self, max_pending: int = 100) -> None:
+        self.max_pending = max_pending
+        self._subscribers: dict[str, set[LocalSubscription]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, name: str) -> LocalSubscription:
+        subscription = LocalSubscription(self, name, self.max_pending)
+        with self._lock:
+            self._subscribers.setdefault(name, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, name: str, subscription: LocalSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(name)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[name]
+
+    def publish(self, name: str, message: str) -> int:
+        with self._lock:
+            subscribers = list(self._subscribers.get(name, ()))
+        for subscription in subscribers:
+            subscription.put(message)
+        return len(subscribers)
+
+    def subscribers(self, name: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(name, ()))
+
+
+class RedisSubscription:
+    overflowed = False
+
+    def __init__(self, pubsub) -> None:
+        self._pubsub = pubsub
+
+    def get(self, timeout: float) -> Optional[str]:
+        message = self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None:
+            return None
+        data = message["data"]
+        return data.decode() if isinstance(data, bytes) else data
+
+    def close(self) -> None:
+        self._pubsub.close()
+
+
+class RedisBroker:
+    """Redis pub/sub: a result confirmed by any worker reaches every viewer."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def subscribe(self, name: str) -> RedisSubscription:
+        pubsub = self.client.pubsub()
+        pubsub.subscribe(name)
+        return RedisSubscription(pubsub)
+
+    def publish(self, name: str, message: str) -> int:
+        from redis import RedisError
+
+        try:
+            return int(self.client.publish(name, message))
+        except RedisError as exc:
+            current_app.logger.warning("Bracket event not published: %s", exc)
+            return 0
+
+
+def _redis_broker(url: str) -> Optional[RedisBroker]:
+    try:
+        import redis
+    except ImportError:
+        return None
+    # No socket timeout: subscribers block in get_message() with their own
+    client = redis.Redis.from_url(url, socket_connect_timeout=0.5)
+    try:
+        client.ping()
+    except redis.RedisError:
+        return None
+    return RedisBroker(client)
+
+
+def publish_after_commit(session: Session, tournament_id: int, payload: dict) -> None:
+    """Publish ``payload`` on the tournament's channel once ``session`` commits."""
+    session.info.setdefault(_PENDING, []).append((tournament_id, payload))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending or not has_app_context():
+        return
+    broker = current_app.extensions.get("bracket_events")
+    if broker is None:
+        return
+    for tournament_id, payload in pending:
+        broker.publish(
+            channel(tournament_id),
+            json.dumps({"tournament_id": tournament_id, **payload}, separators=(",", ":")),
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+def sse(data: str, event_name: Optional[str] = None) -> str:
+    """Format one Server-Sent Event."""
+    lines = [f"event: {event_name}"] if event_name else []
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+class StreamSlots:
+    """Caps the event streams one process serves at the same time.
+
+    Each open stream holds a worker thread until it times out; past the cap
+    new streams are turned away (503) so the remaining threads keep
+    serving ordinary requests.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.in_use = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self.limit and self.in_use >= self.limit:
+                return False
+            self.in_use += 1
+            return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+
+class BracketEvents:
+    """Flask extension holding the per-app event broker and stream slots."""
+
+    def init_app(self, app: Flask) -> None:
+        broker = None
+        if app.config.get("EVENTS_BACKEND") == "redis":
+            broker = _redis_broker(app.config.get("EVENTS_REDIS_URL") or app.config["REDIS_URL"])
+            if broker is None:
+                app.logger.warning(
+                    "Redis unavailable, bracket events only reach viewers of the same process."
+                )
+        if broker is None:
+            broker = LocalBroker(app.config.get("EVENTS_MAX_PENDING", 100))
+        app.extensions["bracket_events"] = broker
+        app.extensions["bracket_event_streams"] = StreamSlots(
+            app.config.get("EVENTS_MAX_STREAMS", 8)
+        )
+
+    @property
+    def broker(self):
+        return current_app.extensions["bracket_events"]
+
+    @property
+    def streams(self) -> StreamSlots:
+        return current_app.extensions["bracket_event_streams"]
@@ -0,0 +1,85 @@
+"""Read-side queries for tournament brackets.
+
+The detail page used to issue one query per round plus one lazy load per
+player slot. Everything here is loaded with a bounded number of statements
+so the cost of a page view does not grow with the bracket size.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy.orm import joinedload
+
+from ..models import Match
+from .bracket_engine import STAGE_FINAL, STAGE_LOSERS, STAGE_MAIN
+
+
+def bracket_query(tournament_id: int):
+    """Return the query behind ``load_bracket`` (one joined statement)."""
+    return (
+        Match.query.options(
+            joinedload(Match.player_a),
+            joinedload(Match.player_b),
+            joinedload(Match.winner),
+            joinedload(Match.player_a_reported_winner),
+            joinedload(Match.player_b_reported_winner),
+        )
+        .filter(Match.tournament_id == tournament_id)
+        .order_by(Match.round_number.asc(), Match.bracket_position.asc())
+    )
+
+
+def load_bracket(tournament_id: int) -> dict[str, dict[int, list[Match]]]:
+    """Return the matches of a tournament grouped by stage, then by round.
+
+    All matches and the participants referenced by their player, winner and
+    reported-winner slots are fetched in a single statement; the grouping is
+    done in memory. Stages come in bracket order (main, losers, final),
+    rounds ascending and matches within a round by bracket position, ready
+    to be passed to ``tournaments/detail.html``.
+    """
+    matches = bracket_query(tournament_id).all()
+
+    bracket: dict[str, dict[int, list[Match]]] = {
+        stage: {} for stage in (STAGE_MAIN, STAGE_LOSERS, STAGE_FINAL)
+    }
+    for match in matches:
+        rounds = bracket.setdefault(match.stage, {})
+        rounds.setdefault(match.round_number, []).append(match)
+    return {stage: rounds for stage, rounds in bracket.items() if rounds}
+
+
+def _player(participant) -> Optional[dict]:
+    if participant is None:
+        return None
+    return {
+        "id": participant.id,
+        "ranking": participant.ranking,
+        "license_number": participant.license_number,
+    }
+
+
+def bracket_payload(tournament_id: int) -> list[dict]:
+    """Return ``load_bracket`` as JSON-ready stages, rounds and matches."""
+    return [
+        {
+            "stage": stage,
+            "rounds": [
+                {
+                    "round": round_number,
+                    "matches": [
+                        {
+                            "id": match.id,
+                            "position": match.bracket_position,
+                            "player_a": _player(match.player_a),
+                            "player_b": _player(match.player_b),
+                            "winner_id": match.winner_id,
+                        }
+                        for match in matches
+                    ],
+                }
+                for round_number, matches in rounds.items()
+            ],
+        }
+        for stage, rounds in load_bracket(tournament_id).items()
+    ]
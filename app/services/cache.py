@@ -0,0 +1,240 @@
+"""Fragment and response cache for pages shared by every visitor.
+
+Entries live in Redis (``REDIS_URL``) when it is reachable and in a
+per-process LRU otherwise. Keys are grouped in namespaces that carry a
+generation number: invalidating a namespace bumps the generation, so every
+key written before is simply never read again (and ages out through its
+TTL or the LRU) instead of being deleted one by one.
+
+Only anonymous responses without flashed messages are cached whole; for
+logged-in users the shared fragment (e.g. the tournament list) comes from
+the cache and the personalised layout around it is rendered per request.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import Flask, Response, current_app, make_response, request, session
+from flask_login import current_user
+from markupsafe import Markup
+
+from .metrics import record_cache
+
+#: Namespace of the public tournament listings (home page and /tournaments/).
+LISTINGS = "listings"
+#: Namespace of rendered brackets, keyed on (tournament id, bracket version).
+BRACKETS = "brackets"
+
+
+class LocalCache:
+    """Thread-safe in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Optional[float], str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            _, value = self._entries.get(key, (None, "0"))
+            value = str(int(value) + 1)
+            self._entries[key] = (None, value)
+            self._entries.move_to_end(key)
+            return int(value)
+
+
+class RedisCache:
+    """The same interface on top of Redis.
+
+    Connection errors are logged and treated as misses, so an unavailable
+    Redis slows pages down instead of breaking them.
+    """
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def get(self, key: str) -> Optional[str]:
+        from redis import RedisError
+
+        try:
+            value = self.client.get(key)
+        except RedisError as exc:
+            current_app.logger.warning("Cache read failed: %s", exc)
+            return None
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        from redis import RedisError
+
+        try:
+            self.client.set(key, value, ex=int(ttl) if ttl else None)
+        except RedisError as exc:
+            current_app.logger.warning("Cache write failed: %s", exc)
+
+    def incr(self, key: str) -> int:
+        from redis import RedisError
+
+        try:
+            return int(self.client.incr(key))
+        except RedisError as exc:
+            current_app.logger.warning("Cache invalidation failed: %s", exc)
+            return 0
+
+
+def _redis_backend(url: str) -> Optional[RedisCache]:
+    try:
+        import redis
+    except ImportError:
+        return None
+    client = redis.Redis.from_url(url, socket_connect_timeout=0.5, socket_timeout=0.5)
+    try:
+        client.ping()
+    except redis.RedisError:
+        return None
+    return RedisCache(client)
+
+
+class Cache:
+    """Flask extension holding the per-app cache backend."""
+
+    def init_app(self, app: Flask) -> None:
+        backend = None
+        if app.config.get("CACHE_BACKEND") == "redis":
+            backend = _redis_backend(app.config.get("CACHE_REDIS_URL") or app.config["REDIS_URL"])
+            if backend is None:
+                app.logger.warning("Redis cache unavailable, using the in-process cache.")
+        if backend is None:
+            backend = LocalCache(app.config.get("CACHE_LOCAL_MAX_ENTRIES", 512))
+        app.extensions["cache"] = backend
+
+    @property
+    def backend(self):
+        return current_app.extensions["cache"]
+
+    def _prefix(self, namespace: str) -> str:
+        base = f"{current_app.config.get('CACHE_KEY_PREFIX', 'tournaments')}:{namespace}"
+        generation = self.backend.get(f"{base}:gen") or "0"
+        return f"{base}:{generation}"
+
+    def key(self, namespace: str, *parts) -> str:
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+        return f"{self._prefix(namespace)}:{digest}"
+
+    def get_or_set(
+        self,
+        namespace: str,
+        parts: tuple,
+        render: Callable[[], str],
+        ttl: Optional[float] = None,
+    ) -> str:
+        key = self.key(namespace, *parts)
+        value = self.backend.get(key)
+        record_cache(namespace, value is not None)
+        if value is None:
+            value = render()
+            self.backend.set(key, value, ttl or current_app.config.get("CACHE_DEFAULT_TTL"))
+        return value
+
+    def invalidate(self, namespace: str) -> None:
+        base = f"{current_app.config.get('CACHE_KEY_PREFIX', 'tournaments')}:{namespace}"
+        self.backend.incr(f"{base}:gen")
+
+    def fragment(
+        self,
+        namespace: str,
+        parts: tuple,
+        render: Callable[[], str],
+        ttl: Optional[float] = None,
+    ) -> Markup:
+        """Return the HTML produced by ``render``, cached under ``parts``."""
+        return Markup(self.get_or_set(namespace, parts, render, ttl))
+
+    def cached_response(self, namespace: str, ttl: Optional[float] = None):
+        """Cache the whole HTML response of a view for anonymous visitors."""
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not _cacheable_request():
+                    return view(*args, **kwargs)
+
+                key = self.key(namespace, "response", request.full_path)
+                body = self.backend.get(key)
+                record_cache(namespace, body is not None)
+                if body is not None:
+                    response = Response(body, mimetype="text/html")
+                else:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code == 200 and response.mimetype == "text/html":
+                        self.backend.set(
+                            key,
+                            response.get_data(as_text=True),
+                            ttl or current_app.config.get("CACHE_DEFAULT_TTL"),
+                        )
+                # Logged-in visitors get a different layout from the same URL
+                response.vary.add("Cookie")
+                return response
+
+            return wrapper
+
+        return decorator
+
+
+def make_etag(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def not_modified(etag: str, weak: bool = False) -> Optional[Response]:
+    """Return a 304 response when the client already holds ``etag``.
+
+    Weak ETags also match the compressed variants of a response.
+    """
+    if weak:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif etag not in request.if_none_match:
+        return None
+    response = Response(status=304)
+    response.set_etag(etag, weak=weak)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def with_etag(response: Response, etag: str, weak: bool = False) -> Response:
+    # ``no-cache`` makes browsers revalidate, which is cheap with the ETag
+    response.set_etag(etag, weak=weak)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _cacheable_request() -> bool:
+    return (
+        request.method == "GET"
+        and not current_user.is_authenticated
+        and not session.get("_flashes")
+    )
@@ -0,0 +1,136 @@
+"""Read side of the user dashboard (``/me``).
+
+Every list on the page is loaded with a fixed number of statements: the
+matches come with their tournament and both players (and their users)
+joined in, participant counts are read from ``Tournament.participant_count``,
+and nothing is left for the template to lazy-load.
+
+With ``DASHBOARD_PENDING_TABLE`` enabled the "next matches" list is read
+from ``pending_matches``, a per-user materialisation kept up to date by
+``refresh_pending_matches`` whenever a bracket is seeded or a result is
+confirmed, so the lookup is a primary-key range scan however many matches
+a player has ever played.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, true, union_all
+from sqlalchemy.orm import joinedload
+
+from ..extensions import db
+from ..models import Match, PendingMatch, Tournament, TournamentParticipant
+
+
+def pending_table_enabled() -> bool:
+    return bool(current_app.config.get("DASHBOARD_PENDING_TABLE"))
+
+
+def _with_players(query):
+    return query.options(
+        joinedload(Match.tournament),
+        joinedload(Match.player_a).joinedload(TournamentParticipant.user),
+        joinedload(Match.player_b).joinedload(TournamentParticipant.user),
+    ).order_by(Match.round_number.asc(), Match.bracket_position.asc())
+
+
+def pending_matches_query(user_id: int):
+    """Matches ``user_id`` still has to play against a known opponent.
+
+    The user's participant ids come from an uncorrelated subquery, so each
+    slot is matched through the partial ``ix_matches_pending_player_*``
+    indexes instead of a correlated ``EXISTS`` per row.
+    """
+    participant_ids = select(TournamentParticipant.id).where(
+        TournamentParticipant.user_id == user_id
+    )
+    return Match.query.filter(
+        Match.winner_id.is_(None),
+        Match.player_a_id.isnot(None),
+        Match.player_b_id.isnot(None),
+        Match.player_a_id.in_(participant_ids) | Match.player_b_id.in_(participant_ids),
+    )
+
+
+def pending_table_query(user_id: int):
+    """The same matches, read from the ``pending_matches`` materialisation."""
+    return Match.query.join(PendingMatch, PendingMatch.match_id == Match.id).filter(
+        PendingMatch.user_id == user_id
+    )
+
+
+def upcoming_matches(user_id: int) -> list[Match]:
+    """Pending matches of ``user_id``, ready to render (one statement)."""
+    if pending_table_enabled():
+        query = pending_table_query(user_id)
+    else:
+        query = pending_matches_query(user_id)
+    return _with_players(query).all()
+
+
+def tournaments_of_user(user_id: int) -> list[Tournament]:
+    return (
+        db.session.query(Tournament)
+        .join(TournamentParticipant)
+        .filter(TournamentParticipant.user_id == user_id)
+        .order_by(Tournament.start_at.asc())
+        .all()
+    )
+
+
+def _refresh(existing, scope) -> None:
+    # Results may still sit in the session
+    db.session.flush()
+    db.session.execute(delete(PendingMatch).where(existing))
+
+    players = [
+        select(TournamentParticipant.user_id, Match.id, Match.tournament_id)
+        .join(TournamentParticipant, TournamentParticipant.id == slot)
+        .where(
+            scope,
+            Match.winner_id.is_(None),
+            Match.player_a_id.isnot(None),
+            Match.player_b_id.isnot(None),
+        )
+        for slot in (Match.player_a_id, Match.player_b_id)
+    ]
+    db.session.execute(
+        insert(PendingMatch).from_select(
+            ["user_id", "match_id", "tournament_id"], union_all(*players)
+        )
+    )
+
+
+def refresh_pending_matches(
+    match_ids: Optional[Iterable[Optional[int]]] = None,
+    *,
+    tournament_id: Optional[int] = None,
+) -> None:
+    """Rebuild the ``pending_matches`` rows of some matches or a tournament.
+
+    Deletes the rows of the given matches (or of every match of
+    ``tournament_id``) and re-inserts one row per player of those still
+    pending, with two statements. Does nothing unless
+    ``DASHBOARD_PENDING_TABLE`` is enabled. The caller commits.
+    """
+    if not pending_table_enabled():
+        return
+    if match_ids is not None:
+        match_ids = {match_id for match_id in match_ids if match_id is not None}
+        if match_ids:
+            _refresh(PendingMatch.match_id.in_(match_ids), Match.id.in_(match_ids))
+    elif tournament_id is not None:
+        _refresh(
+            PendingMatch.tournament_id == tournament_id, Match.tournament_id == tournament_id
+        )
+
+
+def rebuild_pending_matches() -> int:
+    """Recompute the whole ``pending_matches`` table; returns its row count.
+
+    Used to backfill the table when ``DASHBOARD_PENDING_TABLE`` is turned
+    on for an existing database. The caller commits.
+    """
+    _refresh(true(), true())
+    return db.session.query(func.count()).select_from(PendingMatch).scalar()
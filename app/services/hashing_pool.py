@@ -0,0 +1,134 @@
+"""Password hashing off the request worker.
+
+With ``PASSWORD_HASH_WORKERS`` > 0, ``services.passwords`` runs every hash
+and verification in a pool of that many processes, so a burst of logins
+queues there instead of pinning every web worker's CPU. At most
+``PASSWORD_HASH_MAX_PENDING`` jobs are queued or running per web process;
+a request that cannot get a slot within ``PASSWORD_HASH_WAIT`` seconds
+fails with 503 (``HashingBusy``) rather than piling up behind the others.
+
+With 0 workers (the default) hashing stays inline. ``depth`` (jobs queued
+or running), ``peak_depth`` and ``rejected`` describe the pool's load.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from flask import Flask, current_app
+from werkzeug.exceptions import ServiceUnavailable
+
+
+class HashingBusy(ServiceUnavailable):
+    description = "The server is busy checking passwords, please try again in a moment."
+
+
+class ProcessHashingPool:
+    def __init__(self, workers: int, max_pending: int, wait: float) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.wait = wait
+        self.depth = 0
+        self.peak_depth = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # One pool per process: web workers forked after app creation must
+        # not share the parent's
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+    def _track(self, delta: int) -> None:
+        with self._lock:
+            self.depth += delta
+            self.peak_depth = max(self.peak_depth, self.depth)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(timeout=self.wait):
+            with self._lock:
+                self.rejected += 1
+            raise HashingBusy(retry_after=max(1, round(self.wait)))
+        self._track(1)
+        try:
+            future = self.executor.submit(fn, *args)
+        except BaseException:
+            self._track(-1)
+            self._slots.release()
+            raise
+
+        def _done(_future: Future) -> None:
+            self._track(-1)
+            self._slots.release()
+
+        future.add_done_callback(_done)
+        return future
+
+    def run(self, fn: Callable, *args):
+        return self.submit(fn, *args).result()
+
+    def map(self, fn: Callable, *iterables: Iterable, chunksize: int = 16) -> list:
+        """Batch work (CLI seeding): no backpressure, spread over all workers."""
+        return list(self.executor.map(fn, *iterables, chunksize=chunksize))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown()
+            self._executor = None
+
+
+class InlineHashing:
+    """Used when no pool is configured: hashing runs in the calling thread."""
+
+    workers = 0
+    depth = peak_depth = rejected = 0
+
+    def run(self, fn: Callable, *args):
+        return fn(*args)
+
+    def map(self, fn: Callable, *iterables: Iterable, chunksize: int = 16) -> list:
+        return list(map(fn, *iterables))
+
+    def shutdown(self) -> None:
+        pass
+
+
+class HashingExecutor:
+    """Flask extension holding the configured hashing pool."""
+
+    def init_app(self, app: Flask) -> None:
+        workers = app.config.get("PASSWORD_HASH_WORKERS", 0)
+        if workers > 0:
+            pool = ProcessHashingPool(
+                workers,
+                app.config.get("PASSWORD_HASH_MAX_PENDING") or 4 * workers,
+                app.config.get("PASSWORD_HASH_WAIT", 2.0),
+            )
+        else:
+            pool = InlineHashing()
+        app.extensions["hashing_executor"] = pool
+
+    @property
+    def pool(self):
+        return current_app.extensions["hashing_executor"]
+
+    def run(self, fn: Callable, *args):
+        return self.pool.run(fn, *args)
+
+    def map(self, fn: Callable, *iterables: Iterable, chunksize: int = 16) -> list:
+        return self.pool.map(fn, *iterables, chunksize=chunksize)
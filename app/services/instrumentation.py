@@ -0,0 +1,199 @@
+"""Per-request SQL accounting.
+
+Every statement run on the app's engines is timed. Within a request the
+count and total time accumulate on ``g`` and are folded into per-endpoint
+statistics when the response goes out; statements slower than
+``SQL_SLOW_QUERY_MS`` are logged with their parameters.
+
+``SQL_STATS_HEADER`` adds ``Server-Timing: db;dur=<ms>;desc="<n> queries"``
+to every response, and ``SQL_STATS_ENDPOINT`` serves the per-endpoint
+statistics as JSON at ``/_debug/sql``. Both are meant for development.
+
+``capture_queries()`` records the statements run inside a ``with`` block,
+whatever the context: the test suite uses it to cap the queries a view
+may issue.
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from flask import (
+    Flask,
+    current_app,
+    g,
+    has_request_context,
+    jsonify,
+    request,
+    request_finished,
+    request_started,
+)
+from sqlalchemy import event
+
+_START = "instrumentation_start"
+
+
+@dataclass
+class QueryLog:
+    """Statements recorded by ``capture_queries``."""
+
+    statements: list[tuple[str, float]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def sql(self) -> list[str]:
+        return [statement for statement, _ in self.statements]
+
+    @property
+    def duration(self) -> float:
+        return sum(duration for _, duration in self.statements)
+
+    def __str__(self) -> str:
+        return "\n".join(
+            f"{index}. ({duration * 1000:.1f} ms) {statement}"
+            for index, (statement, duration) in enumerate(self.statements, 1)
+        )
+
+
+_captures: contextvars.ContextVar[tuple[QueryLog, ...]] = contextvars.ContextVar(
+    "sql_captures", default=()
+)
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+    log = QueryLog()
+    token = _captures.set(_captures.get() + (log,))
+    try:
+        yield log
+    finally:
+        _captures.reset(token)
+
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    queries: int = 0
+    max_queries: int = 0
+    db_time: float = 0.0
+    max_db_time: float = 0.0
+
+    def add(self, queries: int, db_time: float) -> None:
+        self.requests += 1
+        self.queries += queries
+        self.max_queries = max(self.max_queries, queries)
+        self.db_time += db_time
+        self.max_db_time = max(self.max_db_time, db_time)
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "avg_queries": round(self.queries / self.requests, 2) if self.requests else 0,
+            "max_queries": self.max_queries,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "avg_db_time_ms": round(self.db_time * 1000 / self.requests, 2) if self.requests else 0,
+            "max_db_time_ms": round(self.max_db_time * 1000, 2),
+        }
+
+
+class SQLStats:
+    """Per-endpoint totals of one app, shared by its threads."""
+
+    def __init__(self) -> None:
+        self._endpoints: dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint: str, queries: int, db_time: float) -> None:
+        with self._lock:
+            self._endpoints.setdefault(endpoint, EndpointStats()).add(queries, db_time)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._endpoints.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START)
+    if not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+
+    for log in _captures.get():
+        log.statements.append((statement, duration))
+
+    if not has_request_context() or "sql_stats" not in current_app.extensions:
+        return
+    g.sql_queries = g.get("sql_queries", 0) + 1
+    g.sql_time = g.get("sql_time", 0.0) + duration
+    threshold = current_app.config.get("SQL_SLOW_QUERY_MS")
+    if threshold is not None and duration * 1000 >= threshold:
+        current_app.logger.warning(
+            "Slow query (%.1f ms) in %s: %s; parameters: %r",
+            duration * 1000,
+            request.endpoint,
+            statement,
+            parameters,
+        )
+
+
+def _start_request(sender: Flask, **extra) -> None:
+    # The app context (and ``g``) may outlive one request, e.g. in tests
+    g.sql_queries = 0
+    g.sql_time = 0.0
+
+
+def _finish_request(sender: Flask, response, **extra) -> None:
+    queries = g.get("sql_queries", 0)
+    db_time = g.get("sql_time", 0.0)
+    current_app.extensions["sql_stats"].add(request.endpoint or "<unmatched>", queries, db_time)
+    if current_app.config.get("SQL_STATS_HEADER"):
+        response.headers.add(
+            "Server-Timing", f'db;dur={db_time * 1000:.1f};desc="{queries} queries"'
+        )
+
+
+def _debug_sql():
+    stats = current_app.extensions["sql_stats"]
+    if request.args.get("reset"):
+        stats.reset()
+    return jsonify(stats.snapshot())
+
+
+class SQLInstrumentation:
+    """Flask extension wiring the engine events and request hooks."""
+
+    def init_app(self, app: Flask, db) -> None:
+        with app.app_context():
+            engines = list(db.engines.values())
+        # Statement capture works even with the request accounting disabled
+        for engine in engines:
+            if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+                event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+                event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        if not app.config.get("SQL_INSTRUMENTATION", True):
+            return
+        app.extensions["sql_stats"] = SQLStats()
+        request_started.connect(_start_request, app)
+        request_finished.connect(_finish_request, app)
+        if app.config.get("SQL_STATS_ENDPOINT"):
+            app.add_url_rule("/_debug/sql", "debug_sql", _debug_sql)
+
+    @property
+    def stats(self) -> SQLStats:
+        return current_app.extensions["sql_stats"]
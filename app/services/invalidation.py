@@ -0,0 +1,42 @@
+"""Drop cached pages when the data behind them changes.
+
+Mapper events only flag the session; the cache is invalidated once the
+transaction commits, so a concurrent request cannot re-cache the old rows
+between the flush and the commit, and a rollback invalidates nothing.
+Covers the create/edit/delete routes as well as the CLI seeders. Core
+statements (bulk inserts, ``update()``) bypass mapper events and must call
+``cache.invalidate`` themselves.
+"""
+from __future__ import annotations
+
+from flask import has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from ..extensions import cache
+from ..models import Tournament
+from .cache import LISTINGS
+
+_PENDING = "invalidate_namespaces"
+
+
+@event.listens_for(Tournament, "after_insert")
+@event.listens_for(Tournament, "after_update")
+@event.listens_for(Tournament, "after_delete")
+def _tournament_changed(mapper, connection, target: Tournament) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_PENDING, set()).add(LISTINGS)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    namespaces = session.info.pop(_PENDING, None)
+    if namespaces and has_app_context():
+        for namespace in namespaces:
+            cache.invalidate(namespace)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING, None)
@@ -0,0 +1,312 @@
+"""Production-sized demo data for performance work (``flask seed-load``).
+
+Generates users, tournaments in every state of their lifecycle, their
+participants and their brackets, fully played for completed tournaments
+and one round in for running ones, in a few bulk statements per chunk:
+
+* every user shares one password hash, computed once;
+* users and participants are streamed with ``COPY ... FROM STDIN`` on
+  PostgreSQL (psycopg) and inserted with executemany elsewhere;
+* brackets are generated and played in memory (``bracket_engine.simulate``)
+  and written with ``bracket_builder.insert_specs``;
+* every chunk of tournaments commits on its own, and chunks are spread
+  over ``workers`` threads, each with its own connection (a single one on
+  SQLite, which has one writer at a time).
+
+Rows go in through Core, so the ORM events that maintain
+``participant_count``, the search index, the page caches and the pending
+matches table do not fire: the generator fills the counters itself and
+refreshes the rest once at the end.
+"""
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional, Sequence
+
+from flask import Flask, current_app
+from sqlalchemy import insert, select
+
+from ..extensions import cache, db
+from ..models import Tournament, TournamentParticipant, User
+from .bracket_builder import insert_specs
+from .bracket_engine import MatchSpec, get_format, simulate
+from .cache import LISTINGS
+from .dashboard import pending_table_enabled, rebuild_pending_matches
+from .passwords import hash_password
+
+LOAD_PASSWORD = "Password123!"
+DISCIPLINES = ("tennis", "chess", "padel", "table tennis", "badminton", "squash", "darts")
+CITIES = ("Milano", "Roma", "Torino", "Napoli", "Bologna", "Firenze", "Bari", "Genova")
+FIELD_SIZES = (8, 12, 16, 24, 32, 48, 64, 128)
+FORMAT_WEIGHTS = {"single_elimination": 6, "double_elimination": 2, "round_robin": 1, "swiss": 1}
+# Share of tournaments per lifecycle state
+STATE_WEIGHTS = {
+    Tournament.STATUS_COMPLETED: 5,
+    Tournament.STATUS_RUNNING: 2,
+    Tournament.STATUS_SEEDED: 1,
+    Tournament.STATUS_DRAFT: 2,
+}
+# Largest field per format: round robin grows quadratically
+MAX_POOL_FIELD = 32
+
+
+@dataclass
+class LoadPlan:
+    users: int = 10_000
+    tournaments: int = 500
+    # Tournaments per transaction, users per COPY/executemany batch
+    chunk_size: int = 100
+    user_chunk_size: int = 5000
+    workers: int = 4
+    seed: Optional[int] = None
+
+
+@dataclass
+class LoadResult:
+    users: int = 0
+    tournaments: int = 0
+    participants: int = 0
+    matches: int = 0
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        elapsed = sum(self.timings.values())
+        steps = ", ".join(f"{step} {seconds:.1f}s" for step, seconds in self.timings.items())
+        return (
+            f"{self.users} users, {self.tournaments} tournaments, "
+            f"{self.participants} participants, {self.matches} matches "
+            f"in {elapsed:.1f}s ({steps})"
+        )
+
+
+def copy_rows(table, columns: Sequence[str], rows: Iterable[tuple]) -> None:
+    """Write ``rows`` into ``table`` in the session's transaction.
+
+    Uses ``COPY FROM STDIN`` with psycopg, a Core executemany otherwise.
+    """
+    connection = db.session.connection()
+    if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg":
+        cursor = connection.connection.cursor()
+        try:
+            statement = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+            with cursor.copy(statement) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        finally:
+            cursor.close()
+        return
+    rows = [dict(zip(columns, row)) for row in rows]
+    if rows:
+        connection.execute(insert(table), rows)
+
+
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _insert_users(count: int, tag: str, password_hash: str, chunk_size: int) -> list[int]:
+    now = datetime.utcnow()
+    columns = (
+        "first_name",
+        "last_name",
+        "email",
+        "password_hash",
+        "is_active",
+        "confirmed_at",
+        "created_at",
+        "updated_at",
+    )
+    for start in range(0, count, chunk_size):
+        copy_rows(
+            User.__table__,
+            columns,
+            (
+                ("Load", f"User {index}", f"load-{tag}-{index}@example.invalid",
+                 password_hash, True, now, now, now)
+                for index in range(start, min(count, start + chunk_size))
+            ),
+        )
+        db.session.commit()
+    return list(
+        db.session.scalars(
+            select(User.id).where(User.email.like(f"load-{tag}-%")).order_by(User.id)
+        )
+    )
+
+
+def _tournament_row(
+    rng: random.Random, index: int, tag: str, user_ids: list[int], now: datetime
+) -> dict:
+    status = rng.choices(list(STATE_WEIGHTS), weights=list(STATE_WEIGHTS.values()))[0]
+    bracket_format = rng.choices(list(FORMAT_WEIGHTS), weights=list(FORMAT_WEIGHTS.values()))[0]
+    size = rng.choice(FIELD_SIZES)
+    if bracket_format in ("round_robin", "swiss"):
+        size = min(size, MAX_POOL_FIELD)
+    if status == Tournament.STATUS_DRAFT:
+        start_at = now + timedelta(days=rng.randint(7, 180))
+        signup_deadline = start_at - timedelta(days=rng.randint(1, 6))
+        entrants = rng.randint(0, size)
+    else:
+        earliest = 2 if status == Tournament.STATUS_COMPLETED else 0
+        start_at = now - timedelta(days=rng.randint(earliest, 720))
+        signup_deadline = start_at - timedelta(days=rng.randint(1, 14))
+        entrants = rng.randint(max(2, size // 2), size)
+    entrants = min(entrants, len(user_ids))
+    seeded = status != Tournament.STATUS_DRAFT and entrants >= 2
+    fmt = get_format(bracket_format)
+    discipline = rng.choice(DISCIPLINES)
+    city = rng.choice(CITIES)
+    return {
+        "organizer_id": rng.choice(user_ids),
+        "name": f"{city} {discipline.title()} Open {index} ({tag})",
+        "discipline": discipline,
+        "description": f"Load test {discipline} tournament in {city}.",
+        "venue_name": f"{city} Sports Center",
+        "start_at": start_at,
+        "signup_deadline": signup_deadline,
+        "max_participants": size,
+        "sponsor_assets": {},
+        "status": status,
+        "bracket_format": bracket_format,
+        "bracket_version": 0 if status == Tournament.STATUS_DRAFT else 1,
+        "participant_count": entrants,
+        "bracket_size": fmt.bracket_size(entrants) if seeded else None,
+        "total_rounds": fmt.total_rounds(entrants) if seeded else None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _play_first_round(specs: list[MatchSpec], rng: random.Random) -> list[MatchSpec]:
+    for spec in specs:
+        if spec.round_number != 1 or spec.winner is not None:
+            continue
+        if spec.player_a is None or spec.player_b is None:
+            continue
+        spec.winner = rng.choice((spec.player_a, spec.player_b))
+        for target, slot, player in (
+            (spec.next_match, spec.next_slot, spec.winner),
+            (spec.loser_next_match, spec.loser_next_slot, spec.loser),
+        ):
+            if target is not None:
+                setattr(specs[target], f"player_{slot}", player)
+    return specs
+
+
+def _bracket(tournament: dict, seeds: list[int], rng: random.Random) -> list[MatchSpec]:
+    fmt = get_format(tournament["bracket_format"])
+    if tournament["status"] == Tournament.STATUS_COMPLETED:
+        # Better seeds win two times out of three
+        return simulate(
+            fmt,
+            seeds,
+            lambda spec: spec.player_a if rng.random() < 0.66 else spec.player_b,
+        )
+    specs = fmt.build(seeds)
+    if tournament["status"] == Tournament.STATUS_RUNNING:
+        _play_first_round(specs, rng)
+    return specs
+
+
+def _insert_chunk(rows: list[dict], user_ids: list[int], seed: int) -> tuple[int, int]:
+    """Insert one chunk of tournaments with their participants and brackets."""
+    rng = random.Random(seed)
+    tournament_ids = (
+        db.session.execute(
+            insert(Tournament).returning(Tournament.id, sort_by_parameter_order=True), rows
+        )
+        .scalars()
+        .all()
+    )
+
+    now = datetime.utcnow()
+    columns = ("tournament_id", "user_id", "license_number", "ranking", "status", "seed",
+               "created_at", "updated_at")
+    entries = []
+    for tournament_id, row in zip(tournament_ids, rows):
+        seeded = row["status"] != Tournament.STATUS_DRAFT
+        for ranking, user_id in enumerate(rng.sample(user_ids, row["participant_count"]), 1):
+            entries.append((
+                tournament_id, user_id, f"LIC-{tournament_id}-{ranking}", ranking,
+                TournamentParticipant.STATUS_PENDING, ranking if seeded else None, now, now,
+            ))
+    copy_rows(TournamentParticipant.__table__, columns, entries)
+
+    seeds: dict[int, list[int]] = {tournament_id: [] for tournament_id in tournament_ids}
+    for tournament_id, participant_id in db.session.execute(
+        select(TournamentParticipant.tournament_id, TournamentParticipant.id)
+        .where(TournamentParticipant.tournament_id.in_(tournament_ids))
+        .order_by(TournamentParticipant.tournament_id, TournamentParticipant.ranking)
+    ):
+        seeds[tournament_id].append(participant_id)
+
+    matches = 0
+    for tournament_id, row in zip(tournament_ids, rows):
+        if row["status"] != Tournament.STATUS_DRAFT and len(seeds[tournament_id]) >= 2:
+            matches += insert_specs(tournament_id, _bracket(row, seeds[tournament_id], rng))
+    db.session.commit()
+    return len(entries), matches
+
+
+def _timed(result: LoadResult, step: str, fn: Callable, *args):
+    started = time.perf_counter()
+    value = fn(*args)
+    result.timings[step] = time.perf_counter() - started
+    return value
+
+
+def generate_load_data(app: Flask, plan: LoadPlan) -> LoadResult:
+    """Fill the database of ``app`` according to ``plan``."""
+    rng = random.Random(plan.seed)
+    # Keeps emails and names unique across runs, whatever the seed
+    tag = uuid.uuid4().hex[:8]
+    result = LoadResult()
+
+    with app.app_context():
+        password_hash = hash_password(LOAD_PASSWORD)
+        user_ids = _timed(
+            result, "users", _insert_users, plan.users, tag, password_hash, plan.user_chunk_size
+        )
+        result.users = len(user_ids)
+        workers = 1 if db.engine.dialect.name == "sqlite" else max(1, plan.workers)
+
+    now = datetime.utcnow()
+    rows = [_tournament_row(rng, index, tag, user_ids, now) for index in range(plan.tournaments)]
+    chunks = [(list(chunk), rng.getrandbits(32)) for chunk in _chunks(rows, plan.chunk_size)]
+
+    def run(chunk: tuple[list[dict], int]) -> tuple[int, int]:
+        with app.app_context():
+            try:
+                return _insert_chunk(chunk[0], user_ids, chunk[1])
+            finally:
+                db.session.remove()
+
+    def insert_all() -> list[tuple[int, int]]:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, chunks))
+
+    counts = _timed(result, "tournaments", insert_all)
+    result.tournaments = len(rows)
+    result.participants = sum(participants for participants, _ in counts)
+    result.matches = sum(matches for _, matches in counts)
+
+    with app.app_context():
+        _timed(result, "refresh", _refresh_derived)
+    return result
+
+
+def _refresh_derived() -> None:
+    """What the ORM events would have done for rows written through Core."""
+    if pending_table_enabled():
+        rebuild_pending_matches()
+        db.session.commit()
+    # The in-process search index (not used on PostgreSQL) is rebuilt on
+    # next use; running servers only pick the new rows up after a restart
+    current_app.extensions.pop("tournament_search", None)
+    cache.invalidate(LISTINGS)
@@ -0,0 +1,26 @@
+"""Celery task behind ``MAIL_QUEUE_BACKEND = "celery"``.
+
+Start a worker with ``celery -A celery_worker worker``.
+"""
+from __future__ import annotations
+
+from celery import shared_task
+
+from .mailer import deliver_batch, is_transient, retry_delay
+
+
+@shared_task(bind=True, name="mail.send_batch")
+def send_mail_batch(self, payloads: list[dict]) -> None:
+    """Send ``payloads`` over one SMTP connection; retry what is left."""
+    try:
+        deliver_batch(payloads)
+    except Exception as exc:
+        if not is_transient(exc):
+            raise
+        # ``payloads`` now only holds the messages that were not sent
+        raise self.retry(
+            args=(payloads,),
+            exc=exc,
+            countdown=retry_delay(self.request.retries + 1, self.app.conf.mail_retry_backoff),
+            max_retries=self.app.conf.mail_max_retries,
+        )
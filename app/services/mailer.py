@@ -0,0 +1,323 @@
+"""Background email delivery.
+
+Requests never talk to the SMTP server: they hand a message to the queue
+selected by ``MAIL_QUEUE_BACKEND`` and return.
+
+``celery``
+    One Celery task per enqueue call (see ``services.mail_tasks``), retried
+    with exponential backoff by the worker. Falls back to ``thread`` when
+    Celery is not installed or the broker cannot be reached.
+``thread``
+    ``MAIL_QUEUE_WORKERS`` daemon threads in the web process. Each drains
+    up to ``MAIL_BATCH_SIZE`` messages (waiting at most
+    ``MAIL_BATCH_WINDOW`` seconds for a batch to fill) and sends them over
+    a single SMTP connection, retrying the unsent part of a batch
+    ``MAIL_MAX_RETRIES`` times with exponential backoff. When the process
+    exits (a Gunicorn worker restarting, say), queued messages are still
+    sent, for up to ``MAIL_SHUTDOWN_TIMEOUT`` seconds.
+``sync``
+    Sends inline, one attempt. Used by the test suite.
+
+Messages travel as plain dicts so that they can be serialised for Celery.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import smtplib
+import threading
+import time
+from typing import Optional
+
+from flask import Flask, current_app
+from flask_mail import Message
+
+# Errors worth retrying: the server or the network, not the message
+TRANSIENT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, OSError)
+# 4xx replies are temporary by definition
+TEMPORARY_REPLY = range(400, 500)
+
+
+def message_payload(message: Message) -> dict:
+    return {
+        "subject": message.subject,
+        "sender": message.sender,
+        "recipients": list(message.recipients),
+        "body": message.body,
+        "html": message.html,
+    }
+
+
+def build_message(payload: dict) -> Message:
+    return Message(
+        subject=payload["subject"],
+        sender=payload.get("sender") or current_app.config.get("MAIL_DEFAULT_SENDER"),
+        recipients=payload["recipients"],
+        body=payload.get("body"),
+        html=payload.get("html"),
+    )
+
+
+def is_transient(exc: Exception) -> bool:
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code in TEMPORARY_REPLY
+    return isinstance(exc, TRANSIENT_ERRORS)
+
+
+def deliver_batch(payloads: list[dict]) -> None:
+    """Send ``payloads`` over one SMTP connection, removing each once sent.
+
+    Messages that fail for good (refused by the server, or a payload that
+    cannot be built or encoded) are logged and dropped without affecting
+    the rest of the batch. On a transient error the exception propagates
+    and ``payloads`` holds what is left to send, so the caller can retry
+    just that part.
+    """
+    # The Flask-Mail state of the current app; one SMTP session for the batch
+    with current_app.extensions["mail"].connect() as connection:
+        while payloads:
+            try:
+                connection.send(build_message(payloads[0]))
+            except Exception as exc:
+                if is_transient(exc):
+                    raise
+                _log_undelivered(payloads[0], exc)
+            payloads.pop(0)
+
+
+def _log_undelivered(payload: dict, exc: Exception) -> None:
+    current_app.logger.warning(
+        "Email '%s' to %s not delivered: %s", payload.get("subject"), payload.get("recipients"), exc
+    )
+    # Keeps the links usable in development, where no mail server runs
+    current_app.logger.info("Undelivered email body:\n%s", payload.get("body"))
+
+
+def retry_delay(attempt: int, base: float) -> float:
+    """Seconds to wait before retry number ``attempt`` (1-based)."""
+    return base * 2 ** (attempt - 1)
+
+
+class SyncMailQueue:
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+
+    def enqueue(self, payloads: list[dict]) -> None:
+        payloads = list(payloads)
+        try:
+            deliver_batch(payloads)
+        except Exception as exc:  # never fail the request over an email
+            for payload in payloads:
+                _log_undelivered(payload, exc)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+
+_STOP = object()
+
+
+class ThreadMailQueue:
+    """Batching dispatcher threads inside the web process.
+
+    Threads start on first use in each process, so Gunicorn workers forked
+    after the app was created get their own, and each process drains its
+    queue on exit.
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.batch_size = app.config.get("MAIL_BATCH_SIZE", 50)
+        self.batch_window = app.config.get("MAIL_BATCH_WINDOW", 0.5)
+        self.max_retries = app.config.get("MAIL_MAX_RETRIES", 5)
+        self.retry_backoff = app.config.get("MAIL_RETRY_BACKOFF", 2.0)
+        self.workers = app.config.get("MAIL_QUEUE_WORKERS", 2)
+        self.shutdown_timeout = app.config.get("MAIL_SHUTDOWN_TIMEOUT", 10.0)
+        self._queue: queue.Queue = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._drain_registered = False
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def enqueue(self, payloads: list[dict]) -> None:
+        self._ensure_started()
+        for payload in payloads:
+            self._queue.put(payload)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued message was handled; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            for _ in self._threads:
+                self._queue.put(_STOP)
+            for thread in self._threads:
+                thread.join(timeout)
+            self._threads = []
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._threads:
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._threads:
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue()
+            self._pid = os.getpid()
+            self._threads = [
+                threading.Thread(target=self._run, name=f"mail-queue-{index}", daemon=True)
+                for index in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            if not self._drain_registered:
+                # Daemon threads die with the interpreter: send what is queued first
+                atexit.register(self._drain)
+                self._drain_registered = True
+
+    def _drain(self) -> None:
+        if self._pid != os.getpid() or not self._threads:
+            return
+        if not self.flush(self.shutdown_timeout):
+            self.app.logger.warning(
+                "%s queued emails not delivered before exit", self._queue.unfinished_tasks
+            )
+        self.shutdown(self.shutdown_timeout)
+
+    def _next_batch(self) -> Optional[list[dict]]:
+        first = self._queue.get()
+        if first is _STOP:
+            self._queue.task_done()
+            return None
+        batch = [first]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Let another worker (or this one, next time) see it
+                self._queue.put(_STOP)
+                self._queue.task_done()
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            size = len(batch)
+            try:
+                with self.app.app_context():
+                    self._deliver_with_retries(batch)
+            finally:
+                for _ in range(size):
+                    self._queue.task_done()
+
+    def _deliver_with_retries(self, batch: list[dict]) -> None:
+        attempt = 0
+        while batch:
+            try:
+                deliver_batch(batch)
+            except Exception as exc:
+                attempt += 1
+                if not is_transient(exc) or attempt > self.max_retries:
+                    for payload in batch:
+                        _log_undelivered(payload, exc)
+                    return
+                delay = retry_delay(attempt, self.retry_backoff)
+                current_app.logger.info(
+                    "SMTP delivery failed (%s), retry %s in %.1fs", exc, attempt, delay
+                )
+                time.sleep(delay)
+
+
+class CeleryMailQueue:
+    """Hands messages to the Celery worker; in-process threads as a fallback."""
+
+    def __init__(self, app: Flask, fallback: ThreadMailQueue) -> None:
+        self.app = app
+        self.fallback = fallback
+
+    def enqueue(self, payloads: list[dict]) -> None:
+        from .mail_tasks import send_mail_batch
+
+        try:
+            send_mail_batch.delay(payloads)
+        except Exception as exc:  # broker unreachable
+            current_app.logger.warning("Mail broker unavailable (%s), sending in-process", exc)
+            self.fallback.enqueue(payloads)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self.fallback.flush(timeout)
+
+
+class MailQueue:
+    """Flask extension: ``mail_queue.send(message)`` from request code."""
+
+    def init_app(self, app: Flask) -> None:
+        backend = app.config.get("MAIL_QUEUE_BACKEND", "thread")
+        if backend == "sync":
+            dispatcher = SyncMailQueue(app)
+        elif backend == "celery" and _init_celery(app):
+            dispatcher = CeleryMailQueue(app, ThreadMailQueue(app))
+        else:
+            dispatcher = ThreadMailQueue(app)
+        app.extensions["mail_queue"] = dispatcher
+
+    @property
+    def dispatcher(self):
+        return current_app.extensions["mail_queue"]
+
+    def send(self, *messages: Message) -> None:
+        """Queue ``messages`` for delivery and return immediately."""
+        self.dispatcher.enqueue([message_payload(message) for message in messages])
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for in-process deliveries (tests, CLI commands before exit)."""
+        return self.dispatcher.flush(timeout)
+
+
+def _init_celery(app: Flask) -> bool:
+    try:
+        from celery import Celery, Task
+    except ImportError:
+        app.logger.warning("Celery is not installed, mail is sent in-process.")
+        return False
+
+    class FlaskTask(Task):
+        def __call__(self, *args, **kwargs):
+            with app.app_context():
+                return self.run(*args, **kwargs)
+
+    celery = Celery(app.import_name, task_cls=FlaskTask)
+    celery.conf.update(
+        broker_url=app.config.get("CELERY_BROKER_URL") or app.config["REDIS_URL"],
+        task_ignore_result=True,
+        task_acks_late=True,
+        # Fail fast at enqueue time so the request can fall back to threads
+        task_publish_retry=False,
+        broker_connection_timeout=2,
+        mail_max_retries=app.config.get("MAIL_MAX_RETRIES", 5),
+        mail_retry_backoff=app.config.get("MAIL_RETRY_BACKOFF", 2.0),
+    )
+    celery.set_default()
+    app.extensions["celery"] = celery
+    return True
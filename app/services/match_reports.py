@@ -0,0 +1,151 @@
+"""Players reporting match results, without locking the match row.
+
+Each player declares who won; when both declarations agree the result is
+confirmed and the winner advances, when they differ both are cleared.
+Two players reporting at the same instant used to read the match, both
+write their own declaration and each miss the other's: one declaration
+was lost, or neither saw both and the result was never confirmed.
+
+``report_result`` reads the match and both players' user ids in one
+statement, decides the new declarations/winner from what it read, and
+writes them with a compare-and-swap on ``Match.version``: the
+``UPDATE ... WHERE version = <read>`` only applies if nobody changed the
+match in between. Otherwise it re-reads and tries again, up to
+``MATCH_REPORT_RETRIES`` times with a short randomised backoff. No row
+lock is held, so reports of different matches never wait on each other.
+"""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy import update
+from sqlalchemy.orm import aliased
+
+from ..extensions import db
+from ..models import Match, TournamentParticipant
+from .advancement import advance_winner
+
+RECORDED = "recorded"  # waiting for the other player
+CONFIRMED = "confirmed"
+MISMATCH = "mismatch"  # declarations differ, both cleared
+ALREADY_DECIDED = "already_decided"
+INCOMPLETE = "incomplete"  # bye or opponent still unknown
+NOT_PLAYER = "not_player"
+INVALID_WINNER = "invalid_winner"
+NOT_FOUND = "not_found"
+BUSY = "busy"  # still contended after every retry
+
+
+@dataclass
+class ReportResult:
+    outcome: str
+    tournament_id: Optional[int] = None
+    #: Compare-and-swap attempts made (1 without contention)
+    attempts: int = 0
+
+
+def _read(match_id: int):
+    player_a = aliased(TournamentParticipant)
+    player_b = aliased(TournamentParticipant)
+    return (
+        db.session.query(
+            Match.tournament_id,
+            Match.player_a_id,
+            Match.player_b_id,
+            Match.winner_id,
+            Match.player_a_reported_winner_id,
+            Match.player_b_reported_winner_id,
+            Match.version,
+            player_a.user_id.label("player_a_user_id"),
+            player_b.user_id.label("player_b_user_id"),
+        )
+        .outerjoin(player_a, player_a.id == Match.player_a_id)
+        .outerjoin(player_b, player_b.id == Match.player_b_id)
+        .filter(Match.id == match_id)
+        .first()
+    )
+
+
+def _decide(row, user_id: int, declared_winner_id: int) -> tuple[str, dict]:
+    """The outcome and the column values to write, from one read of the match."""
+    a_report = row.player_a_reported_winner_id
+    b_report = row.player_b_reported_winner_id
+    if user_id == row.player_a_user_id:
+        a_report = declared_winner_id
+    else:
+        b_report = declared_winner_id
+
+    if a_report is None or b_report is None:
+        return RECORDED, {
+            "player_a_reported_winner_id": a_report,
+            "player_b_reported_winner_id": b_report,
+        }
+    if a_report == b_report:
+        return CONFIRMED, {
+            "player_a_reported_winner_id": a_report,
+            "player_b_reported_winner_id": b_report,
+            "winner_id": a_report,
+        }
+    # Conflict: reset and require new submissions
+    return MISMATCH, {"player_a_reported_winner_id": None, "player_b_reported_winner_id": None}
+
+
+def report_result(
+    match_id: int,
+    user_id: int,
+    declared_winner_id: int,
+    *,
+    retries: Optional[int] = None,
+) -> ReportResult:
+    """Record ``user_id``'s declaration that ``declared_winner_id`` won.
+
+    Commits when the declaration was written (advancing the winner once
+    both players agree) and rolls back otherwise.
+    """
+    if retries is None:
+        retries = current_app.config.get("MATCH_REPORT_RETRIES", 5)
+    backoff = current_app.config.get("MATCH_REPORT_BACKOFF", 0.005)
+
+    attempts = 0
+    while True:
+        attempts += 1
+        row = _read(match_id)
+        if row is None:
+            db.session.rollback()
+            return ReportResult(NOT_FOUND, attempts=attempts)
+        result = ReportResult(RECORDED, row.tournament_id, attempts)
+        if row.winner_id is not None:
+            result.outcome = ALREADY_DECIDED
+        elif row.player_a_id is None or row.player_b_id is None:
+            result.outcome = INCOMPLETE
+        elif user_id not in (row.player_a_user_id, row.player_b_user_id):
+            result.outcome = NOT_PLAYER
+        elif declared_winner_id not in (row.player_a_id, row.player_b_id):
+            result.outcome = INVALID_WINNER
+        if result.outcome != RECORDED:
+            db.session.rollback()
+            return result
+
+        result.outcome, values = _decide(row, user_id, declared_winner_id)
+        swapped = db.session.execute(
+            update(Match)
+            .where(Match.id == match_id, Match.version == row.version)
+            .values(**values, version=Match.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if swapped == 1:
+            if result.outcome == CONFIRMED:
+                advance_winner(db.session.get(Match, match_id, populate_existing=True))
+            db.session.commit()
+            return result
+
+        # Someone else changed the match since the read: start over
+        db.session.rollback()
+        if attempts > retries:
+            result.outcome = BUSY
+            return result
+        time.sleep(random.uniform(0, backoff * 2 ** (attempts - 1)))
@@ -0,0 +1,198 @@
+"""Prometheus metrics at ``/metrics``.
+
+Exposed in the text exposition format (``prometheus_client``):
+
+* ``http_request_duration_seconds`` histogram per blueprint, endpoint,
+  method and status;
+* ``db_pool_*`` gauges (connections checked out, idle, overflow), the
+  ``db_pool_checkouts_total`` counter and the ``db_pool_connect_seconds``
+  histogram of how long opening a new database connection took;
+* ``db_row_lock_wait_seconds`` histogram of the ``SELECT ... FOR UPDATE``
+  in signups and bracket seeding, per site;
+* ``mail_queue_depth`` and ``password_hash_queue_depth`` gauges;
+* ``cache_requests_total`` counter per namespace and result (hit/miss),
+  from which the hit ratio follows.
+
+Under Gunicorn, set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory
+before the server starts: every worker then writes its samples there and
+a scrape of any worker aggregates all of them (``gunicorn.conf.py`` clears
+the directory on start and drops the files of exited workers). Without
+``prometheus_client`` installed, or with ``METRICS_ENABLED`` off (the
+default), the helpers below do nothing and there is no ``/metrics``; with
+``METRICS_TOKEN`` set, a scrape without that bearer token gets a 401.
+"""
+from __future__ import annotations
+
+import hmac
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from flask import Flask, Response, current_app, g, request, request_finished, request_started
+from sqlalchemy import event
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:  # pragma: no cover - optional dependency
+    prometheus_client = None
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "Time spent handling a request.",
+        ("blueprint", "endpoint", "method", "status"),
+        buckets=LATENCY_BUCKETS,
+    )
+    POOL_CHECKOUTS = Counter("db_pool_checkouts", "Connections handed out by the pool.")
+    POOL_CONNECT = Histogram(
+        "db_pool_connect_seconds",
+        "Time spent opening a new database connection for the pool.",
+        buckets=WAIT_BUCKETS,
+    )
+    POOL_CHECKED_OUT = Gauge(
+        "db_pool_checked_out", "Connections in use.", multiprocess_mode="livesum"
+    )
+    POOL_IDLE = Gauge(
+        "db_pool_idle", "Idle connections kept by the pool.", multiprocess_mode="livesum"
+    )
+    POOL_OVERFLOW = Gauge(
+        "db_pool_overflow", "Connections opened beyond the pool size.", multiprocess_mode="livesum"
+    )
+    ROW_LOCK_WAIT = Histogram(
+        "db_row_lock_wait_seconds",
+        "Time spent acquiring SELECT ... FOR UPDATE row locks.",
+        ("site",),
+        buckets=WAIT_BUCKETS,
+    )
+    MAIL_QUEUE_DEPTH = Gauge(
+        "mail_queue_depth", "Emails waiting in the in-process queue.", multiprocess_mode="livesum"
+    )
+    HASH_QUEUE_DEPTH = Gauge(
+        "password_hash_queue_depth",
+        "Password hashing jobs queued or running in the process pool.",
+        multiprocess_mode="livesum",
+    )
+    CACHE_REQUESTS = Counter(
+        "cache_requests", "Cache lookups.", ("namespace", "result")
+    )
+
+
+def _enabled() -> bool:
+    return prometheus_client is not None and "metrics" in current_app.extensions
+
+
+@contextmanager
+def row_lock_timer(site: str) -> Iterator[None]:
+    """Time the ``with_for_update()`` query run inside the block."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _enabled():
+            ROW_LOCK_WAIT.labels(site).observe(time.perf_counter() - started)
+
+
+def record_cache(namespace: str, hit: bool) -> None:
+    if _enabled():
+        CACHE_REQUESTS.labels(namespace, "hit" if hit else "miss").inc()
+
+
+def _connect_started(dialect, connection_record, cargs, cparams) -> None:
+    connection_record.info["metrics_connect_started"] = time.perf_counter()
+
+
+def _connected(dbapi_connection, connection_record) -> None:
+    started = connection_record.info.pop("metrics_connect_started", None)
+    if started is not None:
+        POOL_CONNECT.observe(time.perf_counter() - started)
+
+
+def _checked_out(dbapi_connection, connection_record, connection_proxy) -> None:
+    POOL_CHECKOUTS.inc()
+
+
+def _instrument_pool(engine) -> None:
+    # Listeners on the engine carry over to the pool engine.dispose() creates
+    if event.contains(engine, "checkout", _checked_out):
+        return
+    event.listen(engine, "do_connect", _connect_started)
+    event.listen(engine, "connect", _connected)
+    event.listen(engine, "checkout", _checked_out)
+
+
+def _update_gauges(app: Flask) -> None:
+    for engine in app.extensions["metrics"]["engines"]:
+        pool = engine.pool
+        for gauge, reading in (
+            (POOL_CHECKED_OUT, "checkedout"),
+            (POOL_IDLE, "checkedin"),
+            (POOL_OVERFLOW, "overflow"),
+        ):
+            # Not every pool class (e.g. StaticPool) keeps these numbers
+            if hasattr(pool, reading):
+                gauge.set(max(0, getattr(pool, reading)()))
+    mail_queue = app.extensions.get("mail_queue")
+    MAIL_QUEUE_DEPTH.set(getattr(mail_queue, "depth", 0))
+    hashing = app.extensions.get("hashing_executor")
+    HASH_QUEUE_DEPTH.set(getattr(hashing, "depth", 0))
+
+
+def _start_request(sender: Flask, **extra) -> None:
+    g.metrics_started = time.perf_counter()
+
+
+def _finish_request(sender: Flask, response, **extra) -> None:
+    started = g.pop("metrics_started", None)
+    if started is None:
+        return
+    REQUEST_LATENCY.labels(
+        request.blueprint or "",
+        request.endpoint or "<unmatched>",
+        request.method,
+        str(response.status_code),
+    ).observe(time.perf_counter() - started)
+    _update_gauges(sender)
+
+
+def _metrics_view():
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return Response("Unauthorized\n", 401, {"WWW-Authenticate": "Bearer"})
+    _update_gauges(current_app)
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import CollectorRegistry, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return Response(
+        prometheus_client.generate_latest(registry),
+        mimetype=prometheus_client.CONTENT_TYPE_LATEST,
+    )
+
+
+class Metrics:
+    """Flask extension registering the request hooks and ``/metrics``."""
+
+    def init_app(self, app: Flask, db) -> None:
+        if not app.config.get("METRICS_ENABLED", False):
+            return
+        if prometheus_client is None:
+            app.logger.warning("prometheus_client is not installed, /metrics is disabled.")
+            return
+        with app.app_context():
+            engines = list(db.engines.values())
+        for engine in engines:
+            _instrument_pool(engine)
+        app.extensions["metrics"] = {"engines": engines}
+        request_started.connect(_start_request, app)
+        request_finished.connect(_finish_request, app)
+        app.add_url_rule("/metrics", "metrics", _metrics_view)
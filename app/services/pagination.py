@@ -0,0 +1,120 @@
+"""Keyset (seek) pagination over ``(start_at, id)``.
+
+Instead of ``OFFSET`` + ``COUNT(*)``, each page starts right after (or, going
+back, right before) the key of the last row shown, so page 100 costs the same
+index range scan as page 1. The position travels in an opaque URL-safe
+cursor; the total is optional and cached for a short while.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional
+
+from flask import current_app
+from sqlalchemy import tuple_
+
+from ..models import Tournament
+
+NEXT = "n"
+PREV = "p"
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    page: int
+    next_cursor: Optional[str]
+    prev_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def encode_cursor(item: Tournament, direction: str, page: int) -> str:
+    payload = {"k": [item.start_at.isoformat(), item.id], "d": direction, "p": page}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[tuple[datetime, int, str, int]]:
+    """Return ``(start_at, id, direction, page)``, or None for a missing/invalid cursor."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        start_at, item_id = payload["k"]
+        direction = payload["d"] if payload["d"] in (NEXT, PREV) else NEXT
+        return datetime.fromisoformat(start_at), int(item_id), direction, max(int(payload["p"]), 1)
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def keyset_paginate(query, cursor: Optional[str], per_page: int) -> KeysetPage:
+    """Return one page of ``query`` (filtered, not yet ordered) by ``(start_at, id)``."""
+    key = (Tournament.start_at, Tournament.id)
+    position = decode_cursor(cursor)
+
+    if position is None:
+        direction, page = NEXT, 1
+        rows = query.order_by(*(c.asc() for c in key)).limit(per_page + 1).all()
+    else:
+        start_at, item_id, direction, page = position
+        if direction == NEXT:
+            rows = (
+                query.filter(tuple_(*key) > tuple_(start_at, item_id))
+                .order_by(*(c.asc() for c in key))
+                .limit(per_page + 1)
+                .all()
+            )
+        else:
+            rows = (
+                query.filter(tuple_(*key) < tuple_(start_at, item_id))
+                .order_by(*(c.desc() for c in key))
+                .limit(per_page + 1)
+                .all()
+            )
+
+    has_more = len(rows) > per_page
+    items = rows[:per_page]
+    if direction == PREV:
+        items.reverse()
+
+    if direction == NEXT:
+        has_next, has_prev = has_more, position is not None
+    else:
+        has_next, has_prev = True, has_more and page > 1
+
+    return KeysetPage(
+        items=items,
+        page=page,
+        next_cursor=encode_cursor(items[-1], NEXT, page + 1) if items and has_next else None,
+        prev_cursor=encode_cursor(items[0], PREV, page - 1) if items and has_prev else None,
+    )
+
+
+def cached_total(name: str, count: Callable[[], int], ttl: Optional[float]) -> Optional[int]:
+    """Return ``count()``, recomputed at most once every ``ttl`` seconds per ``name``.
+
+    Good enough for an approximate "N tournaments" label without a
+    ``COUNT(*)`` on every page view. A ``ttl`` of None disables the total.
+    """
+    if ttl is None:
+        return None
+    totals = current_app.extensions.setdefault("pagination_totals", {})
+    now = time.monotonic()
+    cached = totals.get(name)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[1]
+    value = count()
+    totals[name] = (now, value)
+    return value
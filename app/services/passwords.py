@@ -0,0 +1,229 @@
+"""Password hashing with configurable cost.
+
+``PASSWORD_HASHER`` picks the scheme new hashes are made with:
+
+``argon2`` (default)
+    Argon2id with ``ARGON2_TIME_COST``, ``ARGON2_MEMORY_COST`` (KiB) and
+    ``ARGON2_PARALLELISM``. ``flask tune-password-hashing`` measures which
+    costs hit a target verification time on the current machine.
+``pbkdf2``
+    Werkzeug's ``pbkdf2:sha256``, the original scheme, with
+    ``PBKDF2_ITERATIONS`` (0 keeps Werkzeug's default).
+
+Stored hashes of any known scheme keep verifying. A hash made with another
+scheme or other costs than the configured ones is reported as needing a
+rehash, and ``User.verify_password`` replaces it on the next login.
+
+The hashing itself runs on the app's hashing executor (inline unless
+``PASSWORD_HASH_WORKERS`` is set, see ``services.hashing_pool``).
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from argon2 import PasswordHasher as _Argon2
+from argon2 import Type
+from argon2.exceptions import InvalidHashError, VerificationError
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from ..extensions import hashing_executor
+
+
+class Hasher:
+    key: str = ""
+
+    def hash(self, raw_password: str) -> str:
+        raise NotImplementedError
+
+    def identify(self, stored: str) -> bool:
+        """Whether ``stored`` was made with this scheme."""
+        raise NotImplementedError
+
+    def verify(self, stored: str, raw_password: str) -> bool:
+        raise NotImplementedError
+
+    def needs_rehash(self, stored: str) -> bool:
+        """Whether ``stored`` (of this scheme) differs from the configured costs."""
+        return False
+
+
+@dataclass(frozen=True)
+class Argon2Hasher(Hasher):
+    time_cost: int = 3
+    memory_cost: int = 65536
+    parallelism: int = 4
+
+    key = "argon2"
+
+    @property
+    def _argon2(self) -> _Argon2:
+        return _Argon2(
+            time_cost=self.time_cost,
+            memory_cost=self.memory_cost,
+            parallelism=self.parallelism,
+            type=Type.ID,
+        )
+
+    def hash(self, raw_password: str) -> str:
+        return self._argon2.hash(raw_password)
+
+    def identify(self, stored: str) -> bool:
+        return stored.startswith("$argon2")
+
+    def verify(self, stored: str, raw_password: str) -> bool:
+        try:
+            return self._argon2.verify(stored, raw_password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, stored: str) -> bool:
+        try:
+            return self._argon2.check_needs_rehash(stored)
+        except InvalidHashError:
+            return True
+
+
+@dataclass(frozen=True)
+class Pbkdf2Hasher(Hasher):
+    iterations: int = 0
+
+    key = "pbkdf2"
+
+    @property
+    def method(self) -> str:
+        return f"pbkdf2:sha256:{self.iterations}" if self.iterations else "pbkdf2:sha256"
+
+    def hash(self, raw_password: str) -> str:
+        return generate_password_hash(raw_password, method=self.method)
+
+    def identify(self, stored: str) -> bool:
+        return stored.startswith("pbkdf2:")
+
+    def verify(self, stored: str, raw_password: str) -> bool:
+        return check_password_hash(stored, raw_password)
+
+    def needs_rehash(self, stored: str) -> bool:
+        if not self.iterations:
+            return False
+        return stored.split("$", 1)[0] != self.method
+
+
+HASHERS: dict[str, type[Hasher]] = {
+    Argon2Hasher.key: Argon2Hasher,
+    Pbkdf2Hasher.key: Pbkdf2Hasher,
+}
+DEFAULT_HASHER = Argon2Hasher.key
+
+
+def hasher_from_config(config) -> Hasher:
+    key = config.get("PASSWORD_HASHER") or DEFAULT_HASHER
+    if key == Pbkdf2Hasher.key:
+        return Pbkdf2Hasher(iterations=config.get("PBKDF2_ITERATIONS", 0))
+    return Argon2Hasher(
+        time_cost=config.get("ARGON2_TIME_COST", 3),
+        memory_cost=config.get("ARGON2_MEMORY_COST", 65536),
+        parallelism=config.get("ARGON2_PARALLELISM", 4),
+    )
+
+
+def get_hasher() -> Hasher:
+    """The hasher configured for the current app."""
+    return hasher_from_config(current_app.config)
+
+
+def _scheme_of(stored: str, configured: Hasher) -> Optional[Hasher]:
+    if configured.identify(stored):
+        return configured
+    for hasher_cls in HASHERS.values():
+        hasher = hasher_cls()
+        if hasher.identify(stored):
+            return hasher
+    return None
+
+
+# Module-level so the process pool can pickle them
+def _hash(hasher: Hasher, raw_password: str) -> str:
+    return hasher.hash(raw_password)
+
+
+def _verify(hasher: Hasher, stored: str, raw_password: str) -> bool:
+    return hasher.verify(stored, raw_password)
+
+
+def _run(fn, *args):
+    if has_app_context():
+        return hashing_executor.run(fn, *args)
+    return fn(*args)
+
+
+def hash_password(raw_password: str, hasher: Optional[Hasher] = None) -> str:
+    return _run(_hash, hasher or get_hasher(), raw_password)
+
+
+def hash_passwords(raw_passwords: list[str], hasher: Optional[Hasher] = None) -> list[str]:
+    """Hash a batch at once, spread over the pool workers when there are any."""
+    hasher = hasher or get_hasher()
+    return hashing_executor.map(_hash, [hasher] * len(raw_passwords), raw_passwords)
+
+
+def check_password(
+    stored: str, raw_password: str, hasher: Optional[Hasher] = None
+) -> tuple[bool, bool]:
+    """Verify ``raw_password``; returns ``(valid, needs_rehash)``."""
+    hasher = hasher or get_hasher()
+    scheme = _scheme_of(stored or "", hasher)
+    if scheme is None or not _run(_verify, scheme, stored, raw_password):
+        return False, False
+    return True, scheme is not hasher or hasher.needs_rehash(stored)
+
+
+@dataclass
+class Calibration:
+    time_cost: int
+    memory_cost: int
+    parallelism: int
+    seconds: float
+
+    def config_lines(self) -> list[str]:
+        return [
+            f"ARGON2_TIME_COST={self.time_cost}",
+            f"ARGON2_MEMORY_COST={self.memory_cost}",
+            f"ARGON2_PARALLELISM={self.parallelism}",
+        ]
+
+
+def time_verification(hasher: Hasher, rounds: int = 3) -> float:
+    """Median seconds one successful verification takes with ``hasher``."""
+    stored = hasher.hash("calibration-password")
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.verify(stored, "calibration-password")
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate_argon2(
+    target_seconds: float,
+    *,
+    memory_cost: int = 65536,
+    parallelism: int = 4,
+    max_time_cost: int = 50,
+    rounds: int = 3,
+) -> Calibration:
+    """Smallest time cost whose verification takes at least ``target_seconds``.
+
+    Memory is fixed first (it is what makes Argon2 expensive to attack on
+    GPUs); passes are then added until the target is reached. If even one
+    pass is slower than the target, that single pass is returned.
+    """
+    result = None
+    for time_cost in range(1, max_time_cost + 1):
+        hasher = Argon2Hasher(time_cost, memory_cost, parallelism)
+        result = Calibration(time_cost, memory_cost, parallelism, time_verification(hasher, rounds))
+        if result.seconds >= target_seconds:
+            break
+    return result
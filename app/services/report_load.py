@@ -0,0 +1,247 @@
+"""Concurrent result-report load test (``flask report-load-test``).
+
+Creates a throwaway tournament of ``matches`` first-round matches and has
+both players of every match report the same winner at the same instant,
+from a pool of threads, through ``services.match_reports``. Afterwards
+every match must be confirmed with its winner advanced: a match left
+with a single declaration, or none, is a lost update. Reports throughput,
+latency percentiles and how many compare-and-swap retries it took.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import delete, func, insert, select
+
+from ..extensions import cache, db
+from ..models import Match, PendingMatch, Tournament, TournamentParticipant, User
+from .cache import LISTINGS
+from .match_reports import report_result
+from .search import unindex_tournaments
+from .seeding import seed_tournament
+
+
+@dataclass
+class ReportLoadReport:
+    matches: int
+    threads: int
+    elapsed: float
+    latencies: list[float] = field(repr=False)
+    outcomes: dict[str, int]
+    retries: int = 0
+    errors: int = 0
+    # Checked once the run is over
+    confirmed: int = 0
+    advanced: int = 0
+
+    @property
+    def reports(self) -> int:
+        return len(self.latencies)
+
+    @property
+    def lost_updates(self) -> int:
+        return (self.matches - self.confirmed) + (self.matches - self.advanced)
+
+    @property
+    def per_second(self) -> float:
+        return self.reports / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> str:
+        return (
+            f"{self.reports} reports {self.per_second:8.1f} reports/s  "
+            f"p50 {self.percentile(0.50) * 1000:7.1f} ms  "
+            f"p99 {self.percentile(0.99) * 1000:7.1f} ms  "
+            f"retries={self.retries}  "
+            + "  ".join(f"{k}={v}" for k, v in sorted(self.outcomes.items()))
+            + (f"  errors={self.errors}" if self.errors else "")
+            + (f"  LOST={self.lost_updates}" if self.lost_updates else "")
+        )
+
+
+def _prepare(matches: int) -> tuple[int, list[int], list[tuple[int, int, int, int]]]:
+    """Insert and seed the tournament; returns its id, the user ids and the reports.
+
+    Every report is ``(match_id, user_id, declared_winner_id, pair)``; both
+    players of a match declare its player A the winner.
+    """
+    now = datetime.utcnow()
+    tag = uuid.uuid4().hex[:12]
+    players = matches * 2
+    user_ids = (
+        db.session.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {
+                    "first_name": "Load",
+                    "last_name": str(index),
+                    "email": f"report-{tag}-{index}@example.invalid",
+                    "password_hash": "!",
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(players + 1)
+            ],
+        )
+        .scalars()
+        .all()
+    )
+    tournament = Tournament(
+        organizer_id=user_ids[0],
+        name=f"Report load test {tag}",
+        discipline="load-test",
+        start_at=now + timedelta(days=2),
+        signup_deadline=now + timedelta(days=1),
+        max_participants=players,
+    )
+    db.session.add(tournament)
+    db.session.flush()
+    db.session.execute(
+        insert(TournamentParticipant),
+        [
+            {
+                "tournament_id": tournament.id,
+                "user_id": user_id,
+                "license_number": f"LOAD-{user_id}",
+                "ranking": ranking,
+                "status": TournamentParticipant.STATUS_PENDING,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for ranking, user_id in enumerate(user_ids[1:], 1)
+        ],
+    )
+    tournament.participant_count = players
+    db.session.commit()
+    seed_tournament(tournament.id, ignore_deadline=True)
+
+    participants = dict(
+        db.session.query(TournamentParticipant.id, TournamentParticipant.user_id).filter(
+            TournamentParticipant.tournament_id == tournament.id
+        )
+    )
+    reports = []
+    for pair, (match_id, player_a_id, player_b_id) in enumerate(
+        db.session.query(Match.id, Match.player_a_id, Match.player_b_id)
+        .filter(Match.tournament_id == tournament.id, Match.round_number == 1)
+        .order_by(Match.bracket_position)
+    ):
+        for player_id in (player_a_id, player_b_id):
+            reports.append((match_id, participants[player_id], player_a_id, pair))
+    return tournament.id, user_ids, reports
+
+
+def _cleanup(tournament_id: int, user_ids: list[int]) -> None:
+    db.session.execute(delete(PendingMatch).where(PendingMatch.tournament_id == tournament_id))
+    db.session.execute(delete(Match).where(Match.tournament_id == tournament_id))
+    db.session.execute(
+        delete(TournamentParticipant).where(TournamentParticipant.tournament_id == tournament_id)
+    )
+    db.session.execute(delete(Tournament).where(Tournament.id == tournament_id))
+    db.session.execute(delete(User).where(User.id.in_(user_ids)))
+    db.session.commit()
+    # Core deletes skip the mapper events that keep these two up to date
+    cache.invalidate(LISTINGS)
+    unindex_tournaments([tournament_id])
+
+
+def run_report_load(
+    app: Flask,
+    *,
+    matches: int = 64,
+    threads: int = 16,
+    keep: bool = False,
+) -> ReportLoadReport:
+    """Have both players of ``matches`` matches report simultaneously."""
+    if threads < 2 or threads % 2:
+        raise ValueError("threads must be an even number, one per player of a match")
+    if matches < 2 or matches & (matches - 1):
+        # Any other field size has byes, i.e. matches with a single player
+        raise ValueError("matches must be a power of two")
+    with app.app_context():
+        tournament_id, user_ids, reports = _prepare(matches)
+
+    latencies: list[float] = []
+    outcomes: dict[str, int] = {}
+    retries = 0
+    errors = 0
+    lock = threading.Lock()
+    # The two players of a match wait for each other before every report
+    pair_gates = [threading.Barrier(2) for _ in range(threads // 2)]
+    start_gate = threading.Barrier(threads)
+
+    def apply(lane: int) -> None:
+        nonlocal retries, errors
+        gate = pair_gates[lane // 2]
+        with app.app_context():
+            start_gate.wait()
+            # Lanes 2k and 2k + 1 play the two sides of the same matches
+            for match_id, user_id, winner_id, pair in reports[lane % 2 :: 2]:
+                if pair % (threads // 2) != lane // 2:
+                    continue
+                gate.wait()
+                started = time.perf_counter()
+                try:
+                    result = report_result(match_id, user_id, winner_id)
+                except Exception:  # lock timeouts, serialisation failures
+                    db.session.rollback()
+                    result = None
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    if result is None:
+                        errors += 1
+                    else:
+                        outcomes[result.outcome] = outcomes.get(result.outcome, 0) + 1
+                        retries += result.attempts - 1
+            db.session.remove()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(apply, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        confirmed = db.session.scalar(
+            select(func.count())
+            .select_from(Match)
+            .where(
+                Match.tournament_id == tournament_id,
+                Match.round_number == 1,
+                Match.winner_id.is_not(None),
+                Match.winner_id == Match.player_a_reported_winner_id,
+                Match.winner_id == Match.player_b_reported_winner_id,
+            )
+        )
+        # Winners that reached their next match: one filled slot each
+        advanced = db.session.scalar(
+            select(func.count(Match.player_a_id) + func.count(Match.player_b_id)).where(
+                Match.tournament_id == tournament_id, Match.round_number == 2
+            )
+        )
+        if not keep:
+            _cleanup(tournament_id, user_ids)
+
+    return ReportLoadReport(
+        matches=matches,
+        threads=threads,
+        elapsed=elapsed,
+        latencies=latencies,
+        outcomes=outcomes,
+        retries=retries,
+        errors=errors,
+        confirmed=confirmed,
+        advanced=advanced,
+    )
@@ -0,0 +1,163 @@
+"""Tournament search ranked by relevance.
+
+On PostgreSQL the ``tournaments.search_vector`` generated column (name
+weighted above discipline, above description) is matched with a prefix
+``tsquery`` through its GIN index and ranked with ``ts_rank``. Other
+databases, i.e. SQLite test runs, use an in-process inverted index with the
+same weights, built on first use and kept up to date by mapper events.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from typing import Iterable, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import case, event, func, literal_column
+
+from ..extensions import db
+from ..models import Tournament
+
+SEARCH_FIELDS = {"name": 3, "discipline": 2, "description": 1}
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+class InvertedIndex:
+    """Token -> {tournament id: weight} postings with prefix lookups."""
+
+    def __init__(self) -> None:
+        self._postings: dict[str, dict[int, int]] = {}
+        self._terms: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    def load(self, rows) -> None:
+        with self._lock:
+            self._postings.clear()
+            self._terms.clear()
+            for tournament_id, *values in rows:
+                self._add(tournament_id, dict(zip(SEARCH_FIELDS, values)))
+            self.loaded = True
+
+    def add(self, tournament_id: int, fields: dict[str, Optional[str]]) -> None:
+        with self._lock:
+            self._remove(tournament_id)
+            self._add(tournament_id, fields)
+
+    def remove(self, tournament_id: int) -> None:
+        with self._lock:
+            self._remove(tournament_id)
+
+    def search(self, text: str) -> list[tuple[int, int]]:
+        """Return ``(tournament_id, score)`` for documents matching every token.
+
+        Each token also matches the indexed terms it is a prefix of; results
+        are ordered by descending score.
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        with self._lock:
+            scores: Optional[dict[int, int]] = None
+            for token in tokens:
+                matched: dict[int, int] = {}
+                for term, postings in self._postings.items():
+                    if term.startswith(token):
+                        for tournament_id, weight in postings.items():
+                            matched[tournament_id] = max(matched.get(tournament_id, 0), weight)
+                if scores is None:
+                    scores = matched
+                else:
+                    scores = {
+                        tournament_id: score + matched[tournament_id]
+                        for tournament_id, score in scores.items()
+                        if tournament_id in matched
+                    }
+                if not scores:
+                    return []
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+    def _add(self, tournament_id: int, fields: dict[str, Optional[str]]) -> None:
+        terms = self._terms.setdefault(tournament_id, set())
+        for field, weight in SEARCH_FIELDS.items():
+            for term in tokenize(fields.get(field)):
+                postings = self._postings.setdefault(term, {})
+                postings[tournament_id] = max(postings.get(tournament_id, 0), weight)
+                terms.add(term)
+
+    def _remove(self, tournament_id: int) -> None:
+        for term in self._terms.pop(tournament_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(tournament_id, None)
+                if not postings:
+                    del self._postings[term]
+
+
+def _local_index() -> InvertedIndex:
+    index = current_app.extensions.setdefault("tournament_search", InvertedIndex())
+    if not index.loaded:
+        index.load(
+            db.session.query(
+                Tournament.id, Tournament.name, Tournament.discipline, Tournament.description
+            ).all()
+        )
+    return index
+
+
+def search_tournaments(query, text: str):
+    """Restrict ``query`` to tournaments matching ``text``, best match first."""
+    tokens = tokenize(text)
+    if not tokens:
+        return query.order_by(Tournament.start_at.asc(), Tournament.id.asc())
+
+    if db.engine.dialect.name == "postgresql":
+        ts_query = func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+        vector = literal_column("tournaments.search_vector")
+        return query.filter(vector.op("@@")(ts_query)).order_by(
+            func.ts_rank(vector, ts_query).desc(),
+            Tournament.start_at.asc(),
+            Tournament.id.asc(),
+        )
+
+    ranked = _local_index().search(text)
+    if not ranked:
+        return query.filter(db.false())
+    rank = {tournament_id: position for position, (tournament_id, _) in enumerate(ranked)}
+    return query.filter(Tournament.id.in_(rank)).order_by(
+        case(rank, value=Tournament.id),
+        Tournament.start_at.asc(),
+    )
+
+
+def _index_if_loaded() -> Optional[InvertedIndex]:
+    if not has_app_context():
+        return None
+    index = current_app.extensions.get("tournament_search")
+    return index if index is not None and index.loaded else None
+
+
+@event.listens_for(Tournament, "after_insert")
+@event.listens_for(Tournament, "after_update")
+def _reindex_tournament(mapper, connection, target: Tournament) -> None:
+    index = _index_if_loaded()
+    if index is not None:
+        index.add(target.id, {field: getattr(target, field) for field in SEARCH_FIELDS})
+
+
+def unindex_tournaments(tournament_ids: Iterable[int]) -> None:
+    """Drop tournaments deleted with Core statements from the local index."""
+    index = _index_if_loaded()
+    if index is not None:
+        for tournament_id in tournament_ids:
+            index.remove(tournament_id)
+
+
+@event.listens_for(Tournament, "after_delete")
+def _unindex_tournament(mapper, connection, target: Tournament) -> None:
+    unindex_tournaments([target.id])
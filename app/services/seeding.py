@@ -0,0 +1,119 @@
+"""Bracket seeding once the signup deadline has passed.
+
+Seeding is a write-side job: it runs from the ``seed-due-brackets`` CLI
+command (or the organizer's "Generate bracket now" button), never from a
+read request. It moves a tournament from ``draft`` to ``seeded`` exactly
+once; readers only look at ``Tournament.status`` and never lock the row.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from ..extensions import db
+from ..models import Match, Tournament, TournamentParticipant
+from .bracket_builder import insert_bracket
+from .bracket_engine import get_format
+from .bracket_events import publish_after_commit
+from .dashboard import refresh_pending_matches
+from .metrics import row_lock_timer
+
+
+def seed_ids(tournament_id: int) -> list[int]:
+    """Participant ids of the bracket, best ranking first (waitlist excluded)."""
+    return [
+        participant_id
+        for (participant_id,) in db.session.query(TournamentParticipant.id)
+        .filter(
+            TournamentParticipant.tournament_id == tournament_id,
+            TournamentParticipant.status != TournamentParticipant.STATUS_WAITLISTED,
+        )
+        .order_by(TournamentParticipant.ranking.asc())
+        .all()
+    ]
+
+
+def seed_tournament(
+    tournament_id: int,
+    *,
+    ignore_deadline: bool = False,
+    now: Optional[datetime] = None,
+) -> bool:
+    """Generate the bracket and mark the tournament as seeded.
+
+    By default it only runs after the signup deadline; when
+    ``ignore_deadline`` is True, it generates immediately (used by
+    the organizer's "Generate bracket now" button).
+    Returns True if matches were created, False otherwise.
+    """
+    now = now or datetime.utcnow()
+    with row_lock_timer("seeding"):
+        locked_tournament = (
+            Tournament.query.with_for_update().filter_by(id=tournament_id).first()
+        )
+    if not locked_tournament or locked_tournament.status != Tournament.STATUS_DRAFT:
+        db.session.rollback()
+        return False
+
+    # Solo dopo la deadline iscrizioni, a meno che non sia una forzatura
+    if not ignore_deadline and locked_tournament.signup_deadline > now:
+        db.session.rollback()
+        return False
+
+    # Brackets generated before the status lifecycle existed: just record it
+    existing = Match.query.filter_by(
+        tournament_id=locked_tournament.id, round_number=1
+    ).count()
+    if existing > 0:
+        _store_bracket_shape(locked_tournament, len(seed_ids(locked_tournament.id)))
+        locked_tournament.status = Tournament.STATUS_SEEDED
+        locked_tournament.bracket_version = Tournament.bracket_version + 1
+        refresh_pending_matches(tournament_id=locked_tournament.id)
+        db.session.commit()
+        return False
+
+    participant_ids = seed_ids(locked_tournament.id)
+
+    if len(participant_ids) < 2:
+        db.session.rollback()
+        return False
+
+    # Pairings come from the tournament's bracket format (single elimination
+    # by default: 1 vs ultimo, 2 vs penultimo, ... with byes resolved up front).
+    insert_bracket(locked_tournament.id, participant_ids, locked_tournament.bracket_format)
+    refresh_pending_matches(tournament_id=locked_tournament.id)
+
+    _store_bracket_shape(locked_tournament, len(participant_ids))
+    locked_tournament.status = Tournament.STATUS_SEEDED
+    locked_tournament.bracket_version = Tournament.bracket_version + 1
+    publish_after_commit(db.session, locked_tournament.id, {"type": "seeded", "reload": True})
+    db.session.commit()
+    return True
+
+
+def seed_due_tournaments(now: Optional[datetime] = None) -> list[int]:
+    """Seed every draft tournament whose signup deadline has passed.
+
+    Returns the ids of the tournaments whose bracket was created. Each
+    tournament is seeded in its own transaction, so a failure on one of
+    them does not roll back the others.
+    """
+    now = now or datetime.utcnow()
+    due_ids = [
+        tournament_id
+        for (tournament_id,) in db.session.query(Tournament.id)
+        .filter(
+            Tournament.status == Tournament.STATUS_DRAFT,
+            Tournament.signup_deadline <= now,
+        )
+        .order_by(Tournament.signup_deadline.asc())
+        .all()
+    ]
+    return [tid for tid in due_ids if seed_tournament(tid, now=now)]
+
+
+def _store_bracket_shape(tournament: Tournament, count: int) -> None:
+    """Record the size and round count of the main stage for ``count`` seeds."""
+    fmt = get_format(tournament.bracket_format)
+    tournament.bracket_size = fmt.bracket_size(count)
+    tournament.total_rounds = fmt.total_rounds(count)
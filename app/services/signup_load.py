@@ -0,0 +1,187 @@
+"""Threaded signup load test (``flask signup-load-test``).
+
+Creates a throwaway tournament and a batch of applicants, lets them all
+sign up at once from a pool of threads through one signup engine, and
+reports throughput and latency percentiles. Run it against PostgreSQL to
+compare the engines: SQLite has no row locks, so the ``locking`` engine
+cannot be measured (or kept correct) there.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from flask import Flask
+from sqlalchemy import delete, insert
+
+from ..extensions import cache, db
+from ..models import Tournament, TournamentParticipant, User
+from .cache import LISTINGS
+from .search import unindex_tournaments
+from .signups import get_engine
+
+
+@dataclass
+class LoadReport:
+    engine: str
+    applicants: int
+    seats: int
+    threads: int
+    elapsed: float
+    latencies: list[float] = field(repr=False)
+    outcomes: dict[str, int]
+    errors: int = 0
+    # Seats actually taken and the counter, checked once the run is over
+    seated: int = 0
+    counter: int = 0
+
+    @property
+    def overbooked(self) -> bool:
+        return self.seated > self.seats or self.counter != self.seated
+
+    @property
+    def per_second(self) -> float:
+        return self.applicants / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def summary(self) -> str:
+        return (
+            f"{self.engine:<12} {self.per_second:8.1f} signups/s  "
+            f"p50 {self.percentile(0.50) * 1000:7.1f} ms  "
+            f"p99 {self.percentile(0.99) * 1000:7.1f} ms  "
+            + "  ".join(f"{k}={v}" for k, v in sorted(self.outcomes.items()))
+            + (f"  errors={self.errors}" if self.errors else "")
+            + ("  OVERBOOKED" if self.overbooked else "")
+        )
+
+
+def _prepare(applicants: int, seats: int) -> tuple[int, list[int], list[int]]:
+    """Insert the applicants and the tournament; returns their ids."""
+    now = datetime.utcnow()
+    tag = uuid.uuid4().hex[:12]
+    user_ids = (
+        db.session.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [
+                {
+                    "first_name": "Load",
+                    "last_name": str(index),
+                    "email": f"load-{tag}-{index}@example.invalid",
+                    "password_hash": "!",
+                    "is_active": True,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for index in range(applicants + 1)
+            ],
+        )
+        .scalars()
+        .all()
+    )
+    tournament = Tournament(
+        organizer_id=user_ids[0],
+        name=f"Signup load test {tag}",
+        discipline="load-test",
+        start_at=now + timedelta(days=2),
+        signup_deadline=now + timedelta(days=1),
+        max_participants=seats,
+    )
+    db.session.add(tournament)
+    db.session.commit()
+    return tournament.id, user_ids[1:], user_ids
+
+
+def _cleanup(tournament_id: int, user_ids: list[int]) -> None:
+    db.session.execute(
+        delete(TournamentParticipant).where(TournamentParticipant.tournament_id == tournament_id)
+    )
+    db.session.execute(delete(Tournament).where(Tournament.id == tournament_id))
+    db.session.execute(delete(User).where(User.id.in_(user_ids)))
+    db.session.commit()
+    # Core deletes skip the mapper events that keep these two up to date
+    cache.invalidate(LISTINGS)
+    unindex_tournaments([tournament_id])
+
+
+def run_signup_load(
+    app: Flask,
+    engine: str,
+    *,
+    applicants: int = 200,
+    seats: int = 64,
+    threads: int = 16,
+    keep: bool = False,
+) -> LoadReport:
+    """Sign ``applicants`` up concurrently for ``seats`` seats with ``engine``."""
+    signup = get_engine(engine)
+    with app.app_context():
+        tournament_id, applicant_ids, all_user_ids = _prepare(applicants, seats)
+
+    latencies: list[float] = []
+    outcomes: dict[str, int] = {}
+    errors = 0
+    lock = threading.Lock()
+    start_gate = threading.Barrier(threads)
+
+    def apply(batch: list[int]) -> None:
+        nonlocal errors
+        with app.app_context():
+            start_gate.wait()
+            for user_id in batch:
+                started = time.perf_counter()
+                try:
+                    outcome = signup.register(
+                        tournament_id,
+                        user_id,
+                        f"LOAD-{user_id}",
+                        user_id,
+                        now=datetime.utcnow(),
+                    )
+                except Exception:  # lock timeouts, serialisation failures
+                    db.session.rollback()
+                    outcome = None
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    if outcome is None:
+                        errors += 1
+                    else:
+                        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            db.session.remove()
+
+    batches = [applicant_ids[index::threads] for index in range(threads)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(apply, batches))
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        seated = TournamentParticipant.query.filter(
+            TournamentParticipant.tournament_id == tournament_id,
+            TournamentParticipant.status != TournamentParticipant.STATUS_WAITLISTED,
+        ).count()
+        counter = db.session.get(Tournament, tournament_id).participant_count
+        if not keep:
+            _cleanup(tournament_id, all_user_ids)
+
+    return LoadReport(
+        engine=signup.key,
+        applicants=applicants,
+        seats=seats,
+        threads=threads,
+        elapsed=elapsed,
+        latencies=latencies,
+        outcomes=outcomes,
+        errors=errors,
+        seated=seated,
+        counter=counter,
+    )
@@ -0,0 +1,244 @@
+"""Tournament signups without holding the tournament row lock.
+
+Two interchangeable engines register applicants:
+
+``seat_claim`` (default)
+    Claims a seat with one conditional ``UPDATE`` on
+    ``Tournament.participant_count`` that only matches while the tournament
+    is open and not full, then inserts the participant in the same
+    transaction. Concurrent applicants only contend for the instant of that
+    update.
+``locking``
+    The original approach: ``SELECT ... FOR UPDATE`` on the tournament, a
+    ``COUNT(*)`` of its participants and the insert, all under the row lock.
+    Kept as a baseline for ``flask signup-load-test``.
+
+When the tournament is full, both engines put the applicant on the
+waitlist (``status="waitlisted"``, no seat taken) unless
+``SIGNUP_WAITLIST`` is disabled. ``promote_waitlisted`` moves an applicant
+off the waitlist through the same seat claim.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy import func, insert, update
+from sqlalchemy.exc import IntegrityError
+
+from ..extensions import db
+from ..models import Tournament, TournamentParticipant
+from .metrics import row_lock_timer
+
+REGISTERED = "registered"
+WAITLISTED = "waitlisted"
+FULL = "full"
+CLOSED = "closed"
+DUPLICATE = "duplicate"
+NOT_FOUND = "not_found"
+
+
+class SignupEngine:
+    """Registers one applicant and returns one of the outcomes above.
+
+    Engines commit on success and roll back otherwise, so a duplicate
+    license number or ranking also gives the seat back.
+    """
+
+    key: str = ""
+    label: str = ""
+
+    def register(
+        self,
+        tournament_id: int,
+        user_id: int,
+        license_number: str,
+        ranking: int,
+        *,
+        now: datetime,
+        waitlist: bool = True,
+    ) -> str:
+        raise NotImplementedError
+
+    @staticmethod
+    def _insert(
+        tournament_id: int, user_id: int, license_number: str, ranking: int, status: str
+    ) -> None:
+        # Core insert: the ORM ``after_insert`` counter event does not fire,
+        # the engine accounts for the seat itself
+        db.session.execute(
+            insert(TournamentParticipant).values(
+                tournament_id=tournament_id,
+                user_id=user_id,
+                license_number=license_number,
+                ranking=ranking,
+                status=status,
+            )
+        )
+
+    def _commit_insert(self, *args, outcome: str) -> str:
+        try:
+            self._insert(*args)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return DUPLICATE
+        return outcome
+
+
+class SeatClaimSignup(SignupEngine):
+    key = "seat_claim"
+    label = "Conditional seat claim"
+
+    @staticmethod
+    def _claim_seat(tournament_id: int, now: datetime) -> bool:
+        result = db.session.execute(
+            update(Tournament)
+            .where(
+                Tournament.id == tournament_id,
+                Tournament.status == Tournament.STATUS_DRAFT,
+                Tournament.signup_deadline > now,
+                Tournament.participant_count < Tournament.max_participants,
+            )
+            .values(participant_count=Tournament.participant_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    def _refusal(tournament_id: int, now: datetime) -> str:
+        # Only reached when the claim failed: tell the applicant why
+        row = (
+            db.session.query(
+                Tournament.status,
+                Tournament.signup_deadline,
+                Tournament.participant_count,
+                Tournament.max_participants,
+            )
+            .filter(Tournament.id == tournament_id)
+            .first()
+        )
+        if row is None:
+            return NOT_FOUND
+        status, signup_deadline, participant_count, max_participants = row
+        if status != Tournament.STATUS_DRAFT or signup_deadline <= now:
+            return CLOSED
+        return FULL if participant_count >= max_participants else CLOSED
+
+    def register(self, tournament_id, user_id, license_number, ranking, *, now, waitlist=True):
+        args = (tournament_id, user_id, license_number, ranking)
+        if self._claim_seat(tournament_id, now):
+            return self._commit_insert(
+                *args, TournamentParticipant.STATUS_PENDING, outcome=REGISTERED
+            )
+
+        outcome = self._refusal(tournament_id, now)
+        if outcome == FULL and waitlist:
+            return self._commit_insert(
+                *args, TournamentParticipant.STATUS_WAITLISTED, outcome=WAITLISTED
+            )
+        db.session.rollback()
+        return outcome
+
+
+class LockingSignup(SignupEngine):
+    key = "locking"
+    label = "Row lock + COUNT"
+
+    def register(self, tournament_id, user_id, license_number, ranking, *, now, waitlist=True):
+        with row_lock_timer("signup"):
+            tournament = Tournament.query.with_for_update().filter_by(id=tournament_id).first()
+        if tournament is None:
+            db.session.rollback()
+            return NOT_FOUND
+        if tournament.status != Tournament.STATUS_DRAFT or tournament.signup_deadline <= now:
+            db.session.rollback()
+            return CLOSED
+
+        seated = (
+            db.session.query(func.count(TournamentParticipant.id))
+            .filter(
+                TournamentParticipant.tournament_id == tournament_id,
+                TournamentParticipant.status != TournamentParticipant.STATUS_WAITLISTED,
+            )
+            .scalar()
+        )
+        args = (tournament_id, user_id, license_number, ranking)
+        if seated < tournament.max_participants:
+            tournament.participant_count = seated + 1
+            return self._commit_insert(
+                *args, TournamentParticipant.STATUS_PENDING, outcome=REGISTERED
+            )
+        if waitlist:
+            return self._commit_insert(
+                *args, TournamentParticipant.STATUS_WAITLISTED, outcome=WAITLISTED
+            )
+        db.session.rollback()
+        return FULL
+
+
+ENGINES: dict[str, SignupEngine] = {
+    engine.key: engine for engine in (SeatClaimSignup(), LockingSignup())
+}
+DEFAULT_ENGINE = SeatClaimSignup.key
+
+
+def get_engine(key: Optional[str] = None) -> SignupEngine:
+    return ENGINES.get(key or DEFAULT_ENGINE, ENGINES[DEFAULT_ENGINE])
+
+
+def register_participant(
+    tournament_id: int,
+    user_id: int,
+    license_number: str,
+    ranking: int,
+    *,
+    now: Optional[datetime] = None,
+    engine: Optional[str] = None,
+) -> str:
+    """Register ``user_id`` with the configured engine (``SIGNUP_ENGINE``)."""
+    engine = engine or current_app.config.get("SIGNUP_ENGINE")
+    return get_engine(engine).register(
+        tournament_id,
+        user_id,
+        license_number,
+        ranking,
+        now=now or datetime.utcnow(),
+        waitlist=current_app.config.get("SIGNUP_WAITLIST", True),
+    )
+
+
+def promote_waitlisted(participant_id: int, *, now: Optional[datetime] = None) -> str:
+    """Give a waitlisted participant a seat if one is free.
+
+    Returns ``REGISTERED``, ``FULL``, ``CLOSED`` or ``NOT_FOUND`` (no such
+    participant on the waitlist). Status changes through the ORM cannot
+    take a seat, see ``models._participant_changed``.
+    """
+    participant = db.session.get(TournamentParticipant, participant_id)
+    if participant is None or participant.status != TournamentParticipant.STATUS_WAITLISTED:
+        return NOT_FOUND
+    now = now or datetime.utcnow()
+    tournament_id = participant.tournament_id
+    if not SeatClaimSignup._claim_seat(tournament_id, now):
+        outcome = SeatClaimSignup._refusal(tournament_id, now)
+        db.session.rollback()
+        return outcome
+
+    # Core update: the seat is already accounted for
+    result = db.session.execute(
+        update(TournamentParticipant)
+        .where(
+            TournamentParticipant.id == participant_id,
+            TournamentParticipant.status == TournamentParticipant.STATUS_WAITLISTED,
+        )
+        .values(status=TournamentParticipant.STATUS_PENDING)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        # Promoted (or removed) concurrently: give the seat back
+        db.session.rollback()
+        return NOT_FOUND
+    db.session.commit()
+    return REGISTERED
@@ -0,0 +1,181 @@
+"""A small local SMTP server for development and tests (``flask smtp-stub``).
+
+Accepts every message and keeps it in memory instead of delivering it. It
+can answer slowly or drop the first connections, to exercise the
+background mail queue (``services.mailer``) the way a real server would.
+"""
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, field
+from email import message_from_bytes
+from email.message import Message as EmailMessage
+from typing import Optional
+
+
+@dataclass
+class ReceivedMessage:
+    sender: str
+    recipients: list[str]
+    data: bytes
+
+    @property
+    def message(self) -> EmailMessage:
+        return message_from_bytes(self.data)
+
+    @property
+    def subject(self) -> str:
+        return self.message["Subject"] or ""
+
+
+@dataclass
+class _State:
+    delay: float = 0.0
+    fail_connections: int = 0
+    connections: int = 0
+    messages: list[ReceivedMessage] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+        self.wfile.flush()
+
+    def handle(self) -> None:
+        state = self.server.state
+        with state.lock:
+            state.connections += 1
+            refuse = state.fail_connections > 0
+            if refuse:
+                state.fail_connections -= 1
+        if refuse:
+            self.reply("421 Service not available, try again later")
+            return
+        if state.delay:
+            time.sleep(state.delay)
+
+        self.reply("220 smtp-stub ready")
+        sender, recipients = "", []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            verb = line[:4].upper()
+            if verb == "EHLO":
+                self.reply("250-smtp-stub")
+                self.reply("250 8BITMIME")
+            elif verb == "HELO":
+                self.reply("250 smtp-stub")
+            elif verb == "MAIL":
+                sender, recipients = _address(line), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(_address(line))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = self._read_data()
+                with state.lock:
+                    state.messages.append(ReceivedMessage(sender, recipients, data))
+                sender, recipients = "", []
+                self.reply("250 OK: queued")
+            elif verb == "RSET":
+                sender, recipients = "", []
+                self.reply("250 OK")
+            elif verb == "NOOP":
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+    def _read_data(self) -> bytes:
+        lines = []
+        while True:
+            raw = self.rfile.readline()
+            if not raw or raw in (b".\r\n", b".\n"):
+                break
+            # Undo dot-stuffing
+            lines.append(raw[1:] if raw.startswith(b"..") else raw)
+        return b"".join(lines)
+
+
+def _address(line: str) -> str:
+    _, _, rest = line.partition(":")
+    return rest.strip().split(" ")[0].strip("<>")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, state: _State) -> None:
+        self.state = state
+        super().__init__(address, _SMTPHandler)
+
+
+class SMTPStub:
+    """Threaded SMTP server recording what it receives.
+
+    ``delay`` holds back the greeting of every connection for that many
+    seconds; ``fail_connections`` makes the first connections get a 421.
+    Use as a context manager, or call :meth:`start` and :meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        delay: float = 0.0,
+        fail_connections: int = 0,
+    ) -> None:
+        self.state = _State(delay=delay, fail_connections=fail_connections)
+        self._server = _Server((host, port), self.state)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def messages(self) -> list[ReceivedMessage]:
+        with self.state.lock:
+            return list(self.state.messages)
+
+    @property
+    def connections(self) -> int:
+        return self.state.connections
+
+    def start(self) -> "SMTPStub":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="smtp-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "SMTPStub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -4,6 +4,8 @@ from flask_wtf import FlaskForm
 from wtforms import DateTimeField, IntegerField, SelectField, StringField, TextAreaField
 from wtforms.validators import DataRequired, Length, NumberRange, ValidationError
 
+from ..services.bracket_engine import DEFAULT_FORMAT, format_choices
+
 
 class TournamentForm(FlaskForm):
     name = StringField("Name", validators=[DataRequired(), Length(max=255)])
@@ -17,8 +19,16 @@ class TournamentForm(FlaskForm):
         ],
         validators=[DataRequired()],
     )
+    bracket_format = SelectField(
+        "Format",
+        choices=format_choices(),
+        default=DEFAULT_FORMAT,
+        validators=[DataRequired()],
+    )
     venue_name = StringField("Location", validators=[DataRequired(), Length(max=255)])
-    start_at = DateTimeField("Start date and time", validators=[DataRequired()], format="%Y-%m-%dT%H:%M")
+    start_at = DateTimeField(
+        "Start date and time", validators=[DataRequired()], format="%Y-%m-%dT%H:%M"
+    )
     signup_deadline = DateTimeField(
         "Signup deadline",
         validators=[DataRequired()],
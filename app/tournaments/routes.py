@@ -1,14 +1,43 @@
 from datetime import datetime
+import json
 import re
+import time
 from typing import Optional
 
-from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for, abort
+from flask import (
+    Blueprint,
+    Response,
+    abort,
+    current_app,
+    flash,
+    jsonify,
+    make_response,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
 from flask_login import current_user, login_required
-from sqlalchemy import or_, func
-from sqlalchemy.exc import IntegrityError
 
-from ..extensions import db
-from ..models import Tournament, TournamentParticipant, Match
+from ..extensions import bracket_events, cache, db
+from ..models import Tournament, TournamentParticipant
+from ..services import match_reports
+from ..services.batch_results import CONFLICT, ResultRow, apply_results, parse_winner
+from ..services.bracket_events import channel, sse
+from ..services.bracket_repository import bracket_payload, load_bracket
+from ..services.cache import BRACKETS, LISTINGS, make_etag, not_modified, with_etag
+from ..services.pagination import cached_total, keyset_paginate
+from ..services.search import search_tournaments
+from ..services.seeding import seed_tournament
+from ..services.signups import (
+    CLOSED,
+    DUPLICATE,
+    FULL,
+    NOT_FOUND,
+    WAITLISTED,
+    register_participant,
+)
 from .forms import TournamentForm, TournamentApplicationForm
 
 
@@ -28,157 +57,66 @@ def _normalize_google_maps_input(raw: Optional[str]) -> Optional[str]:
     return text or None
 
 
-def _ensure_round1_bracket(tournament_id: int, *, ignore_deadline: bool = False) -> bool:
-    """Generate round 1 matches.
-
-    By default it only runs after the signup deadline; when
-    ``ignore_deadline`` is True, it generates immediately (used by
-    the organizer's "Generate bracket now" button).
-    Returns True if matches were created, False otherwise.
-    """
-    now = datetime.utcnow()
-    locked_tournament = (
-        Tournament.query.with_for_update().filter_by(id=tournament_id).first()
-    )
-    if not locked_tournament:
-        return False
-
-    # Solo dopo la deadline iscrizioni, a meno che non sia una forzatura
-    if not ignore_deadline and locked_tournament.signup_deadline > now:
-        return False
-
-    # Se ci sono già match di round 1, non rigenerare
-    existing = (
-        Match.query.filter_by(
-            tournament_id=locked_tournament.id, round_number=1
-        ).count()
-    )
-    if existing > 0:
-        return False
-
-    participants = (
-        TournamentParticipant.query.filter_by(tournament_id=locked_tournament.id)
-        .order_by(TournamentParticipant.ranking.asc())
-        .all()
-    )
-
-    if len(participants) < 2:
-        return False
-
-    # Seeding: 1 vs ultimo, 2 vs penultimo, ...
-    left = 0
-    right = len(participants) - 1
-    bracket_position = 1
-    while left < right:
-        player_a = participants[left]
-        player_b = participants[right]
-        match = Match(
-            tournament_id=locked_tournament.id,
-            round_number=1,
-            bracket_position=bracket_position,
-            player_a_id=player_a.id,
-            player_b_id=player_b.id,
-        )
-        db.session.add(match)
-        left += 1
-        right -= 1
-        bracket_position += 1
-
-    # Se numero dispari di giocatori: ultimo rimasto prende un bye
-    if left == right:
-        player_a = participants[left]
-        match = Match(
-            tournament_id=locked_tournament.id,
-            round_number=1,
-            bracket_position=bracket_position,
-            player_a_id=player_a.id,
-            player_b_id=None,
-        )
-        db.session.add(match)
-    db.session.commit()
-    return True
-
-
-def _advance_winner(match: Match) -> None:
-    """Advance the winner of a match to the appropriate next-round match.
-
-    Uses the tournament, round_number and bracket_position to determine the
-    next match. If the next-round match does not exist yet, it is created
-    with empty player slots and the winner is placed into the correct slot.
-    """
-    if not match.winner_id:
-        return
-
-    # Determine next round and bracket position
-    next_round = match.round_number + 1
-    # Example: match positions 1 and 2 feed into position 1 of next round,
-    # positions 3 and 4 feed into position 2, etc.
-    next_bracket_position = (match.bracket_position + 1) // 2
-
-    next_match = (
-        Match.query.filter_by(
-            tournament_id=match.tournament_id,
-            round_number=next_round,
-            bracket_position=next_bracket_position,
-        ).first()
-    )
-
-    if not next_match:
-        next_match = Match(
-            tournament_id=match.tournament_id,
-            round_number=next_round,
-            bracket_position=next_bracket_position,
-        )
-        db.session.add(next_match)
-
-    # Decide whether the winner goes into player_a or player_b slot in next match
-    if match.bracket_position % 2 == 1:
-        # Left child feeds player A
-        if next_match.player_a_id is None:
-            next_match.player_a_id = match.winner_id
-    else:
-        # Right child feeds player B
-        if next_match.player_b_id is None:
-            next_match.player_b_id = match.winner_id
-
-
-@tournaments_bp.get("/")
-def list_tournaments():
-    page = request.args.get("page", 1, type=int)
-    q = request.args.get("q", "").strip()
+def _render_listing(q: str, page: int, cursor: Optional[str]) -> str:
     per_page = current_app.config.get("TOURNAMENTS_PER_PAGE", 10)
 
-    query = (
-        Tournament.query.filter(Tournament.start_at >= datetime.utcnow())
-        .order_by(Tournament.start_at.asc())
-    )
+    query = Tournament.query.filter(Tournament.start_at >= datetime.utcnow())
 
     if q:
-        like = f"%{q}%"
-        query = query.filter(
-            or_(
-                Tournament.name.ilike(like),
-                Tournament.discipline.ilike(like),
-                Tournament.description.ilike(like),
-            )
+        # Full-text match ranked by relevance (name > discipline > description);
+        # relevance has no stable key to seek on, so results use page numbers.
+        pagination = search_tournaments(query, q).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+        return render_template(
+            "tournaments/_list_results.html",
+            tournaments=pagination.items,
+            page=pagination.page,
+            per_page=per_page,
+            has_next=pagination.has_next,
+            has_prev=pagination.has_prev,
+            next_page=pagination.next_num,
+            prev_page=pagination.prev_num,
+            q=q,
+            total=pagination.total,
         )
 
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    pagination = keyset_paginate(query, cursor, per_page)
+    total = cached_total(
+        "upcoming_tournaments",
+        query.order_by(None).count,
+        current_app.config.get("TOURNAMENTS_TOTAL_TTL"),
+    )
 
     return render_template(
-        "tournaments/list.html",
+        "tournaments/_list_results.html",
         tournaments=pagination.items,
         page=pagination.page,
         per_page=per_page,
         has_next=pagination.has_next,
         has_prev=pagination.has_prev,
-        next_page=pagination.next_num,
-        prev_page=pagination.prev_num,
+        next_cursor=pagination.next_cursor,
+        prev_cursor=pagination.prev_cursor,
         q=q,
-        total=pagination.total,
+        total=total,
     )
 
 
+@tournaments_bp.get("/")
+@cache.cached_response(LISTINGS)
+def list_tournaments():
+    page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
+    q = request.args.get("q", "").strip()
+
+    listing = cache.fragment(
+        LISTINGS,
+        ("list", q, page if q else None, cursor),
+        lambda: _render_listing(q, page, cursor),
+    )
+    return render_template("tournaments/list.html", listing=listing, q=q)
+
+
 @tournaments_bp.route("/<int:tournament_id>", methods=["GET", "POST"])
 def details(tournament_id: int):
     tournament = Tournament.query.get_or_404(tournament_id)
@@ -196,70 +134,35 @@ def details(tournament_id: int):
         if not is_organizer and not is_already_participant:
             application_form = TournamentApplicationForm()
             if application_form.validate_on_submit():
-                # Controllo concorrenza + requisito 6 (max partecipanti)
-                try:
-                    locked_tournament = (
-                        Tournament.query.with_for_update()
-                        .filter_by(id=tournament_id)
-                        .first()
-                    )
-                    if not locked_tournament:
-                        flash("Tournament not found.", "danger")
-                        return redirect(url_for("tournaments.list_tournaments"))
-
-                    # Controllo deadline iscrizioni
-                    if locked_tournament.signup_deadline <= datetime.utcnow():
-                        flash("Signup deadline has passed.", "warning")
-                        return redirect(
-                            url_for(
-                                "tournaments.details", tournament_id=locked_tournament.id
-                            )
-                        )
-
-                    current_count = (
-                        db.session.query(func.count(TournamentParticipant.id))
-                        .filter_by(tournament_id=locked_tournament.id)
-                        .scalar()
-                    )
-
-                    if current_count >= locked_tournament.max_participants:
-                        flash("The tournament is full.", "warning")
-                        return redirect(
-                            url_for(
-                                "tournaments.details", tournament_id=locked_tournament.id
-                            )
-                        )
-
-                    participant = TournamentParticipant(
-                        tournament_id=locked_tournament.id,
-                        user_id=current_user.id,
-                        license_number=application_form.license_number.data,
-                        ranking=application_form.ranking.data,
-                        status="pending",
-                    )
-                    db.session.add(participant)
-                    db.session.commit()
-                    flash("Application submitted.", "success")
-                    return redirect(
-                        url_for("tournaments.details", tournament_id=tournament_id)
-                    )
-                except IntegrityError:
-                    db.session.rollback()
+                # Requisito 6 (max partecipanti): the seat is claimed with a
+                # conditional update of the participant counter, no row lock
+                outcome = register_participant(
+                    tournament.id,
+                    current_user.id,
+                    application_form.license_number.data,
+                    application_form.ranking.data,
+                )
+                if outcome == NOT_FOUND:
+                    flash("Tournament not found.", "danger")
+                    return redirect(url_for("tournaments.list_tournaments"))
+                if outcome == CLOSED:
+                    flash("Signup deadline has passed.", "warning")
+                elif outcome == FULL:
+                    flash("The tournament is full.", "warning")
+                elif outcome == WAITLISTED:
+                    flash("The tournament is full: you have been added to the waitlist.", "info")
+                elif outcome == DUPLICATE:
                     flash(
                         "Your license number or ranking is already used in this tournament.",
                         "danger",
                     )
-                    return redirect(
-                        url_for("tournaments.details", tournament_id=tournament_id)
-                    )
+                else:
+                    flash("Application submitted.", "success")
+                return redirect(url_for("tournaments.details", tournament_id=tournament_id))
         elif request.method == "POST":
             flash("You cannot apply to this tournament.", "warning")
             return redirect(url_for("tournaments.details", tournament_id=tournament.id))
 
-    # Dopo la deadline, genera il tabellone di round 1 se non esiste ancora
-    if datetime.utcnow() > tournament.signup_deadline:
-        _ensure_round1_bracket(tournament.id)
-
     participants = (
         TournamentParticipant.query.filter_by(tournament_id=tournament.id)
         .order_by(TournamentParticipant.ranking.asc())
@@ -267,37 +170,199 @@ def details(tournament_id: int):
     )
 
     ranked_players_count = len(
-        [p for p in participants if p.ranking is not None]
+        [
+            p
+            for p in participants
+            if p.ranking is not None and p.status != TournamentParticipant.STATUS_WAITLISTED
+        ]
     )
 
-    # Collect matches grouped by round so that the bracket (including
-    # later rounds populated by advancing winners) can be shown.
-    matches_by_round = {}
-    max_round = (
-        db.session.query(func.max(Match.round_number))
-        .filter_by(tournament_id=tournament.id)
-        .scalar()
-    ) or 0
+    # Brackets are seeded by the ``seed-due-brackets`` job, so a draft
+    # tournament has nothing to show yet.
+    awaiting_bracket = (
+        tournament.status == Tournament.STATUS_DRAFT
+        and datetime.utcnow() > tournament.signup_deadline
+    )
 
-    for round_number in range(1, max_round + 1):
-        matches_by_round[round_number] = (
-            Match.query.filter_by(tournament_id=tournament.id, round_number=round_number)
-            .order_by(Match.bracket_position.asc())
-            .all()
+    # Anonymous visitors all get the same page: let them revalidate it
+    etag = None
+    if (
+        request.method == "GET"
+        and not current_user.is_authenticated
+        and not session.get("_flashes")
+    ):
+        etag = make_etag(
+            "detail",
+            tournament.id,
+            tournament.updated_at,
+            tournament.status,
+            tournament.bracket_version,
+            awaiting_bracket,
+            tournament.organizer.first_name,
+            tournament.organizer.last_name,
+            [(p.id, p.ranking, p.license_number, p.status) for p in participants],
+        )
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+    bracket_html = _bracket_html(tournament, is_already_participant)
+
+    response = make_response(
+        render_template(
+            "tournaments/detail.html",
+            tournament=tournament,
+            application_form=application_form,
+            is_organizer=is_organizer,
+            is_already_participant=is_already_participant,
+            ranked_players_count=ranked_players_count,
+            participants=participants,
+            bracket_html=bracket_html,
+            awaiting_bracket=awaiting_bracket,
         )
+    )
+    return with_etag(response, etag) if etag else response
+
 
+def _render_bracket(tournament: Tournament) -> str:
+    # All matches with their players in one statement, grouped by stage and
+    # round; round headers are labelled from ``tournament.total_rounds``
     return render_template(
-        "tournaments/detail.html",
-        tournament=tournament,
-        application_form=application_form,
-        is_organizer=is_organizer,
-        is_already_participant=is_already_participant,
-        ranked_players_count=ranked_players_count,
-        participants=participants,
-        matches_by_round=matches_by_round,
+        "tournaments/_bracket.html", tournament=tournament, bracket=load_bracket(tournament.id)
+    )
+
+
+def _bracket_html(tournament: Tournament, is_participant: bool) -> str:
+    if tournament.status == Tournament.STATUS_DRAFT:
+        return ""
+    if is_participant:
+        # Players get the report forms of their own matches
+        return _render_bracket(tournament)
+    return cache.fragment(
+        BRACKETS,
+        (tournament.id, tournament.bracket_version, "html"),
+        lambda: _render_bracket(tournament),
+        ttl=current_app.config.get("CACHE_BRACKET_TTL"),
     )
 
 
+@tournaments_bp.get("/<int:tournament_id>/bracket.html")
+def bracket_fragment(tournament_id: int):
+    """The bracket section alone, swapped in by the live updates script."""
+    tournament = Tournament.query.get_or_404(tournament_id)
+    is_participant = (
+        current_user.is_authenticated
+        and db.session.query(TournamentParticipant.id)
+        .filter_by(tournament_id=tournament.id, user_id=current_user.id)
+        .first()
+        is not None
+    )
+    response = make_response(_bracket_html(tournament, is_participant))
+    # The script compares it with the version the stream announces
+    response.headers["X-Bracket-Version"] = str(tournament.bracket_version)
+    return response
+
+
+@tournaments_bp.get("/<int:tournament_id>/events")
+def bracket_events_stream(tournament_id: int):
+    """Stream bracket updates as Server-Sent Events.
+
+    Only the existence check touches the database: the stream itself just
+    relays the broker's messages, so the connection goes back to the pool
+    when the view returns.
+
+    The stream opens with a ``ready`` event carrying the bracket version.
+    It subscribes before reading that version, so a result committed in
+    between is either counted in the version or delivered on the stream;
+    the page refreshes its bracket when the version differs from the one
+    it rendered (updates missed before the stream opened or while the
+    browser was reconnecting).
+    """
+    slots = bracket_events.streams
+    if not slots.acquire():
+        # Every stream slot of this worker is taken: come back later rather
+        # than tie up a thread that ordinary requests need
+        retry_after = current_app.config.get("EVENTS_RETRY_AFTER", 15)
+        return Response(
+            f"retry: {retry_after * 1000}\n\n",
+            status=503,
+            mimetype="text/event-stream",
+            headers={"Retry-After": str(retry_after), "Cache-Control": "no-cache"},
+        )
+    subscription = bracket_events.broker.subscribe(channel(tournament_id))
+    version = (
+        db.session.query(Tournament.bracket_version)
+        .filter(Tournament.id == tournament_id)
+        .scalar()
+    )
+    if version is None:
+        subscription.close()
+        slots.release()
+        abort(404)
+
+    keepalive = current_app.config.get("EVENTS_KEEPALIVE", 15)
+    lifetime = current_app.config.get("EVENTS_STREAM_TIMEOUT", 300)
+
+    def stream():
+        yield "retry: 3000\n" + sse(json.dumps({"version": version}), "ready")
+        deadline = time.monotonic() + lifetime
+        while time.monotonic() < deadline:
+            message = subscription.get(timeout=keepalive)
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield sse(json.dumps({"reload": True}), "reload")
+            if message is None:
+                yield ": keepalive\n\n"
+            else:
+                yield sse(message, "bracket")
+
+    response = Response(
+        stream(),
+        mimetype="text/event-stream",
+        # Proxies must pass events through as they come
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Also runs when the client goes away before the first chunk
+    response.call_on_close(subscription.close)
+    response.call_on_close(slots.release)
+    return response
+
+
+@tournaments_bp.get("/<int:tournament_id>/bracket.json")
+def bracket_json(tournament_id: int):
+    """Return the bracket as JSON, revalidated through its version ETag."""
+    row = (
+        db.session.query(Tournament.status, Tournament.bracket_version)
+        .filter(Tournament.id == tournament_id)
+        .first()
+    )
+    if row is None:
+        abort(404)
+    status, version = row
+
+    etag = make_etag("bracket", tournament_id, version)
+    response = not_modified(etag)
+    if response is not None:
+        return response
+
+    body = cache.get_or_set(
+        BRACKETS,
+        (tournament_id, version, "json"),
+        lambda: json.dumps(
+            {
+                "tournament_id": tournament_id,
+                "status": status,
+                "version": version,
+                "stages": bracket_payload(tournament_id)
+                if status != Tournament.STATUS_DRAFT
+                else [],
+            }
+        ),
+        ttl=current_app.config.get("CACHE_BRACKET_TTL"),
+    )
+    return with_etag(Response(body, mimetype="application/json"), etag)
+
+
 @tournaments_bp.post("/matches/<int:match_id>/report")
 @login_required
 def report_match_result(match_id: int):
@@ -307,65 +372,97 @@ def report_match_result(match_id: int):
     - Each player can declare who won (one of the two participants).
     - When both declarations are present and identical, winner_id is set.
     - If they differ, both declarations are cleared and players must resubmit.
-    """
-    match = Match.query.get_or_404(match_id)
-
-    if match.winner_id is not None:
-        flash("Result already confirmed for this match.", "info")
-        return redirect(url_for("tournaments.details", tournament_id=match.tournament_id))
-
-    # Ensure current user is one of the players
-    player_a = match.player_a
-    player_b = match.player_b
-
-    if not player_a or not player_b:
-        flash("This match cannot be reported (bye or incomplete pairing).", "warning")
-        return redirect(url_for("tournaments.details", tournament_id=match.tournament_id))
-
-    if current_user.id not in {player_a.user_id, player_b.user_id}:
-        flash("You are not a participant in this match.", "danger")
-        return redirect(url_for("tournaments.details", tournament_id=match.tournament_id))
-
-    winner_id_raw = request.form.get("winner_id")
-    if not winner_id_raw:
-        abort(400)
 
+    Simultaneous reports are reconciled by ``services.match_reports``
+    through the match version instead of a row lock.
+    """
     try:
-        declared_winner_id = int(winner_id_raw)
+        declared_winner_id = int(request.form.get("winner_id", ""))
     except ValueError:
         abort(400)
 
-    if declared_winner_id not in {player_a.id, player_b.id}:
+    result = match_reports.report_result(match_id, current_user.id, declared_winner_id)
+    if result.outcome == match_reports.NOT_FOUND:
+        abort(404)
+    if result.outcome == match_reports.INVALID_WINNER:
         abort(400)
 
-    # Store declaration depending on which player is reporting
-    if current_user.id == player_a.user_id:
-        match.player_a_reported_winner_id = declared_winner_id
-    elif current_user.id == player_b.user_id:
-        match.player_b_reported_winner_id = declared_winner_id
-
-    # Check if both players have reported
-    a_report = match.player_a_reported_winner_id
-    b_report = match.player_b_reported_winner_id
-
-    if a_report and b_report:
-        if a_report == b_report:
-            match.winner_id = a_report
-            _advance_winner(match)
-            flash("Result confirmed by both players.", "success")
-        else:
-            # Conflict: reset and require new submissions
-            match.player_a_reported_winner_id = None
-            match.player_b_reported_winner_id = None
-            flash(
-                "Conflict between players' reports. Please agree on the result and submit again.",
-                "danger",
-            )
-    else:
-        flash("Your result has been recorded. Waiting for the other player.", "info")
-
-    db.session.commit()
-    return redirect(url_for("tournaments.details", tournament_id=match.tournament_id))
+    category, message = _REPORT_MESSAGES[result.outcome]
+    flash(message, category)
+    return redirect(url_for("tournaments.details", tournament_id=result.tournament_id))
+
+
+_REPORT_MESSAGES = {
+    match_reports.ALREADY_DECIDED: ("info", "Result already confirmed for this match."),
+    match_reports.INCOMPLETE: (
+        "warning",
+        "This match cannot be reported (bye or incomplete pairing).",
+    ),
+    match_reports.NOT_PLAYER: ("danger", "You are not a participant in this match."),
+    match_reports.CONFIRMED: ("success", "Result confirmed by both players."),
+    match_reports.MISMATCH: (
+        "danger",
+        "Conflict between players' reports. Please agree on the result and submit again.",
+    ),
+    match_reports.RECORDED: (
+        "info",
+        "Your result has been recorded. Waiting for the other player.",
+    ),
+    match_reports.BUSY: (
+        "warning",
+        "The match was being updated by someone else. Please submit again.",
+    ),
+}
+
+
+@tournaments_bp.post("/<int:tournament_id>/results")
+@login_required
+def enter_results(tournament_id: int):
+    """Record a batch of results from the organizer's score sheet.
+
+    Expects ``{"results": [{"match_id": 12, "winner": 34}, ...]}`` where the
+    winner is a participant id or the slot ``"a"``/``"b"``; ``partial``
+    applies the valid rows even if others fail, ``dry_run`` only validates.
+    Answers with the outcome of every row: 200 when the batch was applied
+    (or validated), 422 when it was rejected, 409 on a concurrent change.
+    """
+    organizer_id = (
+        db.session.query(Tournament.organizer_id).filter(Tournament.id == tournament_id).scalar()
+    )
+    if organizer_id is None:
+        abort(404)
+    if organizer_id != current_user.id:
+        abort(403)
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict) or not isinstance(payload.get("results"), list):
+        return jsonify({"error": "Expected a JSON object with a list of results."}), 400
+    rows = []
+    for index, item in enumerate(payload["results"]):
+        try:
+            rows.append(ResultRow(int(item["match_id"]), parse_winner(item["winner"])))
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": f"Result {index} needs a match_id and a winner."}), 400
+
+    result = apply_results(
+        tournament_id,
+        rows,
+        partial=bool(payload.get("partial")),
+        dry_run=bool(payload.get("dry_run")),
+    )
+    status = 200 if result.applied or result.ok else 422
+    if any(outcome.status == CONFLICT for outcome in result.outcomes):
+        status = 409
+    return (
+        jsonify(
+            {
+                "applied": result.applied,
+                "counts": result.counts(),
+                "results": [outcome.as_dict() for outcome in result.outcomes],
+            }
+        ),
+        status,
+    )
 
 
 @tournaments_bp.route("/create", methods=["GET", "POST"])
@@ -397,6 +494,7 @@ def create():
             google_maps_url=google_maps_url,
             sponsor_assets=sponsor_assets,
             status="draft",
+            bracket_format=form.bracket_format.data,
         )
         db.session.add(tournament)
         db.session.commit()
@@ -454,6 +552,9 @@ def edit(tournament_id: int):
             form.google_maps_url.data
         )
         tournament.sponsor_assets = sponsor_assets
+        # The format cannot change once the bracket has been generated
+        if tournament.status == Tournament.STATUS_DRAFT:
+            tournament.bracket_format = form.bracket_format.data
 
         db.session.commit()
         flash("Tournament updated.", "success")
@@ -485,7 +586,7 @@ def generate_bracket_now(tournament_id: int):
         flash("You are not allowed to generate the bracket for this tournament.", "danger")
         return redirect(url_for("tournaments.details", tournament_id=tournament.id))
 
-    created = _ensure_round1_bracket(tournament.id, ignore_deadline=True)
+    created = seed_tournament(tournament.id, ignore_deadline=True)
     if created:
         flash("Bracket generated.", "success")
     else:
@@ -0,0 +1,185 @@
+"""Endpoint benchmarks on a production-sized database.
+
+Run with ``python -m pytest benchmarks -s`` (not part of the default test
+run). The database is a file-backed SQLite in a temporary directory, or
+``BENCH_DATABASE_URL`` (e.g. a local PostgreSQL), filled once per session
+by ``services.load_data`` with ``BENCH_USERS`` users and
+``BENCH_TOURNAMENTS`` tournaments.
+
+Every run prints throughput and latency percentiles per benchmark next to
+the change against the stored baseline (``--bench-baseline``, default
+``benchmarks/baseline.json``). ``--bench-save`` stores the run as the new
+baseline; ``--bench-tolerance 0.2`` fails the run when a metric is more
+than 20% worse than the baseline, or when there is no baseline to compare
+with.
+
+The committed ``baseline.json`` was made with the default scale and
+records the environment it ran on; numbers from another machine or
+database are only comparable with a baseline saved there, and the report
+says when the environments differ.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import Match, Tournament, TournamentParticipant
+from app.services.load_data import LoadPlan, generate_load_data
+
+from .harness import environment, load_baseline, regressions, report, save_baseline
+
+_MEASUREMENTS = pytest.StashKey[list]()
+_ENVIRONMENT = pytest.StashKey[dict]()
+_REGRESSIONS = pytest.StashKey[list]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-save", action="store_true", help="Store this run as the baseline.")
+    group.addoption(
+        "--bench-baseline",
+        default=str(Path(__file__).with_name("baseline.json")),
+        help="Baseline file to compare with (and to write with --bench-save).",
+    )
+    group.addoption(
+        "--bench-tolerance",
+        type=float,
+        default=None,
+        help="Fail when a metric is worse than the baseline by more than this fraction.",
+    )
+    group.addoption("--bench-requests", type=int, default=200, help="Requests per benchmark.")
+
+
+def pytest_configure(config):
+    config.stash[_MEASUREMENTS] = []
+    config.stash[_ENVIRONMENT] = {}
+    config.stash[_REGRESSIONS] = []
+
+
+@pytest.fixture(scope="session")
+def scale() -> dict:
+    return {
+        "users": int(os.getenv("BENCH_USERS", 5000)),
+        "tournaments": int(os.getenv("BENCH_TOURNAMENTS", 500)),
+    }
+
+
+@pytest.fixture(scope="session")
+def bench_app(tmp_path_factory, scale):
+    url = os.getenv("BENCH_DATABASE_URL") or (
+        f"sqlite:///{tmp_path_factory.mktemp('bench') / 'bench.db'}"
+    )
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", url)
+        app = create_app("testing")
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    generate_load_data(
+        app, LoadPlan(users=scale["users"], tournaments=scale["tournaments"], seed=42)
+    )
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture()
+def record(request, bench_app, scale):
+    """Keep a measurement for the end-of-session report."""
+
+    def _record(measurement):
+        request.config.stash[_MEASUREMENTS].append(measurement)
+        assert measurement.errors == 0, f"{measurement.errors} failed requests"
+        return measurement
+
+    with bench_app.app_context():
+        request.config.stash[_ENVIRONMENT] = environment(db.engine.dialect.name, scale)
+    return _record
+
+
+@pytest.fixture()
+def requests_per_benchmark(request) -> int:
+    return request.config.getoption("--bench-requests")
+
+
+@pytest.fixture(scope="session")
+def largest_bracket(bench_app) -> int:
+    with bench_app.app_context():
+        return (
+            db.session.query(Match.tournament_id)
+            .group_by(Match.tournament_id)
+            .order_by(func.count().desc())
+            .limit(1)
+            .scalar()
+        )
+
+
+@pytest.fixture(scope="session")
+def busiest_player(bench_app) -> int:
+    """The user taking part in the most tournaments."""
+    with bench_app.app_context():
+        return (
+            db.session.query(TournamentParticipant.user_id)
+            .group_by(TournamentParticipant.user_id)
+            .order_by(func.count().desc())
+            .limit(1)
+            .scalar()
+        )
+
+
+@pytest.fixture(scope="session")
+def search_terms(bench_app) -> list[str]:
+    with bench_app.app_context():
+        return sorted({discipline for (discipline,) in db.session.query(Tournament.discipline)})
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    measurements = config.stash[_MEASUREMENTS]
+    if not measurements:
+        return
+    path = Path(config.getoption("--bench-baseline"))
+    baseline = load_baseline(path)
+    terminalreporter.section("benchmarks")
+    if baseline is not None:
+        terminalreporter.write_line(f"baseline: {path} {baseline.get('environment')}")
+        if baseline.get("environment") != config.stash[_ENVIRONMENT]:
+            terminalreporter.write_line(
+                f"baseline made on another environment than this run "
+                f"{config.stash[_ENVIRONMENT]}",
+                yellow=True,
+            )
+    elif not config.getoption("--bench-save"):
+        terminalreporter.write_line(f"no baseline at {path}, run with --bench-save to store one")
+    for line in report(measurements, baseline):
+        terminalreporter.write_line(line)
+    if config.getoption("--bench-save"):
+        save_baseline(path, measurements, config.stash[_ENVIRONMENT])
+        terminalreporter.write_line(f"baseline saved to {path}")
+    for line in config.stash[_REGRESSIONS]:
+        terminalreporter.write_line(line, red=True)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    tolerance = session.config.getoption("--bench-tolerance")
+    if tolerance is None or session.config.getoption("--bench-save"):
+        return
+    path = Path(session.config.getoption("--bench-baseline"))
+    baseline = load_baseline(path)
+    if baseline is None:
+        found = [f"FAILED no baseline at {path} to apply --bench-tolerance to"]
+    else:
+        found = [
+            f"REGRESSION {line}"
+            for line in regressions(session.config.stash[_MEASUREMENTS], baseline, tolerance)
+        ]
+    if found:
+        session.config.stash[_REGRESSIONS] = found
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
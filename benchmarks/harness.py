@@ -0,0 +1,158 @@
+"""Timing and baseline bookkeeping for the endpoint benchmarks."""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+# Metrics compared against the baseline, and whether higher is better
+METRICS = {"per_second": True, "p50_ms": False, "p90_ms": False, "p99_ms": False}
+
+
+@dataclass
+class Measurement:
+    name: str
+    requests: int
+    elapsed: float
+    latencies: list[float] = field(repr=False)
+    errors: int = 0
+
+    def percentile(self, fraction: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def metrics(self) -> dict[str, float]:
+        return {
+            "per_second": round(self.requests / self.elapsed, 1) if self.elapsed else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 2),
+            "p90_ms": round(self.percentile(0.90) * 1000, 2),
+            "p99_ms": round(self.percentile(0.99) * 1000, 2),
+        }
+
+
+def measure(
+    name: str,
+    call: Callable[[int], object],
+    *,
+    requests: int,
+    warmup: int = 5,
+    threads: int = 1,
+    expect: tuple[int, ...] = (200,),
+) -> Measurement:
+    """Time ``call(i)`` for ``i`` in ``range(requests)``.
+
+    ``call`` performs one request and returns its response; statuses
+    outside ``expect`` count as errors. With ``threads`` > 1 the calls are
+    spread over a thread pool and the throughput is the aggregate one.
+    """
+    for index in range(warmup):
+        call(-1 - index)
+
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(index: int) -> None:
+        nonlocal errors
+        started = time.perf_counter()
+        response = call(index)
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            if getattr(response, "status_code", 200) not in expect:
+                errors += 1
+
+    started = time.perf_counter()
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(one, range(requests)))
+    else:
+        for index in range(requests):
+            one(index)
+    return Measurement(name, requests, time.perf_counter() - started, latencies, errors)
+
+
+def client_for(app, user_id: int):
+    """A test client logged in as ``user_id``."""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user_id)
+        session["_fresh"] = True
+    return client
+
+
+def environment(database: str, scale: dict) -> dict:
+    return {
+        "database": database,
+        "scale": scale,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def load_baseline(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_baseline(path: Path, measurements: list[Measurement], env: dict) -> None:
+    data = {
+        "environment": env,
+        "results": {m.name: {**m.metrics(), "requests": m.requests} for m in measurements},
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def change(metric: str, current: float, baseline: float) -> float:
+    """Relative change, positive when worse."""
+    if not baseline:
+        return 0.0
+    delta = (current - baseline) / baseline
+    return -delta if METRICS[metric] else delta
+
+
+def report(measurements: list[Measurement], baseline: Optional[dict]) -> list[str]:
+    """Table of the run, with the change against ``baseline`` per metric.
+
+    Changes are signed so that positive means worse, for every metric.
+    """
+    previous = (baseline or {}).get("results", {})
+    lines = [
+        f"{'benchmark':<28}" + "".join(f"{metric:>22}" for metric in METRICS) + "  errors"
+    ]
+    for measurement in measurements:
+        metrics = measurement.metrics()
+        row = f"{measurement.name:<28}"
+        for metric in METRICS:
+            cell = f"{metrics[metric]:.1f}"
+            if measurement.name in previous and metric in previous[measurement.name]:
+                before = previous[measurement.name][metric]
+                cell += f" ({change(metric, metrics[metric], before):+.0%})"
+            row += f"{cell:>22}"
+        lines.append(row + f"  {measurement.errors}")
+    return lines
+
+
+def regressions(
+    measurements: list[Measurement], baseline: Optional[dict], tolerance: float
+) -> list[str]:
+    """Metrics worse than the baseline by more than ``tolerance`` (0.2 = 20%)."""
+    previous = (baseline or {}).get("results", {})
+    found = []
+    for measurement in measurements:
+        metrics = measurement.metrics()
+        for metric, before in previous.get(measurement.name, {}).items():
+            if metric in METRICS and change(metric, metrics[metric], before) > tolerance:
+                found.append(f"{measurement.name} {metric}: {before} -> {metrics[metric]}")
+    return found
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Match, Tournament, TournamentParticipant, User
+
+from .harness import client_for, measure
+
+
+def test_index(bench_app, record, requests_per_benchmark):
+    client = bench_app.test_client()
+    record(measure("index", lambda i: client.get("/"), requests=requests_per_benchmark))
+
+
+def test_search(bench_app, record, requests_per_benchmark, search_terms):
+    client = bench_app.test_client()
+
+    def search(i):
+        return client.get(f"/tournaments/?q={search_terms[i % len(search_terms)]}")
+
+    record(measure("search", search, requests=requests_per_benchmark))
+
+
+def test_large_bracket_anonymous(bench_app, record, requests_per_benchmark, largest_bracket):
+    client = bench_app.test_client()
+    record(
+        measure(
+            "bracket_detail_anonymous",
+            lambda i: client.get(f"/tournaments/{largest_bracket}"),
+            requests=requests_per_benchmark,
+        )
+    )
+
+
+def test_large_bracket_logged_in(
+    bench_app, record, requests_per_benchmark, largest_bracket, busiest_player
+):
+    # Logged-in pages bypass the response cache
+    client = client_for(bench_app, busiest_player)
+    record(
+        measure(
+            "bracket_detail_logged_in",
+            lambda i: client.get(f"/tournaments/{largest_bracket}"),
+            requests=requests_per_benchmark,
+        )
+    )
+
+
+def test_dashboard(bench_app, record, requests_per_benchmark, busiest_player):
+    client = client_for(bench_app, busiest_player)
+    record(measure("dashboard", lambda i: client.get("/me/"), requests=requests_per_benchmark))
+
+
+def test_signup(bench_app, record, requests_per_benchmark):
+    count = requests_per_benchmark
+    with bench_app.app_context():
+        user_ids = [
+            user_id for (user_id,) in db.session.query(User.id).order_by(User.id).limit(count + 1)
+        ]
+        now = datetime.utcnow()
+        tournament = Tournament(
+            organizer_id=user_ids[0],
+            name="Benchmark signups",
+            discipline="tennis",
+            start_at=now + timedelta(days=30),
+            signup_deadline=now + timedelta(days=20),
+            max_participants=count,
+        )
+        db.session.add(tournament)
+        db.session.commit()
+        tournament_id = tournament.id
+    clients = [client_for(bench_app, user_id) for user_id in user_ids[1:]]
+
+    def sign_up(i):
+        return clients[i].post(
+            f"/tournaments/{tournament_id}",
+            data={"license_number": f"BENCH-{i}", "ranking": i + 1},
+        )
+
+    record(measure("signup", sign_up, requests=count, warmup=0, expect=(302,)))
+    with bench_app.app_context():
+        assert db.session.get(Tournament, tournament_id).participant_count == count
+
+
+def test_report_match_result(bench_app, record, requests_per_benchmark):
+    """Both players report each open match: the second report confirms it."""
+    with bench_app.app_context():
+        open_matches = (
+            db.session.query(Match.id, Match.player_a_id, Match.player_b_id)
+            .join(Tournament, Tournament.id == Match.tournament_id)
+            .filter(
+                Tournament.status == Tournament.STATUS_RUNNING,
+                Match.winner_id.is_(None),
+                Match.player_a_id.isnot(None),
+                Match.player_b_id.isnot(None),
+            )
+            .order_by(Match.id)
+            .limit(requests_per_benchmark // 2)
+            .all()
+        )
+        users = dict(
+            db.session.query(TournamentParticipant.id, TournamentParticipant.user_id).filter(
+                TournamentParticipant.id.in_(
+                    [player for _, a, b in open_matches for player in (a, b)]
+                )
+            )
+        )
+    reports = []
+    for match_id, player_a, player_b in open_matches:
+        for player in (player_a, player_b):
+            reports.append((client_for(bench_app, users[player]), match_id, player_a))
+
+    def report(i):
+        client, match_id, winner = reports[i]
+        return client.post(f"/tournaments/matches/{match_id}/report", data={"winner_id": winner})
+
+    record(measure("report_match_result", report, requests=len(reports), warmup=0, expect=(302,)))
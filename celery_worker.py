@@ -0,0 +1,20 @@
+"""Celery entry point: ``celery -A celery_worker worker``.
+
+The worker always uses the Celery mail backend, whatever
+``MAIL_QUEUE_BACKEND`` the web processes run with.
+"""
+import os
+
+# Read when app.config is imported
+os.environ["MAIL_QUEUE_BACKEND"] = "celery"
+
+from app import create_app  # noqa: E402
+from app.services import mail_tasks  # noqa: E402,F401  registers the tasks
+
+app = create_app()
+if "celery" not in app.extensions:
+    raise RuntimeError(
+        "Celery could not be set up for the mail worker: install celery[redis] and point "
+        "REDIS_URL (or CELERY_BROKER_URL) at a reachable Redis, see the app log above."
+    )
+celery = app.extensions["celery"]
@@ -0,0 +1,37 @@
+"""Gunicorn settings: ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set, every worker writes its metrics to
+that directory and ``/metrics`` aggregates them (see app/services/metrics.py).
+
+Threaded workers keep a long-lived bracket event stream from holding a
+whole worker process, but each stream still occupies one of the worker's
+threads for up to ``EVENTS_STREAM_TIMEOUT``. A worker serves at most
+``EVENTS_MAX_STREAMS`` streams (half of its threads unless set) and answers
+further ones with a 503 and a retry delay, so the other threads stay free
+for ordinary requests.
+"""
+import multiprocessing
+import os
+import shutil
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+# Half of every worker's threads may hold event streams (read by app.config)
+os.environ.setdefault("EVENTS_MAX_STREAMS", str(max(1, threads // 2)))
+
+
+def on_starting(server):
+    # Samples of a previous run must not be aggregated with this one
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
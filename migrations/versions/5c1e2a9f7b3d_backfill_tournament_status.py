@@ -0,0 +1,40 @@
+"""backfill tournament status
+
+Revision ID: 5c1e2a9f7b3d
+Revises: 224858ab29ab
+Create Date: 2026-10-16 09:12:41.508113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e2a9f7b3d'
+down_revision = '224858ab29ab'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Brackets generated before the status lifecycle existed are still
+    # "draft": mark them seeded (or running when a result is in).
+    op.execute(
+        sa.text(
+            "UPDATE tournaments SET status = 'running' "
+            "WHERE status = 'draft' AND EXISTS ("
+            "SELECT 1 FROM matches WHERE matches.tournament_id = tournaments.id "
+            "AND matches.winner_id IS NOT NULL)"
+        )
+    )
+    op.execute(
+        sa.text(
+            "UPDATE tournaments SET status = 'seeded' "
+            "WHERE status = 'draft' AND EXISTS ("
+            "SELECT 1 FROM matches WHERE matches.tournament_id = tournaments.id)"
+        )
+    )
+
+
+def downgrade():
+    op.execute(sa.text("UPDATE tournaments SET status = 'draft'"))
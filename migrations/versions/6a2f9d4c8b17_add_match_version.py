@@ -0,0 +1,26 @@
+"""add match version
+
+Revision ID: 6a2f9d4c8b17
+Revises: d8e1b4c6f207
+Create Date: 2026-10-17 09:41:26.318504
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a2f9d4c8b17'
+down_revision = 'd8e1b4c6f207'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_column('version')
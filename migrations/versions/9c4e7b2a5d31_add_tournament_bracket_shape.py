@@ -0,0 +1,68 @@
+"""add tournament bracket size and total rounds
+
+Revision ID: 9c4e7b2a5d31
+Revises: 6a2f9d4c8b17
+Create Date: 2026-10-17 02:41:18.204417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4e7b2a5d31'
+down_revision = '6a2f9d4c8b17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bracket_size', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('total_rounds', sa.Integer(), nullable=True))
+
+    _backfill(op.get_bind())
+
+
+def _shape(bracket_format, count):
+    """(bracket_size, total_rounds) as ``BracketFormat`` computes them."""
+    if bracket_format == 'round_robin':
+        return count, count - 1 if count % 2 == 0 else count
+    rounds = max(1, (count - 1).bit_length())
+    if bracket_format == 'swiss':
+        return count, rounds
+    return 1 << rounds, rounds
+
+
+def _backfill(bind):
+    # Brackets already seeded, sized from their field rather than from the
+    # matches: older brackets created each round only when the previous one
+    # was complete, so the matches of a running event undercount the rounds.
+    rows = bind.execute(
+        sa.text(
+            "SELECT tournaments.id, tournaments.bracket_format, COUNT(tournament_participants.id) "
+            "FROM tournaments JOIN tournament_participants "
+            "ON tournament_participants.tournament_id = tournaments.id "
+            "AND tournament_participants.status != 'waitlisted' "
+            "WHERE EXISTS (SELECT 1 FROM matches WHERE matches.tournament_id = tournaments.id) "
+            "GROUP BY tournaments.id, tournaments.bracket_format"
+        )
+    ).all()
+    update = sa.text(
+        "UPDATE tournaments SET bracket_size = :bracket_size, total_rounds = :total_rounds "
+        "WHERE id = :id"
+    )
+    for tournament_id, bracket_format, count in rows:
+        if count < 2:
+            continue
+        bracket_size, total_rounds = _shape(bracket_format, count)
+        bind.execute(
+            update,
+            {"id": tournament_id, "bracket_size": bracket_size, "total_rounds": total_rounds},
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.drop_column('total_rounds')
+        batch_op.drop_column('bracket_size')
@@ -0,0 +1,34 @@
+"""add tournament participant count
+
+Revision ID: d8e1b4c6f207
+Revises: c5d2f7a8e903
+Create Date: 2026-10-17 00:12:09.641275
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e1b4c6f207'
+down_revision = 'c5d2f7a8e903'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('participant_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.execute(
+        sa.text(
+            "UPDATE tournaments SET participant_count = ("
+            "SELECT COUNT(*) FROM tournament_participants "
+            "WHERE tournament_participants.tournament_id = tournaments.id)"
+        )
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.drop_column('participant_count')
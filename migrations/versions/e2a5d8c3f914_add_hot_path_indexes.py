@@ -0,0 +1,81 @@
+"""add hot path indexes
+
+Revision ID: e2a5d8c3f914
+Revises: b7e3c9d14a60
+Create Date: 2026-10-16 12:41:50.392775
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2a5d8c3f914'
+down_revision = 'b7e3c9d14a60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.create_index('ix_tournaments_start_at_id', ['start_at', 'id'], unique=False)
+
+    with op.batch_alter_table('tournament_participants', schema=None) as batch_op:
+        batch_op.create_index('ix_participants_tournament_user', ['tournament_id', 'user_id'], unique=False)
+        batch_op.create_index('ix_participants_user_id', ['user_id'], unique=False)
+
+    _drop_duplicate_positions(op.get_bind())
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_match_position', ['tournament_id', 'stage', 'round_number', 'bracket_position'])
+        batch_op.create_index(
+            'ix_matches_pending_player_a',
+            ['player_a_id'],
+            unique=False,
+            postgresql_where=sa.text('winner_id IS NULL'),
+            sqlite_where=sa.text('winner_id IS NULL'),
+        )
+        batch_op.create_index(
+            'ix_matches_pending_player_b',
+            ['player_b_id'],
+            unique=False,
+            postgresql_where=sa.text('winner_id IS NULL'),
+            sqlite_where=sa.text('winner_id IS NULL'),
+        )
+
+
+def _drop_duplicate_positions(bind):
+    # Concurrent seeding could create the same bracket slot twice. Keep the
+    # lowest id of each (tournament, stage, round, position), point the
+    # matches feeding a duplicate at the kept one, then delete the rest.
+    rows = bind.execute(
+        sa.text(
+            "SELECT duplicate.id, MIN(kept.id) FROM matches duplicate JOIN matches kept "
+            "ON kept.tournament_id = duplicate.tournament_id "
+            "AND kept.stage = duplicate.stage "
+            "AND kept.round_number = duplicate.round_number "
+            "AND kept.bracket_position = duplicate.bracket_position "
+            "AND kept.id < duplicate.id "
+            "GROUP BY duplicate.id"
+        )
+    ).all()
+    for duplicate_id, kept_id in rows:
+        for column in ('next_match_id', 'loser_next_match_id'):
+            bind.execute(
+                sa.text(f"UPDATE matches SET {column} = :kept WHERE {column} = :duplicate"),
+                {"kept": kept_id, "duplicate": duplicate_id},
+            )
+        bind.execute(sa.text("DELETE FROM matches WHERE id = :id"), {"id": duplicate_id})
+
+
+def downgrade():
+    with op.batch_alter_table('matches', schema=None) as batch_op:
+        batch_op.drop_index('ix_matches_pending_player_b')
+        batch_op.drop_index('ix_matches_pending_player_a')
+        batch_op.drop_constraint('uq_match_position', type_='unique')
+
+    with op.batch_alter_table('tournament_participants', schema=None) as batch_op:
+        batch_op.drop_index('ix_participants_user_id')
+        batch_op.drop_index('ix_participants_tournament_user')
+
+    with op.batch_alter_table('tournaments', schema=None) as batch_op:
+        batch_op.drop_index('ix_tournaments_start_at_id')
@@ -0,0 +1,40 @@
+"""add tournament search vector
+
+Revision ID: f4b8a1e6c025
+Revises: e2a5d8c3f914
+Create Date: 2026-10-16 14:05:12.660318
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b8a1e6c025'
+down_revision = 'e2a5d8c3f914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Full-text search only exists on PostgreSQL; SQLite uses the
+    # in-process index of app/services/search.py.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "ALTER TABLE tournaments ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(discipline, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+        ") STORED"
+    )
+    op.execute(
+        "CREATE INDEX ix_tournaments_search_vector ON tournaments USING GIN (search_vector)"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX ix_tournaments_search_vector")
+    op.execute("ALTER TABLE tournaments DROP COLUMN search_vector")
@@ -1,7 +1,17 @@
+import itertools
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
 import pytest
+from flask import g
 
 from app import create_app
+from app.config import TestingConfig
 from app.extensions import db
+from app.models import Tournament, TournamentParticipant, User
+from app.services.instrumentation import capture_queries
+from app.services.seeding import seed_tournament
 
 
 @pytest.fixture()
@@ -17,3 +27,132 @@ def app():
 @pytest.fixture()
 def client(app):
     return app.test_client()
+
+
+@pytest.fixture()
+def threaded_app(tmp_path, monkeypatch):
+    """An app on a file database: in-memory SQLite shares one connection."""
+    url = TestingConfig.SQLALCHEMY_DATABASE_URI
+    if url.startswith("sqlite") and ":memory:" in url:
+        url = f"sqlite:///{tmp_path / 'threaded.db'}"
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", url)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+
+
+@pytest.fixture()
+def assert_max_queries(app):
+    """``with assert_max_queries(5) as log: client.get(...)`` fails past 5 statements.
+
+    ``log.sql`` holds the statements run inside the block.
+    """
+
+    @contextmanager
+    def _assert(limit: int):
+        with capture_queries() as log:
+            yield log
+        assert log.count <= limit, f"{log.count} queries, expected at most {limit}:\n{log}"
+
+    return _assert
+
+
+@pytest.fixture()
+def make_users():
+    """``make_users(3)`` adds three active users and returns their ids."""
+    numbers = itertools.count(1)
+
+    def _make(count: int, first_name: str = "Player") -> list[int]:
+        users = []
+        for _ in range(count):
+            number = next(numbers)
+            users.append(
+                User(
+                    first_name=first_name,
+                    last_name=str(number),
+                    email=f"{first_name.lower()}{number}@example.com",
+                    password_hash="x",
+                    is_active=True,
+                )
+            )
+        db.session.add_all(users)
+        db.session.commit()
+        return [user.id for user in users]
+
+    return _make
+
+
+@pytest.fixture()
+def make_tournament(make_users):
+    """``make_tournament(8)`` adds a tournament of eight players, seeded.
+
+    Players get their own users (or ``user_ids``) ranked in order; the
+    organizer is a separate user unless ``organizer_id`` is given. With
+    ``seed=False`` the tournament stays a draft.
+    """
+    names = itertools.count(1)
+
+    def _make(
+        num_players: int = 0,
+        *,
+        name: Optional[str] = None,
+        bracket_format: str = "single_elimination",
+        seed: bool = True,
+        organizer_id: Optional[int] = None,
+        user_ids: Optional[Sequence[int]] = None,
+        max_participants: Optional[int] = None,
+        signup_deadline: Optional[datetime] = None,
+        **fields,
+    ) -> int:
+        if organizer_id is None:
+            (organizer_id,) = make_users(1, first_name="Org")
+        if user_ids is None:
+            user_ids = make_users(num_players)
+        signup_deadline = signup_deadline or datetime.utcnow() + timedelta(days=1)
+        tournament = Tournament(
+            organizer_id=organizer_id,
+            name=name or f"Open {next(names)}",
+            discipline=fields.pop("discipline", "tennis"),
+            start_at=signup_deadline + timedelta(days=1),
+            signup_deadline=signup_deadline,
+            max_participants=max_participants or max(len(user_ids), 2),
+            bracket_format=bracket_format,
+            **fields,
+        )
+        db.session.add(tournament)
+        db.session.flush()
+        for ranking, user_id in enumerate(user_ids, start=1):
+            db.session.add(
+                TournamentParticipant(
+                    tournament_id=tournament.id,
+                    user_id=user_id,
+                    license_number=f"LIC-{tournament.id}-{ranking:04d}",
+                    ranking=ranking,
+                )
+            )
+        db.session.commit()
+        if seed:
+            seed_tournament(tournament.id, ignore_deadline=True)
+        return tournament.id
+
+    return _make
+
+
+@pytest.fixture()
+def login(client):
+    """``login(user_id)`` signs the test client in as that user."""
+
+    def _login(user_id: int) -> None:
+        # Requests reuse the fixture's app context, where Flask-Login caches
+        # the user of the previous request
+        g.pop("_login_user", None)
+        with client.session_transaction() as session:
+            session["_user_id"] = str(user_id)
+            session["_fresh"] = True
+
+    return _login
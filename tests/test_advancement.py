@@ -0,0 +1,46 @@
+from app.extensions import db
+from app.models import Match
+from app.services.advancement import advance_winner
+
+
+def test_every_match_but_the_final_points_to_its_successor(app, make_tournament):
+    tournament_id = make_tournament(8)
+
+    matches = Match.query.filter_by(tournament_id=tournament_id).all()
+    by_id = {m.id: m for m in matches}
+
+    final = [m for m in matches if m.next_match_id is None]
+    assert [m.round_number for m in final] == [3]
+    for match in matches:
+        if match.next_match_id is not None:
+            successor = by_id[match.next_match_id]
+            assert successor.round_number == match.round_number + 1
+            assert successor.bracket_position == (match.bracket_position + 1) // 2
+
+
+def test_double_elimination_links_losers(app, make_tournament):
+    tournament_id = make_tournament(4, bracket_format="double_elimination")
+
+    first_round = Match.query.filter_by(tournament_id=tournament_id, stage="main", round_number=1)
+    targets = {m.loser_next_match_id for m in first_round}
+    assert len(targets) == 1
+    assert db.session.get(Match, targets.pop()).stage == "losers"
+
+
+def test_advancement_is_a_single_primary_key_update(app, make_tournament, assert_max_queries):
+    tournament_id = make_tournament(8)
+    match = Match.query.filter_by(
+        tournament_id=tournament_id, round_number=1, bracket_position=2
+    ).one()
+    match.winner_id = match.player_b_id
+    db.session.flush()
+
+    with assert_max_queries(2) as log:
+        advance_winner(match)
+
+    assert all(statement.startswith("UPDATE") for statement in log.sql)
+    match_updates = [s for s in log.sql if s.startswith("UPDATE matches")]
+    assert len(match_updates) == 1
+    assert "WHERE matches.id = ?" in match_updates[0]
+    db.session.commit()
+    assert db.session.get(Match, match.next_match_id).player_b_id == match.winner_id
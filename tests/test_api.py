@@ -0,0 +1,129 @@
+import gzip
+import json
+
+from app.extensions import db
+from app.models import Match
+from app.services.advancement import advance_winner
+from app.services.seeding import seed_tournament
+
+
+def test_tournament_field_selection(client, make_tournament):
+    tournament_id = make_tournament(4, name="Api Open", seed=False)
+
+    full = client.get(f"/api/v1/tournaments/{tournament_id}").get_json()
+    assert full["name"] == "Api Open"
+    assert full["participant_count"] == 4
+
+    response = client.get(f"/api/v1/tournaments/{tournament_id}?fields=id,name")
+    assert response.get_json() == {"id": tournament_id, "name": "Api Open"}
+
+    response = client.get(f"/api/v1/tournaments/{tournament_id}?fields=id,password")
+    assert response.status_code == 400
+    assert "password" in response.get_json()["message"]
+
+    assert client.get("/api/v1/tournaments/999").status_code == 404
+    assert client.get("/api/v1/tournaments/999").get_json()["error"] == "Not Found"
+
+
+def test_listing_pages_with_cursor_and_fields(client, make_tournament):
+    for index in range(3):
+        make_tournament(2, name=f"Listed {index}", seed=False)
+
+    first = client.get("/api/v1/tournaments?limit=2&fields=id,name").get_json()
+    assert [set(item) for item in first["items"]] == [{"id", "name"}] * 2
+    assert "fields=id,name" in first["links"]["next"]
+
+    second = client.get(first["links"]["next"]).get_json()
+    assert [item["name"] for item in second["items"]] == ["Listed 2"]
+    assert second["links"]["next"] is None
+
+
+def test_compact_bracket(client, make_tournament, assert_max_queries):
+    tournament_id = make_tournament(4, seed=False)
+    draft = client.get(f"/api/v1/tournaments/{tournament_id}/bracket").get_json()
+    assert draft["status"] == "draft"
+    assert draft["matches"]["rows"] == []
+
+    assert seed_tournament(tournament_id, ignore_deadline=True)
+    with assert_max_queries(3):
+        bracket = client.get(f"/api/v1/tournaments/{tournament_id}/bracket").get_json()
+
+    columns = bracket["matches"]["columns"]
+    assert columns[:4] == ["id", "stage", "round_number", "bracket_position"]
+    rows = [dict(zip(columns, row)) for row in bracket["matches"]["rows"]]
+    assert len(rows) == Match.query.filter_by(tournament_id=tournament_id).count()
+    assert all(isinstance(row, list) for row in bracket["matches"]["rows"])
+    players = {row[0] for row in bracket["players"]["rows"]}
+    assert {row["player_a_id"] for row in rows if row["round_number"] == 1} <= players
+
+
+def test_bracket_etag_follows_version(client, make_tournament):
+    tournament_id = make_tournament(4)
+    url = f"/api/v1/tournaments/{tournament_id}/bracket"
+
+    response = client.get(url)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+    match = (
+        Match.query.filter_by(tournament_id=tournament_id, round_number=1)
+        .order_by(Match.bracket_position)
+        .first()
+    )
+    match.winner_id = match.player_a_id
+    advance_winner(match)
+    db.session.commit()
+
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_matches_and_participants(client, make_tournament):
+    tournament_id = make_tournament(4)
+
+    participants = client.get(
+        f"/api/v1/tournaments/{tournament_id}/participants?fields=id,ranking"
+    ).get_json()["items"]
+    assert [p["ranking"] for p in participants] == [1, 2, 3, 4]
+    assert set(participants[0]) == {"id", "ranking"}
+
+    matches = client.get(f"/api/v1/tournaments/{tournament_id}/matches").get_json()["items"]
+    first = matches[0]
+    response = client.get(f"/api/v1/matches/{first['id']}?fields=id,winner_id")
+    assert response.get_json() == {"id": first["id"], "winner_id": first["winner_id"]}
+    etag = response.headers["ETag"]
+    again = client.get(
+        f"/api/v1/matches/{first['id']}?fields=id,winner_id", headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304
+
+
+def test_gzip_for_large_bodies(client, make_tournament):
+    tournament_id = make_tournament(2, description="A" * 2000, seed=False)
+    url = f"/api/v1/tournaments/{tournament_id}"
+
+    plain = client.get(url)
+    assert "Content-Encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["Vary"]
+
+    compressed = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert len(compressed.data) < len(plain.data)
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+    # The weak ETag is shared by both encodings
+    assert compressed.headers["ETag"] == plain.headers["ETag"]
+    revalidated = client.get(
+        url, headers={"Accept-Encoding": "gzip", "If-None-Match": plain.headers["ETag"]}
+    )
+    assert revalidated.status_code == 304
+
+    small = client.get(f"{url}?fields=id", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers
+
+
+def test_openapi_document(client):
+    spec = client.get("/api/v1/openapi.json").get_json()
+    assert set(spec["components"]["schemas"]) == {"Tournament", "Participant", "Match"}
+    assert "/api/v1/tournaments/{tournament_id}/bracket" in spec["paths"]
@@ -0,0 +1,186 @@
+
+
+from app.extensions import bracket_events, db
+from app.models import Match, Tournament
+from app.services.batch_results import (
+    ALREADY_DECIDED,
+    DUPLICATE,
+    INVALID_WINNER,
+    NOT_FOUND,
+    NOT_READY,
+    RECORDED,
+    REJECTED,
+    UNCHANGED,
+    VALID,
+    ResultRow,
+    apply_results,
+)
+from app.services.bracket_events import channel
+
+
+def _round(tournament_id: int, round_number: int) -> list[Match]:
+    return (
+        Match.query.filter_by(tournament_id=tournament_id, stage="main", round_number=round_number)
+        .order_by(Match.bracket_position)
+        .all()
+    )
+
+
+def test_rows_are_applied_in_dependency_order(app, make_tournament, assert_max_queries):
+    tournament_id = make_tournament(8)
+    version = db.session.get(Tournament, tournament_id).bracket_version
+    first_round = _round(tournament_id, 1)
+    second_round = _round(tournament_id, 2)
+
+    # Second-round results come first on the sheet, before their players are known
+    rows = [ResultRow(match.id, "a") for match in second_round] + [
+        ResultRow(match.id, match.player_b_id) for match in first_round
+    ]
+    with assert_max_queries(6):
+        result = apply_results(tournament_id, rows)
+
+    assert result.applied
+    assert [outcome.status for outcome in result.outcomes] == [RECORDED] * 6
+    db.session.expire_all()
+    for match in _round(tournament_id, 2):
+        assert match.player_a_id is not None and match.player_b_id is not None
+        assert match.winner_id == match.player_a_id
+    final = _round(tournament_id, 3)[0]
+    assert {final.player_a_id, final.player_b_id} == {m.winner_id for m in second_round}
+    tournament = db.session.get(Tournament, tournament_id)
+    assert tournament.status == Tournament.STATUS_RUNNING
+    assert tournament.bracket_version == version + 1
+
+
+def test_invalid_row_rejects_the_batch_unless_partial(app, make_tournament):
+    tournament_id = make_tournament(4)
+    first, second = _round(tournament_id, 1)
+    rows = [ResultRow(first.id, first.player_a_id), ResultRow(second.id, first.player_b_id)]
+
+    result = apply_results(tournament_id, rows)
+    assert not result.applied
+    assert [o.status for o in result.outcomes] == [REJECTED, INVALID_WINNER]
+    assert db.session.get(Match, first.id).winner_id is None
+
+    result = apply_results(tournament_id, rows, partial=True)
+    assert result.applied
+    assert [o.status for o in result.outcomes] == [RECORDED, INVALID_WINNER]
+    assert db.session.get(Match, first.id).winner_id == first.player_a_id
+
+
+def test_row_outcomes(app, make_tournament):
+    tournament_id = make_tournament(4)
+    first, second = _round(tournament_id, 1)
+    final = _round(tournament_id, 2)[0]
+    apply_results(tournament_id, [ResultRow(first.id, "a")])
+
+    result = apply_results(
+        tournament_id,
+        [
+            ResultRow(first.id, "a"),
+            ResultRow(first.id, "b"),
+            ResultRow(second.id, "b"),
+            ResultRow(final.id, "a"),
+            ResultRow(999, "a"),
+        ],
+        partial=True,
+    )
+    assert [o.status for o in result.outcomes] == [
+        UNCHANGED,
+        DUPLICATE,
+        RECORDED,
+        RECORDED,
+        NOT_FOUND,
+    ]
+
+    result = apply_results(tournament_id, [ResultRow(first.id, "b")], dry_run=True)
+    assert result.outcomes[0].status == ALREADY_DECIDED
+
+
+def test_dry_run_and_unknown_players(app, make_tournament):
+    tournament_id = make_tournament(4)
+    first, _second = _round(tournament_id, 1)
+    final = _round(tournament_id, 2)[0]
+
+    result = apply_results(
+        tournament_id, [ResultRow(first.id, "a"), ResultRow(final.id, "a")], dry_run=True
+    )
+    assert [o.status for o in result.outcomes] == [VALID, NOT_READY]
+    assert not result.applied
+    assert db.session.get(Match, first.id).winner_id is None
+
+
+def test_final_completes_the_tournament(app, make_tournament):
+    tournament_id = make_tournament(4)
+    rows = [ResultRow(match.id, "a") for match in _round(tournament_id, 1)]
+    rows.append(ResultRow(_round(tournament_id, 2)[0].id, "b"))
+
+    result = apply_results(tournament_id, rows)
+    assert result.applied
+    assert db.session.get(Tournament, tournament_id).status == Tournament.STATUS_COMPLETED
+
+
+def test_live_viewers_get_one_event_per_result(app, make_tournament):
+    tournament_id = make_tournament(4)
+    first, second = _round(tournament_id, 1)
+    subscription = bracket_events.broker.subscribe(channel(tournament_id))
+
+    version = db.session.get(Tournament, tournament_id).bracket_version
+    apply_results(tournament_id, [ResultRow(first.id, "a"), ResultRow(second.id, "a")])
+    messages = [subscription.get(0.1) for _ in range(2)]
+    subscription.close()
+    assert all(f'"match_id":{match.id}' in "".join(messages) for match in (first, second))
+    # One version for the whole batch: viewers apply both events in place
+    assert all(f'"bracket_version":{version + 1}' in message for message in messages)
+
+
+def test_results_endpoint(client, make_tournament, login):
+    tournament_id = make_tournament(4)
+    organizer_id = db.session.get(Tournament, tournament_id).organizer_id
+    first, second = _round(tournament_id, 1)
+    url = f"/tournaments/{tournament_id}/results"
+
+    login(first.player_a.user_id)
+    assert client.post(url, json={"results": []}).status_code == 403
+
+    login(organizer_id)
+    assert client.post(url, json={"results": [{"match_id": first.id}]}).status_code == 400
+    response = client.post(
+        url, json={"results": [{"match_id": first.id, "winner": second.player_a_id}]}
+    )
+    assert response.status_code == 422
+    assert response.get_json()["results"][0]["status"] == INVALID_WINNER
+
+    response = client.post(
+        url,
+        json={
+            "results": [
+                {"match_id": first.id, "winner": "a"},
+                {"match_id": second.id, "winner": str(second.player_b_id)},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["applied"] is True
+    assert body["counts"] == {RECORDED: 2}
+
+
+def test_enter_results_command(app, make_tournament):
+    tournament_id = make_tournament(4)
+    first, second = _round(tournament_id, 1)
+    sheet = f"match_id,winner\n# morning session\n{first.id},a\n{second.id},{second.player_b_id}\n"
+
+    runner = app.test_cli_runner()
+    result = runner.invoke(args=["enter-results", str(tournament_id), "--dry-run"], input=sheet)
+    assert result.exit_code == 0
+    assert "Not applied: 2 valid." in result.output
+
+    result = runner.invoke(args=["enter-results", str(tournament_id)], input=sheet)
+    assert result.exit_code == 0, result.output
+    assert f"match {first.id}: recorded" in result.output
+    assert "Applied: 2 recorded." in result.output
+
+    result = runner.invoke(args=["enter-results", str(tournament_id)], input=f"{first.id},b\n")
+    assert result.exit_code == 1
+    assert "already_decided" in result.output
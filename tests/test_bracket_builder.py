@@ -0,0 +1,68 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Match, Tournament, TournamentParticipant, User
+from app.services.bracket_builder import build_rows
+from app.services.bracket_engine import SingleElimination, seed_order
+from app.services.seeding import seed_tournament
+
+
+def test_seed_order_keeps_top_seeds_apart():
+    assert seed_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+
+
+def test_byes_are_resolved_up_front():
+    rows = build_rows(1, SingleElimination().build([101, 102, 103, 104, 105, 106]))
+
+    by_round: dict[int, list[dict]] = {}
+    for row in rows:
+        by_round.setdefault(row["round_number"], []).append(row)
+
+    assert [len(by_round[r]) for r in sorted(by_round)] == [4, 2, 1]
+    # Seeds 1 and 2 get the byes and already sit in their round 2 slots.
+    byes = [row for row in by_round[1] if row["player_b_id"] is None]
+    assert [row["winner_id"] for row in byes] == [101, 102]
+    assert by_round[2][0]["player_a_id"] == 101
+    assert by_round[2][1]["player_a_id"] == 102
+    assert by_round[3][0]["player_a_id"] is None
+
+
+def test_seeding_4096_players_takes_well_under_a_second(app):
+    now = datetime.utcnow()
+    organizer = User(first_name="Org", last_name="User", email="org@example.com", password_hash="x")
+    db.session.add(organizer)
+    db.session.flush()
+    tournament = Tournament(
+        organizer_id=organizer.id,
+        name="Mega Open",
+        discipline="chess",
+        start_at=now + timedelta(days=2),
+        signup_deadline=now - timedelta(days=1),
+        max_participants=4096,
+    )
+    db.session.add(tournament)
+    db.session.flush()
+    db.session.execute(
+        insert(TournamentParticipant),
+        [
+            {
+                "tournament_id": tournament.id,
+                "user_id": organizer.id,
+                "license_number": f"LIC-{ranking}",
+                "ranking": ranking,
+                "status": "pending",
+            }
+            for ranking in range(1, 4097)
+        ],
+    )
+    db.session.commit()
+
+    started = time.perf_counter()
+    assert seed_tournament(tournament.id)
+    elapsed = time.perf_counter() - started
+
+    assert Match.query.filter_by(tournament_id=tournament.id).count() == 4095
+    assert elapsed < 1.0, f"seeding 4096 players took {elapsed:.3f}s"
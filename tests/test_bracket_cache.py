@@ -0,0 +1,85 @@
+from app.extensions import db
+from app.models import Match, Tournament
+from app.services.advancement import advance_winner
+from app.services.seeding import seed_tournament
+
+
+def _confirm_first_match(tournament_id: int) -> None:
+    match = (
+        Match.query.filter_by(tournament_id=tournament_id, round_number=1)
+        .order_by(Match.bracket_position)
+        .first()
+    )
+    match.winner_id = match.player_a_id
+    advance_winner(match)
+    db.session.commit()
+
+
+def _version(tournament_id: int) -> int:
+    return db.session.get(Tournament, tournament_id).bracket_version
+
+
+def test_seeding_and_results_bump_the_bracket_version(app, make_tournament):
+    tournament_id = make_tournament(4, seed=False)
+    assert _version(tournament_id) == 0
+
+    seed_tournament(tournament_id, ignore_deadline=True)
+    assert _version(tournament_id) == 1
+
+    _confirm_first_match(tournament_id)
+    assert _version(tournament_id) == 2
+
+
+def test_bracket_json_revalidates_on_version(app, client, make_tournament):
+    tournament_id = make_tournament(4)
+
+    first = client.get(f"/tournaments/{tournament_id}/bracket.json")
+    assert first.status_code == 200
+    assert first.json["version"] == 1
+    assert [len(r["matches"]) for r in first.json["stages"][0]["rounds"]] == [2, 1]
+
+    etag = first.headers["ETag"]
+    repeat = client.get(
+        f"/tournaments/{tournament_id}/bracket.json", headers={"If-None-Match": etag}
+    )
+    assert repeat.status_code == 304
+    assert repeat.data == b""
+
+    _confirm_first_match(tournament_id)
+    changed = client.get(
+        f"/tournaments/{tournament_id}/bracket.json", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json["stages"][0]["rounds"][1]["matches"][0]["player_a"]["ranking"] == 1
+
+
+def test_detail_page_reuses_the_rendered_bracket(app, client, make_tournament, assert_max_queries):
+    tournament_id = make_tournament(8)
+
+    first = client.get(f"/tournaments/{tournament_id}")
+    etag = first.headers["ETag"]
+    assert client.get(
+        f"/tournaments/{tournament_id}", headers={"If-None-Match": etag}
+    ).status_code == 304
+
+    with assert_max_queries(3) as log:
+        again = client.get(f"/tournaments/{tournament_id}")
+    assert again.get_data() == first.get_data()
+    assert not any("FROM matches" in statement for statement in log.sql)
+
+    _confirm_first_match(tournament_id)
+    changed = client.get(f"/tournaments/{tournament_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert "Winner: #1" in changed.get_data(as_text=True)
+
+
+def test_players_see_their_report_forms(app, client, make_tournament, login):
+    tournament_id = make_tournament(4)
+    client.get(f"/tournaments/{tournament_id}")
+
+    login(db.session.get(Tournament, tournament_id).participants[0].user_id)
+
+    response = client.get(f"/tournaments/{tournament_id}")
+    assert "match-report-form" in response.get_data(as_text=True)
+    assert "ETag" not in response.headers
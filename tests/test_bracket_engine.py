@@ -0,0 +1,83 @@
+import pytest
+
+from app.extensions import db
+from app.models import Match, Tournament
+from app.services.advancement import advance_winner
+from app.services.bracket_engine import (
+    DoubleElimination,
+    RoundRobin,
+    SingleElimination,
+    Swiss,
+    simulate,
+)
+
+
+def _played(specs):
+    return [s for s in specs if s.player_a is not None and s.player_b is not None]
+
+
+@pytest.mark.parametrize("count", [2, 3, 5, 8, 13])
+def test_elimination_formats_play_to_a_single_champion(count):
+    seeds = list(range(1, count + 1))
+
+    single = simulate(SingleElimination(), seeds)
+    double = simulate(DoubleElimination(), seeds)
+
+    assert len(_played(single)) == count - 1
+    # Everybody but the champion loses twice, without a bracket reset.
+    assert len(_played(double)) == 2 * count - 2
+    assert double[-1].stage == "final"
+    assert double[-1].winner == 1
+
+
+def test_round_robin_pairs_everyone_once():
+    specs = RoundRobin().build(list(range(1, 8)))
+
+    pairs = {frozenset((s.player_a, s.player_b)) for s in specs}
+    assert len(specs) == len(pairs) == 21
+    assert max(s.round_number for s in specs) == 7
+
+
+def test_swiss_avoids_rematches_and_gives_one_bye_each():
+    specs = simulate(Swiss(), list(range(1, 10)), pick_winner=lambda s: s.player_b)
+
+    assert max(s.round_number for s in specs) == 4
+    pairs = [frozenset((s.player_a, s.player_b)) for s in _played(specs)]
+    assert len(pairs) == len(set(pairs))
+    byes = [s.winner for s in specs if s.player_b is None]
+    assert len(byes) == len(set(byes)) == 4
+
+
+def _play_all(tournament_id: int) -> None:
+    while True:
+        match = (
+            Match.query.filter(
+                Match.tournament_id == tournament_id,
+                Match.winner_id.is_(None),
+                Match.player_a_id.isnot(None),
+                Match.player_b_id.isnot(None),
+            )
+            .order_by(Match.id.asc())
+            .first()
+        )
+        if match is None:
+            return
+        match.winner_id = match.player_a_id
+        advance_winner(match)
+        db.session.commit()
+
+
+@pytest.mark.parametrize(
+    ("bracket_format", "expected_matches"),
+    [("double_elimination", 14), ("swiss", 12), ("round_robin", 28)],
+)
+def test_formats_are_played_through_the_database(
+    app, make_tournament, bracket_format, expected_matches
+):
+    tournament_id = make_tournament(8, bracket_format=bracket_format)
+
+    _play_all(tournament_id)
+
+    assert Match.query.filter_by(tournament_id=tournament_id).count() == expected_matches
+    assert Match.query.filter_by(tournament_id=tournament_id, winner_id=None).count() == 0
+    assert db.session.get(Tournament, tournament_id).status == Tournament.STATUS_COMPLETED
@@ -0,0 +1,171 @@
+import json
+
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import bracket_events, db
+from app.models import Match, Tournament
+from app.services.advancement import advance_winner
+from app.services.bracket_events import LocalBroker, channel, publish_after_commit
+from app.services.seeding import seed_tournament
+
+
+@pytest.fixture()
+def events_app(monkeypatch):
+    monkeypatch.setattr(TestingConfig, "EVENTS_KEEPALIVE", 0.05)
+    monkeypatch.setattr(TestingConfig, "EVENTS_STREAM_TIMEOUT", 5)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def _confirm_first_match(tournament_id: int) -> Match:
+    match = (
+        Match.query.filter_by(tournament_id=tournament_id, round_number=1)
+        .order_by(Match.bracket_position)
+        .first()
+    )
+    match.winner_id = match.player_a_id
+    advance_winner(match)
+    db.session.commit()
+    return match
+
+
+def _next_event(chunks) -> tuple[str, dict]:
+    for chunk in chunks:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if text.startswith(":"):
+            continue  # keepalive
+        lines = dict(
+            line.split(": ", 1)
+            for line in text.strip().splitlines()
+            if not line.startswith("retry")
+        )
+        return lines["event"], json.loads(lines["data"])
+    raise AssertionError("stream ended")
+
+
+def test_local_broker_fan_out():
+    broker = LocalBroker(max_pending=1)
+    first, second = broker.subscribe("t:1"), broker.subscribe("t:1")
+    other = broker.subscribe("t:2")
+
+    assert broker.publish("t:1", "hello") == 2
+    assert first.get(0.1) == "hello" and second.get(0.1) == "hello"
+    assert other.get(0.01) is None
+
+    # A viewer that falls behind loses messages and is told to reload
+    broker.publish("t:1", "one")
+    broker.publish("t:1", "two")
+    assert first.overflowed
+
+    first.close()
+    second.close()
+    assert broker.subscribers("t:1") == 0
+
+
+def test_events_are_published_on_commit_only(events_app):
+    subscription = bracket_events.broker.subscribe(channel(7))
+    publish_after_commit(db.session, 7, {"type": "match"})
+    db.session.rollback()
+    assert subscription.get(0.01) is None
+
+    publish_after_commit(db.session, 7, {"type": "match"})
+    db.session.commit()
+    assert json.loads(subscription.get(0.1)) == {"tournament_id": 7, "type": "match"}
+    subscription.close()
+
+
+def test_stream_pushes_confirmed_results(events_app, make_tournament):
+    tournament_id = make_tournament(4)
+    version = db.session.get(Tournament, tournament_id).bracket_version
+
+    response = events_app.test_client().get(
+        f"/tournaments/{tournament_id}/events", buffered=False
+    )
+    assert response.mimetype == "text/event-stream"
+    chunks = iter(response.response)
+    assert _next_event(chunks) == ("ready", {"version": version})
+
+    match = _confirm_first_match(tournament_id)
+    name, payload = _next_event(chunks)
+    assert name == "bracket"
+    assert payload["type"] == "match"
+    assert payload["match_id"] == match.id
+    assert payload["winner_id"] == match.player_a_id
+    assert payload["bracket_version"] == version + 1
+    assert payload["advanced"] == [
+        {
+            "match_id": match.next_match_id,
+            "slot": match.next_slot,
+            "participant_id": match.winner_id,
+        }
+    ]
+    assert payload["reload"] is False
+
+    response.close()
+    assert bracket_events.broker.subscribers(channel(tournament_id)) == 0
+
+
+def test_stream_for_unknown_tournament(events_app):
+    assert events_app.test_client().get("/tournaments/999/events").status_code == 404
+    assert bracket_events.broker.subscribers(channel(999)) == 0
+
+
+def test_updates_before_the_stream_opens_show_as_a_version_change(events_app, make_tournament):
+    tournament_id = make_tournament(4)
+    client = events_app.test_client()
+    page = client.get(f"/tournaments/{tournament_id}").get_data(as_text=True)
+    rendered = db.session.get(Tournament, tournament_id).bracket_version
+    assert f'data-version="{rendered}"' in page
+
+    # Published while nobody was subscribed: only the version tells
+    _confirm_first_match(tournament_id)
+    response = client.get(f"/tournaments/{tournament_id}/events", buffered=False)
+    name, payload = _next_event(iter(response.response))
+    assert name == "ready"
+    assert payload["version"] == rendered + 1
+    response.close()
+
+    fragment = client.get(f"/tournaments/{tournament_id}/bracket.html")
+    assert fragment.headers["X-Bracket-Version"] == str(rendered + 1)
+
+
+def test_bracket_fragment(events_app, make_tournament):
+    tournament_id = make_tournament(4, seed=False)
+    client = events_app.test_client()
+    assert client.get(f"/tournaments/{tournament_id}/bracket.html").data == b""
+
+    seed_tournament(tournament_id, ignore_deadline=True)
+    response = client.get(f"/tournaments/{tournament_id}/bracket.html")
+    assert b"match-card" in response.data
+    assert b"<html" not in response.data
+    # What the live updates script patches in place
+    match = Match.query.filter_by(tournament_id=tournament_id, round_number=1).first()
+    body = response.get_data(as_text=True)
+    assert f'data-match-id="{match.id}"' in body
+    assert f'data-participant-id="{match.player_a_id}"' in body
+
+
+def test_streams_beyond_the_worker_limit_are_turned_away(events_app, make_tournament):
+    tournament_id = make_tournament(4)
+    events_app.extensions["bracket_event_streams"].limit = 1
+    client = events_app.test_client()
+    url = f"/tournaments/{tournament_id}/events"
+
+    first = client.get(url, buffered=False)
+    assert first.status_code == 200
+    busy = client.get(url)
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "15"
+    assert busy.get_data(as_text=True) == "retry: 15000\n\n"
+
+    first.close()
+    assert bracket_events.streams.in_use == 0
+    second = client.get(url, buffered=False)
+    assert second.status_code == 200
+    second.close()
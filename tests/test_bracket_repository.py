@@ -0,0 +1,37 @@
+from app.extensions import db
+from app.models import Match
+from app.services.advancement import advance_winner
+from app.services.bracket_repository import load_bracket
+
+
+def _play_rounds(tournament_id: int, rounds: int) -> None:
+    for round_number in range(1, rounds + 1):
+        for match in Match.query.filter_by(tournament_id=tournament_id, round_number=round_number):
+            match.winner_id = match.player_a_id
+            advance_winner(match)
+        db.session.commit()
+
+
+def test_load_bracket_groups_matches_by_round(app, make_tournament):
+    tournament_id = make_tournament(8)
+    _play_rounds(tournament_id, 1)
+    db.session.expunge_all()
+
+    rounds = load_bracket(tournament_id)["main"]
+
+    assert sorted(rounds) == [1, 2, 3]
+    assert [m.bracket_position for m in rounds[1]] == [1, 2, 3, 4]
+    assert all(m.winner is not None for m in rounds[1])
+
+
+def test_detail_page_query_count_is_bounded(app, client, make_tournament, assert_max_queries):
+    tournament_id = make_tournament(64)
+    _play_rounds(tournament_id, 5)
+    db.session.expunge_all()
+
+    with assert_max_queries(5):
+        response = client.get(f"/tournaments/{tournament_id}")
+
+    assert response.status_code == 200
+    assert b"round round-6" in response.data
+    assert b"<h4>Finale</h4>" in response.data
@@ -0,0 +1,75 @@
+from flask import g
+
+from app.extensions import db
+from app.models import Tournament
+from app.services.cache import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used_and_expires():
+    cache = LocalCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+
+    cache.set("d", "4", ttl=-1)
+    assert cache.get("d") is None
+    assert cache.incr("gen") == 1
+    assert cache.incr("gen") == 2
+
+
+def test_anonymous_listing_is_served_without_queries(
+    app, client, make_tournament, assert_max_queries
+):
+    make_tournament(name="Spring Cup", seed=False)
+
+    for url in ("/", "/tournaments/"):
+        first = client.get(url)
+        with assert_max_queries(0):
+            second = client.get(url)
+        assert second.get_data() == first.get_data()
+        assert "Spring Cup" in second.get_data(as_text=True)
+        assert "Cookie" in second.headers["Vary"]
+
+
+def test_logged_in_users_share_the_cached_list(
+    app, client, make_users, make_tournament, login, assert_max_queries
+):
+    (organizer_id,) = make_users(1, first_name="Org")
+    make_tournament(name="Spring Cup", organizer_id=organizer_id, seed=False)
+    client.get("/tournaments/")
+
+    login(organizer_id)
+    # At most the user is loaded; the list itself comes from the cache
+    with assert_max_queries(1) as log:
+        body = client.get("/tournaments/").get_data(as_text=True)
+    assert not any("FROM tournaments" in statement for statement in log.sql)
+    assert "My Dashboard" in body
+    assert "Spring Cup" in body
+
+
+def test_tournament_changes_invalidate_the_listings(
+    app, client, make_users, make_tournament, login
+):
+    (organizer_id,) = make_users(1, first_name="Org")
+    tournament_id = make_tournament(name="Spring Cup", organizer_id=organizer_id, seed=False)
+    assert "Spring Cup" in client.get("/").get_data(as_text=True)
+
+    make_tournament(name="Autumn Cup", organizer_id=organizer_id, seed=False)
+    assert "Autumn Cup" in client.get("/").get_data(as_text=True)
+
+    tournament = db.session.get(Tournament, tournament_id)
+    tournament.name = "Winter Cup"
+    db.session.rollback()
+    assert "Spring Cup" in client.get("/").get_data(as_text=True)
+
+    login(organizer_id)
+    client.post(f"/tournaments/{tournament_id}/delete")
+    with client.session_transaction() as session:
+        session.clear()
+    g.pop("_login_user", None)
+    body = client.get("/").get_data(as_text=True)
+    assert "Spring Cup" not in body
+    assert "Autumn Cup" in body
@@ -0,0 +1,63 @@
+from app.extensions import db
+from app.models import Match, PendingMatch
+from app.services.advancement import advance_winner
+from app.services.dashboard import (
+    pending_matches_query,
+    pending_table_query,
+    rebuild_pending_matches,
+)
+
+
+def test_dashboard_statement_count_does_not_grow_with_matches(
+    app, client, make_users, make_tournament, login, assert_max_queries
+):
+    user_ids = make_users(16)
+    make_tournament(user_ids=user_ids[:4])
+    login(user_ids[0])
+    with assert_max_queries(3) as baseline:
+        assert client.get("/me/").status_code == 200
+
+    for index in range(2, 5):
+        make_tournament(user_ids=user_ids[: 4 * index])
+    # No per-match or per-tournament lazy loads
+    with assert_max_queries(baseline.count):
+        assert client.get("/me/").status_code == 200
+
+
+def _pending_sets(user_ids: list[int]):
+    expected = {
+        user_id: {m.id for m in pending_matches_query(user_id)} for user_id in user_ids
+    }
+    stored = {user_id: {m.id for m in pending_table_query(user_id)} for user_id in user_ids}
+    return expected, stored
+
+
+def test_pending_table_follows_seeding_and_results(app, make_users, make_tournament):
+    app.config["DASHBOARD_PENDING_TABLE"] = True
+    user_ids = make_users(8)
+    tournament_id = make_tournament(user_ids=user_ids)
+
+    expected, stored = _pending_sets(user_ids)
+    assert stored == expected
+    assert sum(len(ids) for ids in stored.values()) == 8
+
+    for round_number in (1, 2, 3):
+        for match in Match.query.filter_by(tournament_id=tournament_id, round_number=round_number):
+            match.winner_id = match.player_b_id
+            advance_winner(match)
+            db.session.commit()
+            expected, stored = _pending_sets(user_ids)
+            assert stored == expected
+
+    assert PendingMatch.query.count() == 0
+
+
+def test_rebuild_backfills_the_pending_table(app, make_users, make_tournament):
+    user_ids = make_users(6)
+    make_tournament(user_ids=user_ids)
+    assert PendingMatch.query.count() == 0
+
+    app.config["DASHBOARD_PENDING_TABLE"] = True
+    assert rebuild_pending_matches() == 4
+    expected, stored = _pending_sets(user_ids)
+    assert stored == expected
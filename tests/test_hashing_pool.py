@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db
+from app.models import User
+from app.services.hashing_pool import HashingBusy, InlineHashing, ProcessHashingPool
+from app.services.passwords import check_password, hash_passwords
+
+
+@pytest.fixture()
+def pool_app(monkeypatch):
+    for name, value in {
+        "PASSWORD_HASH_WORKERS": 1,
+        "PASSWORD_HASH_MAX_PENDING": 1,
+        "PASSWORD_HASH_WAIT": 0.1,
+    }.items():
+        monkeypatch.setattr(TestingConfig, name, value)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions["hashing_executor"].shutdown()
+        db.session.remove()
+        db.drop_all()
+
+
+def test_hashing_is_inline_by_default(app):
+    assert isinstance(app.extensions["hashing_executor"], InlineHashing)
+
+
+def test_passwords_are_hashed_in_the_pool(pool_app):
+    pool = pool_app.extensions["hashing_executor"]
+    assert isinstance(pool, ProcessHashingPool)
+
+    user = User(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    user.set_password("Password123!")
+
+    assert user.verify_password("Password123!")
+    assert not user.verify_password("wrong")
+    assert pool.peak_depth == 1
+    assert pool.depth == 0
+
+
+def test_batch_hashing(pool_app):
+    hashes = hash_passwords(["Password123!"] * 5)
+
+    assert len(set(hashes)) == 5
+    assert all(check_password(stored, "Password123!") == (True, False) for stored in hashes)
+
+
+def test_full_pool_rejects_with_503(pool_app):
+    pool = pool_app.extensions["hashing_executor"]
+    user = User(first_name="Ada", last_name="Lovelace", email="ada@example.com", is_active=True)
+    user.set_password("Password123!")
+    db.session.add(user)
+    db.session.commit()
+    client = pool_app.test_client()
+
+    busy = pool.submit(time.sleep, 1)
+    assert pool.depth == 1
+    with pytest.raises(HashingBusy):
+        pool.submit(time.sleep, 0)
+    response = client.post(
+        "/auth/login", data={"email": "ada@example.com", "password": "Password123!"}
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert pool.rejected == 2
+
+    busy.result()
+    # The slot is given back by a done callback, right after the result
+    deadline = time.monotonic() + 2
+    while pool.depth and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.depth == 0
+    response = client.post(
+        "/auth/login", data={"email": "ada@example.com", "password": "Password123!"}
+    )
+    assert response.status_code == 302
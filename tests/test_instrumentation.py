@@ -0,0 +1,82 @@
+import pytest
+from flask import g
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, sql_instrumentation
+from app.models import Tournament
+
+
+def test_server_timing_header_counts_queries(client):
+    response = client.get("/tournaments/")
+
+    timing = response.headers["Server-Timing"]
+    assert timing.startswith("db;dur=")
+    assert 'queries"' in timing
+    queries = int(timing.split('desc="')[1].split()[0])
+    assert queries > 0
+
+
+def test_stats_are_kept_per_endpoint(app, client):
+    client.get("/tournaments/")
+    client.get("/tournaments/?q=tennis")
+
+    stats = sql_instrumentation.stats.snapshot()["tournaments.list_tournaments"]
+    assert stats["requests"] == 2
+    assert stats["queries"] >= 2
+    assert stats["max_queries"] >= stats["avg_queries"]
+
+
+def test_slow_statements_are_logged_with_parameters(app, client, caplog):
+    app.config["SQL_SLOW_QUERY_MS"] = 0
+    with caplog.at_level("WARNING"):
+        client.get("/tournaments/?q=chess")
+
+    assert "Slow query" in caplog.text
+    assert "tournaments.list_tournaments" in caplog.text
+
+
+@pytest.fixture()
+def debug_app(monkeypatch):
+    monkeypatch.setattr(TestingConfig, "SQL_STATS_ENDPOINT", True, raising=False)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_debug_endpoint(debug_app):
+    client = debug_app.test_client()
+    client.get("/tournaments/")
+
+    stats = client.get("/_debug/sql").get_json()
+    assert stats["tournaments.list_tournaments"]["requests"] == 1
+    assert client.get("/_debug/sql?reset=1").get_json() == {}
+
+
+def test_debug_endpoint_is_off_by_default(client):
+    assert client.get("/_debug/sql").status_code == 404
+
+
+def test_views_issue_a_bounded_number_of_queries(
+    app, client, make_tournament, login, assert_max_queries
+):
+    # Counts must not grow with the number of participants or matches
+    tournament_id = make_tournament(16, name="Instrumented Open")
+    player_id = db.session.get(Tournament, tournament_id).participants[0].user_id
+
+    with assert_max_queries(2):
+        assert client.get("/").status_code == 200
+    with assert_max_queries(3):
+        assert client.get("/tournaments/?q=instrumented").status_code == 200
+    with assert_max_queries(4):
+        assert client.get(f"/tournaments/{tournament_id}").status_code == 200
+
+    login(player_id)
+    with assert_max_queries(6):
+        assert client.get(f"/tournaments/{tournament_id}").status_code == 200
+    g.pop("_login_user", None)
+    with assert_max_queries(4):
+        assert client.get("/me/").status_code == 200
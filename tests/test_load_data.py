@@ -0,0 +1,44 @@
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import Match, Tournament, TournamentParticipant, User
+from app.services.load_data import LoadPlan, generate_load_data
+
+
+def test_seed_load_generates_consistent_data(app):
+    result = generate_load_data(app, LoadPlan(users=300, tournaments=40, chunk_size=15, seed=7))
+
+    assert result.users == User.query.count() == 300
+    assert result.tournaments == Tournament.query.count() == 40
+    assert result.participants == TournamentParticipant.query.count()
+    assert result.matches == Match.query.count() > 0
+
+    counted = dict(
+        db.session.query(TournamentParticipant.tournament_id, func.count())
+        .group_by(TournamentParticipant.tournament_id)
+        .all()
+    )
+    for tournament in Tournament.query:
+        assert tournament.participant_count == counted.get(tournament.id, 0)
+        assert tournament.participant_count <= tournament.max_participants
+        played = Match.query.filter(
+            Match.tournament_id == tournament.id, Match.winner_id.isnot(None)
+        )
+        if tournament.status == Tournament.STATUS_DRAFT:
+            assert not tournament.matches
+        if tournament.status == Tournament.STATUS_COMPLETED:
+            open_matches = Match.query.filter(
+                Match.tournament_id == tournament.id,
+                Match.winner_id.is_(None),
+                Match.player_a_id.isnot(None),
+                Match.player_b_id.isnot(None),
+            )
+            assert open_matches.count() == 0
+            assert played.count() > 0
+
+
+def test_seed_load_is_repeatable(app):
+    first = generate_load_data(app, LoadPlan(users=50, tournaments=5, seed=3))
+    second = generate_load_data(app, LoadPlan(users=50, tournaments=5, seed=3))
+
+    assert (first.participants, first.matches) == (second.participants, second.matches)
@@ -0,0 +1,158 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+from flask_mail import Message
+
+from app import create_app
+from app.config import TestingConfig
+from app.extensions import db, mail_queue
+from app.services.mailer import message_payload
+from app.services.smtp_stub import SMTPStub
+
+
+@pytest.fixture()
+def smtp_stub():
+    with SMTPStub() as stub:
+        yield stub
+
+
+@pytest.fixture()
+def mail_app(smtp_stub, monkeypatch):
+    """An app whose mail goes through the thread queue to the SMTP stub."""
+    for name, value in {
+        "MAIL_QUEUE_BACKEND": "thread",
+        "MAIL_SUPPRESS_SEND": False,
+        "MAIL_SERVER": smtp_stub.host,
+        "MAIL_PORT": smtp_stub.port,
+        "MAIL_BATCH_WINDOW": 0.2,
+        "MAIL_RETRY_BACKOFF": 0.05,
+    }.items():
+        monkeypatch.setattr(TestingConfig, name, value, raising=False)
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        yield app
+        app.extensions["mail_queue"].shutdown(timeout=5)
+        db.session.remove()
+        db.drop_all()
+
+
+def _message(index: int) -> Message:
+    return Message(subject=f"Message {index}", recipients=[f"user{index}@example.com"], body="Hi")
+
+
+def test_registration_does_not_wait_for_the_mail_server(mail_app, smtp_stub):
+    smtp_stub.state.delay = 1.0
+    client = mail_app.test_client()
+
+    started = time.perf_counter()
+    response = client.post(
+        "/auth/register",
+        data={
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "email": "ada@example.com",
+            "password": "Password123!",
+            "confirm": "Password123!",
+        },
+    )
+    elapsed = time.perf_counter() - started
+
+    assert response.status_code == 302
+    assert elapsed < 0.5
+    assert mail_queue.flush(timeout=5)
+    [received] = smtp_stub.messages
+    assert received.recipients == ["ada@example.com"]
+    assert received.subject == "Confirm your account"
+    assert "/auth/confirm/" in received.message.get_payload(decode=True).decode()
+
+
+def test_queued_messages_share_one_connection(mail_app, smtp_stub):
+    mail_app.extensions["mail_queue"].workers = 1
+    mail_queue.send(*(_message(index) for index in range(20)))
+
+    assert mail_queue.flush(timeout=5)
+    assert len(smtp_stub.messages) == 20
+    assert smtp_stub.connections == 1
+
+
+def test_transient_failures_are_retried(mail_app, smtp_stub):
+    smtp_stub.state.fail_connections = 2
+    mail_queue.send(_message(1), _message(2))
+
+    assert mail_queue.flush(timeout=5)
+    assert sorted(m.subject for m in smtp_stub.messages) == ["Message 1", "Message 2"]
+    assert smtp_stub.connections >= 3
+
+
+def test_undeliverable_mail_is_logged(mail_app, smtp_stub, caplog):
+    mail_app.extensions["mail_queue"].max_retries = 1
+    smtp_stub.state.fail_connections = 10
+    mail_queue.send(_message(1))
+
+    with caplog.at_level("INFO"):
+        assert mail_queue.flush(timeout=5)
+    assert smtp_stub.messages == []
+    assert "not delivered" in caplog.text
+
+
+def test_a_bad_message_does_not_poison_its_batch(mail_app, smtp_stub, caplog):
+    dispatcher = mail_app.extensions["mail_queue"]
+    dispatcher.workers = 1
+    payloads = [message_payload(_message(index)) for index in range(3)]
+    # No recipients: building the message fails before anything is sent
+    del payloads[1]["recipients"]
+
+    with caplog.at_level("INFO"):
+        dispatcher.enqueue(payloads)
+        assert mail_queue.flush(timeout=5)
+    assert sorted(m.subject for m in smtp_stub.messages) == ["Message 0", "Message 2"]
+    assert smtp_stub.connections == 1
+    assert "'Message 1' to None not delivered" in caplog.text
+
+
+SENDER = textwrap.dedent(
+    """
+    import sys
+    from flask_mail import Message
+    from app import create_app
+    from app.config import TestingConfig
+    from app.extensions import mail_queue
+
+    TestingConfig.MAIL_QUEUE_BACKEND = "thread"
+    TestingConfig.MAIL_SUPPRESS_SEND = False
+    TestingConfig.MAIL_SERVER = sys.argv[1]
+    TestingConfig.MAIL_PORT = int(sys.argv[2])
+    app = create_app("testing")
+    with app.app_context():
+        for index in range(5):
+            message = Message(subject=f"Message {index}", recipients=["a@example.com"], body="Hi")
+            mail_queue.send(message)
+    # Exit with everything still queued: nothing calls flush() or shutdown()
+    """
+)
+
+
+def test_queued_mail_is_sent_when_the_process_exits(smtp_stub):
+    smtp_stub.state.delay = 0.3
+    subprocess.run(
+        [sys.executable, "-c", SENDER, smtp_stub.host, str(smtp_stub.port)],
+        env=os.environ.copy(),
+        cwd=Path(__file__).resolve().parent.parent,
+        check=True,
+        timeout=30,
+    )
+
+    assert sorted(m.subject for m in smtp_stub.messages) == [f"Message {i}" for i in range(5)]
+
+
+def test_sync_backend_in_tests(app):
+    assert app.config["MAIL_QUEUE_BACKEND"] == "sync"
+    with app.extensions["mail"].record_messages() as outbox:
+        mail_queue.send(_message(1))
+    assert [m.subject for m in outbox] == ["Message 1"]
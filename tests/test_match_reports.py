@@ -0,0 +1,122 @@
+import pytest
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import Match
+from app.services import match_reports
+from app.services.match_reports import report_result
+from app.services.report_load import run_report_load
+
+
+@pytest.fixture()
+def match(app, make_tournament) -> Match:
+    tournament_id = make_tournament(4)
+    return (
+        Match.query.filter_by(tournament_id=tournament_id, round_number=1)
+        .order_by(Match.bracket_position)
+        .first()
+    )
+
+
+def test_double_confirmation(match):
+    a_user, b_user = match.player_a.user_id, match.player_b.user_id
+    match_id, winner_id, loser_id = match.id, match.player_a_id, match.player_b_id
+
+    assert report_result(match_id, a_user, winner_id).outcome == match_reports.RECORDED
+    assert report_result(match_id, b_user, loser_id).outcome == match_reports.MISMATCH
+    assert report_result(match_id, a_user, winner_id).outcome == match_reports.RECORDED
+    result = report_result(match_id, b_user, winner_id)
+    assert result.outcome == match_reports.CONFIRMED
+    assert result.attempts == 1
+
+    match = db.session.get(Match, match_id)
+    assert match.winner_id == winner_id
+    next_match = db.session.get(Match, match.next_match_id)
+    assert getattr(next_match, f"player_{match.next_slot}_id") == winner_id
+    assert report_result(match_id, b_user, winner_id).outcome == match_reports.ALREADY_DECIDED
+
+
+def test_rejected_reports(match):
+    outsider = match.tournament.organizer_id
+    assert report_result(match.id, outsider, match.player_a_id).outcome == match_reports.NOT_PLAYER
+    assert (
+        report_result(match.id, match.player_a.user_id, 999).outcome
+        == match_reports.INVALID_WINNER
+    )
+    assert report_result(999, outsider, 1).outcome == match_reports.NOT_FOUND
+    final = db.session.get(Match, match.next_match_id)
+    assert report_result(final.id, match.player_a.user_id, 1).outcome == match_reports.INCOMPLETE
+
+
+def test_report_that_lost_the_race_retries(match, monkeypatch):
+    """The other player's declaration lands between our read and our write."""
+    match_id, winner_id = match.id, match.player_a_id
+    a_user = match.player_a.user_id
+    read = match_reports._read
+    calls = []
+
+    def racing_read(match_id):
+        row = read(match_id)
+        if not calls:
+            db.session.execute(
+                update(Match)
+                .where(Match.id == match_id)
+                .values(player_b_reported_winner_id=winner_id, version=Match.version + 1)
+            )
+            db.session.commit()
+        calls.append(row)
+        return row
+
+    monkeypatch.setattr(match_reports, "_read", racing_read)
+    result = report_result(match_id, a_user, winner_id)
+
+    # Without the version check player A would have written over B's
+    # declaration and left the match waiting forever
+    assert result.attempts == 2
+    assert result.outcome == match_reports.CONFIRMED
+    assert db.session.get(Match, match_id).winner_id == winner_id
+
+
+def test_contention_gives_up_after_retries(match, monkeypatch):
+    read = match_reports._read
+
+    def always_stale(match_id):
+        row = read(match_id)
+        db.session.execute(
+            update(Match).where(Match.id == match_id).values(version=Match.version + 1)
+        )
+        return row
+
+    monkeypatch.setattr(match_reports, "_read", always_stale)
+    result = report_result(match.id, match.player_a.user_id, match.player_a_id, retries=2)
+    assert result.outcome == match_reports.BUSY
+    assert result.attempts == 3
+    assert db.session.get(Match, match.id).player_a_reported_winner_id is None
+
+
+def test_report_route(match, client, login):
+    login(match.player_a.user_id)
+
+    url = f"/tournaments/matches/{match.id}/report"
+    assert client.post(url, data={"winner_id": "x"}).status_code == 400
+    assert client.post(url, data={"winner_id": "999"}).status_code == 400
+    assert (
+        client.post("/tournaments/matches/999/report", data={"winner_id": "1"}).status_code == 404
+    )
+
+    response = client.post(url, data={"winner_id": str(match.player_a_id)})
+    assert response.status_code == 302
+    assert response.headers["Location"].endswith(f"/tournaments/{match.tournament_id}")
+    db.session.expire_all()
+    assert db.session.get(Match, match.id).player_a_reported_winner_id == match.player_a_id
+
+
+def test_simultaneous_reports_lose_no_updates(threaded_app):
+    report = run_report_load(threaded_app, matches=16, threads=8)
+    print(report.summary())
+
+    assert report.errors == 0
+    assert report.outcomes == {match_reports.RECORDED: 16, match_reports.CONFIRMED: 16}
+    assert report.lost_updates == 0
+    assert report.advanced == 16
+    assert report.per_second > 0
@@ -0,0 +1,156 @@
+import os
+import subprocess
+import sys
+import textwrap
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+from app import create_app  # noqa: E402
+from app.config import TestingConfig  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Tournament, TournamentParticipant, User  # noqa: E402
+from app.services.seeding import seed_tournament  # noqa: E402
+
+REGISTRY = prometheus_client.REGISTRY
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_request_latency_per_endpoint(client):
+    labels = {
+        "blueprint": "tournaments",
+        "endpoint": "tournaments.list_tournaments",
+        "method": "GET",
+        "status": "200",
+    }
+    before = _sample("http_request_duration_seconds_count", **labels)
+    client.get("/tournaments/")
+    client.get("/tournaments/?q=tennis")
+
+    assert _sample("http_request_duration_seconds_count", **labels) == before + 2
+    body = client.get("/metrics").get_data(as_text=True)
+    assert 'http_request_duration_seconds_bucket{blueprint="tournaments"' in body
+    assert "db_pool_checkouts_total" in body
+    assert "db_pool_connect_seconds_count" in body
+    assert "mail_queue_depth" in body
+    assert "password_hash_queue_depth" in body
+
+
+def test_cache_hits_and_misses(client):
+    misses = _sample("cache_requests_total", namespace="listings", result="miss")
+    hits = _sample("cache_requests_total", namespace="listings", result="hit")
+    client.get("/tournaments/?q=cached")
+    client.get("/tournaments/?q=cached")
+
+    assert _sample("cache_requests_total", namespace="listings", result="miss") > misses
+    assert _sample("cache_requests_total", namespace="listings", result="hit") > hits
+
+
+def test_row_lock_waits_are_timed(app):
+    organizer = User(first_name="Org", last_name="User", email="org@example.com", password_hash="x")
+    db.session.add(organizer)
+    db.session.flush()
+    now = datetime.utcnow()
+    tournament = Tournament(
+        organizer_id=organizer.id,
+        name="Locked Open",
+        discipline="tennis",
+        start_at=now + timedelta(days=2),
+        signup_deadline=now + timedelta(days=1),
+        max_participants=2,
+    )
+    db.session.add(tournament)
+    db.session.flush()
+    for ranking in (1, 2):
+        db.session.add(
+            TournamentParticipant(
+                tournament_id=tournament.id,
+                user_id=organizer.id,
+                license_number=f"LIC-{ranking}",
+                ranking=ranking,
+            )
+        )
+    db.session.commit()
+
+    before = _sample("db_row_lock_wait_seconds_count", site="seeding")
+    assert seed_tournament(tournament.id, ignore_deadline=True)
+    assert _sample("db_row_lock_wait_seconds_count", site="seeding") == before + 1
+
+
+def test_pool_instrumentation_survives_dispose(app):
+    db.engine.dispose()
+    checkouts = _sample("db_pool_checkouts_total")
+    connects = _sample("db_pool_connect_seconds_count")
+    with db.engine.connect() as connection:
+        connection.exec_driver_sql("SELECT 1")
+
+    assert _sample("db_pool_checkouts_total") == checkouts + 1
+    assert _sample("db_pool_connect_seconds_count") == connects + 1
+
+
+def test_metrics_can_be_disabled(app, monkeypatch):
+    monkeypatch.setattr(TestingConfig, "METRICS_ENABLED", False, raising=False)
+    disabled = create_app("testing")
+    assert disabled.test_client().get("/metrics").status_code == 404
+
+
+def test_metrics_token(app, monkeypatch):
+    monkeypatch.setattr(TestingConfig, "METRICS_TOKEN", "s3cret", raising=False)
+    client = create_app("testing").test_client()
+
+    assert client.get("/metrics").status_code == 401
+    wrong = client.get("/metrics", headers={"Authorization": "Bearer nope"})
+    assert wrong.status_code == 401
+    scrape = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert scrape.status_code == 200
+    assert "http_request_duration_seconds" in scrape.get_data(as_text=True)
+
+
+WORKER = textwrap.dedent(
+    """
+    import sys
+    from app import create_app
+    from app.extensions import db
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+    client = app.test_client()
+    for _ in range(int(sys.argv[1])):
+        client.get("/tournaments/")
+    if sys.argv[2] == "scrape":
+        sys.stdout.write(client.get("/metrics").get_data(as_text=True))
+    """
+)
+
+
+def test_metrics_are_aggregated_across_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+    def worker(requests: int, mode: str) -> str:
+        return subprocess.run(
+            [sys.executable, "-c", WORKER, str(requests), mode],
+            env=env,
+            cwd=Path(__file__).resolve().parent.parent,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    worker(3, "quiet")
+    worker(2, "quiet")
+    body = worker(0, "scrape")
+
+    line = next(
+        line
+        for line in body.splitlines()
+        if line.startswith("http_request_duration_seconds_count")
+        and 'endpoint="tournaments.list_tournaments"' in line
+    )
+    assert float(line.rsplit(" ", 1)[1]) == 5
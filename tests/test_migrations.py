@@ -0,0 +1,88 @@
+import importlib.util
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import delete, select
+
+from app.extensions import db
+from app.models import Match, Tournament, TournamentParticipant
+
+VERSIONS = Path(__file__).resolve().parent.parent / "migrations" / "versions"
+
+
+def _revision(prefix: str):
+    path = next(VERSIONS.glob(f"{prefix}_*.py"))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _migrate(module, *steps: str) -> None:
+    """Run ``module``'s upgrade/downgrade steps against the test database."""
+    db.session.commit()
+    with db.engine.begin() as connection:
+        with Operations.context(MigrationContext.configure(connection)):
+            for step in steps:
+                getattr(module, step)()
+    db.session.expire_all()
+
+
+def test_bracket_shape_backfill_on_half_played_legacy_bracket(app, make_users, make_tournament):
+    tournament_id = make_tournament(4)
+    pool_id = make_tournament(5, bracket_format="round_robin")
+    (late_id,) = make_users(1)
+    db.session.add(
+        TournamentParticipant(
+            tournament_id=tournament_id,
+            user_id=late_id,
+            license_number="LIC-LATE",
+            ranking=5,
+            status=TournamentParticipant.STATUS_WAITLISTED,
+        )
+    )
+    # Legacy brackets created each round once the previous one was over:
+    # round 1 is in, the final does not exist yet
+    db.session.execute(
+        delete(Match).where(Match.tournament_id == tournament_id, Match.round_number > 1)
+    )
+    db.session.commit()
+
+    _migrate(_revision("9c4e7b2a5d31"), "downgrade", "upgrade")
+
+    tournament = db.session.get(Tournament, tournament_id)
+    assert (tournament.bracket_size, tournament.total_rounds) == (4, 2)
+    assert tournament.round_label(1) == "Semifinale"
+    pool = db.session.get(Tournament, pool_id)
+    assert (pool.bracket_size, pool.total_rounds) == (5, 5)
+
+
+def test_duplicate_bracket_slots_are_merged_before_the_unique_constraint(app, make_tournament):
+    tournament_id = make_tournament(4)
+    migration = _revision("e2a5d8c3f914")
+    _migrate(migration, "downgrade")
+
+    final = db.session.scalars(
+        select(Match).where(Match.tournament_id == tournament_id, Match.round_number == 2)
+    ).one()
+    duplicate = Match(
+        tournament_id=tournament_id,
+        stage=final.stage,
+        round_number=final.round_number,
+        bracket_position=final.bracket_position,
+    )
+    db.session.add(duplicate)
+    db.session.flush()
+    semifinal = db.session.scalars(
+        select(Match).where(Match.tournament_id == tournament_id, Match.round_number == 1)
+    ).first()
+    semifinal.next_match_id = duplicate.id
+    semifinal_id, final_id = semifinal.id, final.id
+    db.session.commit()
+
+    _migrate(migration, "upgrade")
+
+    matches = db.session.scalars(select(Match).where(Match.tournament_id == tournament_id)).all()
+    assert [match.id for match in matches if match.round_number == 2] == [final_id]
+    assert db.session.get(Match, semifinal_id).next_match_id == final_id
@@ -0,0 +1,78 @@
+import re
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Tournament, User
+from app.services.pagination import keyset_paginate
+
+
+def _make_tournaments(count: int) -> list[int]:
+    now = datetime.utcnow()
+    organizer = User(first_name="Org", last_name="User", email="org@example.com", password_hash="x")
+    db.session.add(organizer)
+    db.session.flush()
+    for index in range(count):
+        db.session.add(
+            Tournament(
+                organizer_id=organizer.id,
+                name=f"Cup {index}",
+                discipline="tennis",
+                # Pairs of tournaments share a start time to exercise the id tiebreak
+                start_at=now + timedelta(days=2 + index // 2),
+                signup_deadline=now + timedelta(days=1),
+                max_participants=8,
+            )
+        )
+    db.session.commit()
+    return [
+        t.id for t in Tournament.query.order_by(Tournament.start_at, Tournament.id).all()
+    ]
+
+
+def _upcoming():
+    return Tournament.query.filter(Tournament.start_at >= datetime.utcnow())
+
+
+def test_walking_forward_and_back_visits_every_row_once(app):
+    expected = _make_tournaments(23)
+
+    pages, cursor = [], None
+    while True:
+        page = keyset_paginate(_upcoming(), cursor, 5)
+        pages.append([t.id for t in page.items])
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+
+    assert [tid for ids in pages for tid in ids] == expected
+    assert page.page == 5
+
+    back = []
+    while page.has_prev:
+        page = keyset_paginate(_upcoming(), page.prev_cursor, 5)
+        back.append([t.id for t in page.items])
+    assert back == pages[-2::-1]
+    assert page.page == 1
+
+
+def test_invalid_cursor_falls_back_to_first_page(app):
+    expected = _make_tournaments(3)
+
+    page = keyset_paginate(_upcoming(), "not-a-cursor", 10)
+
+    assert [t.id for t in page.items] == expected
+    assert not page.has_prev and not page.has_next
+
+
+def test_listing_seeks_instead_of_counting(app, client, assert_max_queries):
+    _make_tournaments(30)
+    first = client.get("/").get_data(as_text=True)
+    next_link = re.search(r'href="(/\?cursor=[^"]+)">Next', first).group(1)
+
+    with assert_max_queries(1) as log:
+        response = client.get(next_link)
+
+    assert response.status_code == 200
+    assert "Page 2" in response.get_data(as_text=True)
+    assert any("(tournaments.start_at, tournaments.id) >" in statement for statement in log.sql)
+    assert not any("count(" in statement.lower() for statement in log.sql)
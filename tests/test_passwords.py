@@ -0,0 +1,81 @@
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models import User
+from app.services.passwords import (
+    Argon2Hasher,
+    Pbkdf2Hasher,
+    calibrate_argon2,
+    check_password,
+)
+
+
+def _user(password_hash: str) -> User:
+    user = User(
+        first_name="Ada",
+        last_name="Lovelace",
+        email="ada@example.com",
+        password_hash=password_hash,
+        is_active=True,
+    )
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def _login(client, password: str):
+    return client.post("/auth/login", data={"email": "ada@example.com", "password": password})
+
+
+def test_new_passwords_use_the_configured_argon2_costs(app):
+    user = User(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    user.set_password("Password123!")
+
+    assert user.password_hash.startswith("$argon2id$v=19$m=1024,t=1,p=1$")
+    assert user.verify_password("Password123!")
+    assert not user.verify_password("wrong")
+
+
+def test_legacy_pbkdf2_hash_is_upgraded_on_login(app, client):
+    user = _user(generate_password_hash("Password123!", method="pbkdf2:sha256"))
+
+    assert _login(client, "wrong").status_code == 200
+    assert db.session.get(User, user.id).password_hash.startswith("pbkdf2:")
+
+    assert _login(client, "Password123!").status_code == 302
+    db.session.expire_all()
+    stored = db.session.get(User, user.id).password_hash
+    assert stored.startswith("$argon2id$")
+    assert check_password(stored, "Password123!") == (True, False)
+
+
+def test_changed_costs_trigger_a_rehash(app, client):
+    old = Argon2Hasher(time_cost=2, memory_cost=1024, parallelism=1)
+    user = _user(old.hash("Password123!"))
+    assert check_password(user.password_hash, "Password123!") == (True, True)
+
+    assert _login(client, "Password123!").status_code == 302
+    db.session.expire_all()
+    assert "t=1" in db.session.get(User, user.id).password_hash
+
+
+def test_pbkdf2_hasher_can_stay_configured(app):
+    app.config["PASSWORD_HASHER"] = "pbkdf2"
+    stored = generate_password_hash("Password123!", method="pbkdf2:sha256")
+    assert check_password(stored, "Password123!") == (True, False)
+
+    hasher = Pbkdf2Hasher(iterations=1000)
+    assert hasher.hash("x").startswith("pbkdf2:sha256:1000$")
+    assert check_password(stored, "Password123!", hasher) == (True, True)
+
+
+def test_unknown_hashes_never_verify(app):
+    assert check_password("x", "x") == (False, False)
+    assert check_password("$argon2id$garbage", "x") == (False, False)
+
+
+def test_calibration_reaches_the_target():
+    result = calibrate_argon2(0.002, memory_cost=1024, parallelism=1, rounds=1)
+
+    assert result.seconds >= 0.002 or result.time_cost == 50
+    assert result.config_lines()[0] == f"ARGON2_TIME_COST={result.time_cost}"
@@ -0,0 +1,72 @@
+"""EXPLAIN-based checks that the hot queries keep using an index.
+
+Runs on the default SQLite database and, with ``TEST_DATABASE_URL`` pointing
+to PostgreSQL, on PostgreSQL (with sequential scans discouraged so that tiny
+test tables do not hide a missing index).
+"""
+import re
+from datetime import datetime
+
+import pytest
+from flask import current_app
+from app.extensions import db
+from app.models import Match, Tournament, TournamentParticipant
+from app.services.bracket_repository import bracket_query
+from app.services.dashboard import pending_matches_query, pending_table_query
+from app.services.search import InvertedIndex, search_tournaments
+
+FULL_SCAN = re.compile(r"^SCAN \w+$|Seq Scan on")
+
+
+def explain(query) -> list[str]:
+    statement = query.statement if hasattr(query, "statement") else query
+    compiled = statement.compile(db.engine, compile_kwargs={"render_postcompile": True})
+    connection = db.session.connection()
+    if db.engine.dialect.name == "postgresql":
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = connection.exec_driver_sql("EXPLAIN " + str(compiled), compiled.params)
+        return [row[0].strip() for row in rows]
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params)
+    return [row[-1].strip() for row in rows]
+
+
+def _tournament_search():
+    # Give the SQLite fallback index something to match.
+    index = InvertedIndex()
+    index.load([(1, "Chess Open", "chess", None)])
+    current_app.extensions["tournament_search"] = index
+    return search_tournaments(
+        Tournament.query.filter(Tournament.start_at >= datetime.utcnow()), "chess open"
+    )
+
+
+HOT_QUERIES = {
+    "bracket": lambda: bracket_query(1),
+    "participant_of_user": lambda: TournamentParticipant.query.filter_by(
+        tournament_id=1, user_id=1
+    ),
+    "participants_by_ranking": lambda: TournamentParticipant.query.filter_by(
+        tournament_id=1
+    ).order_by(TournamentParticipant.ranking.asc()),
+    "upcoming_tournaments": lambda: Tournament.query.filter(
+        Tournament.start_at >= datetime.utcnow()
+    ).order_by(Tournament.start_at.asc(), Tournament.id.asc()),
+    "tournament_search": _tournament_search,
+    "match_by_position": lambda: Match.query.filter_by(
+        tournament_id=1, stage="main", round_number=2, bracket_position=1
+    ),
+    "pending_matches_for_user": lambda: pending_matches_query(1),
+    "pending_table_for_user": lambda: pending_table_query(1),
+    "tournaments_of_user": lambda: db.session.query(Tournament)
+    .join(TournamentParticipant)
+    .filter(TournamentParticipant.user_id == 1),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_does_not_scan_the_table(app, name):
+    plan = explain(HOT_QUERIES[name]())
+
+    full_scans = [line for line in plan if FULL_SCAN.search(line)]
+    assert not full_scans, f"{name} plan regressed to a sequential scan: {plan}"
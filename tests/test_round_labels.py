@@ -0,0 +1,49 @@
+from app.extensions import db
+from app.models import Tournament
+
+
+def test_seeding_stores_the_bracket_shape(app, make_tournament):
+    tournament = db.session.get(Tournament, make_tournament(5))
+    assert (tournament.bracket_size, tournament.total_rounds) == (8, 3)
+
+
+def test_pool_formats_store_their_round_count(app, make_tournament):
+    tournament = db.session.get(Tournament, make_tournament(5, bracket_format="round_robin"))
+    assert (tournament.bracket_size, tournament.total_rounds) == (5, 5)
+
+
+def test_round_labels():
+    tournament = Tournament(bracket_format="single_elimination", total_rounds=4)
+    assert [tournament.round_label(n) for n in range(1, 5)] == [
+        "Round 1",
+        "Quarti di finale",
+        "Semifinale",
+        "Finale",
+    ]
+
+    double = Tournament(bracket_format="double_elimination", total_rounds=2)
+    assert double.round_label(2) == "Round 2"
+    assert double.round_label(3, "losers") == "Losers round 3"
+    assert double.round_label(1, "final") == "Finale"
+
+    # Not seeded yet: nothing to count from
+    assert Tournament(bracket_format="single_elimination").round_label(1) == "Round 1"
+
+
+def test_dashboard_labels_without_aggregate(
+    app, client, make_tournament, login, assert_max_queries
+):
+    tournament = db.session.get(Tournament, make_tournament(4))
+    login(tournament.participants[0].user_id)
+
+    with assert_max_queries(3) as log:
+        response = client.get("/me/")
+    assert response.status_code == 200
+    assert "(Semifinale)" in response.get_data(as_text=True)
+    assert not any("max(" in statement.lower() for statement in log.sql)
+
+
+def test_bracket_headers_use_round_labels(app, client, make_tournament):
+    body = client.get(f"/tournaments/{make_tournament(4)}").get_data(as_text=True)
+    assert "<h4>Semifinale</h4>" in body
+    assert "<h4>Finale</h4>" in body
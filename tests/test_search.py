@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Tournament, User
+from app.services.search import InvertedIndex
+
+
+def _make_tournaments(*specs) -> dict[str, int]:
+    now = datetime.utcnow()
+    organizer = User(first_name="Org", last_name="User", email="org@example.com", password_hash="x")
+    db.session.add(organizer)
+    db.session.flush()
+    ids = {}
+    for name, discipline, description in specs:
+        tournament = Tournament(
+            organizer_id=organizer.id,
+            name=name,
+            discipline=discipline,
+            description=description,
+            start_at=now + timedelta(days=2),
+            signup_deadline=now + timedelta(days=1),
+            max_participants=8,
+        )
+        db.session.add(tournament)
+        db.session.flush()
+        ids[name] = tournament.id
+    db.session.commit()
+    return ids
+
+
+def test_inverted_index_ranks_name_matches_first():
+    index = InvertedIndex()
+    index.load(
+        [
+            (1, "Spring Cup", "tennis", "Open to chess fans too"),
+            (2, "Chess Masters", "chess", None),
+            (3, "Autumn Open", "football", None),
+        ]
+    )
+
+    assert [tid for tid, _ in index.search("chess")] == [2, 1]
+    assert [tid for tid, _ in index.search("che mast")] == [2]
+    assert index.search("padel") == []
+
+
+def test_listing_search_keeps_the_q_parameter(app, client):
+    _make_tournaments(
+        ("Spring Cup", "tennis", "Friendly chess side event"),
+        ("Chess Masters", "chess", None),
+        ("Autumn Open", "football", None),
+    )
+
+    response = client.get("/tournaments/?q=chess")
+
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert body.index("Chess Masters") < body.index("Spring Cup")
+    assert "Autumn Open" not in body
+
+
+def test_index_follows_edits_and_deletes(app, client):
+    ids = _make_tournaments(("Spring Cup", "tennis", None))
+    assert "Spring Cup" in client.get("/tournaments/?q=spring").get_data(as_text=True)
+
+    tournament = db.session.get(Tournament, ids["Spring Cup"])
+    tournament.name = "Winter Cup"
+    db.session.commit()
+    assert "Winter Cup" in client.get("/tournaments/?q=winter").get_data(as_text=True)
+    assert "Winter Cup" not in client.get("/tournaments/?q=spring").get_data(as_text=True)
+
+    db.session.delete(tournament)
+    db.session.commit()
+    assert "Winter Cup" not in client.get("/tournaments/?q=winter").get_data(as_text=True)
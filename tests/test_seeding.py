@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Match, Tournament
+from app.services.seeding import seed_due_tournaments
+
+
+def test_seed_due_tournaments_seeds_each_tournament_once(app, make_tournament):
+    now = datetime.utcnow()
+    due_id = make_tournament(4, signup_deadline=now - timedelta(hours=1), seed=False)
+    open_id = make_tournament(4, signup_deadline=now + timedelta(hours=1), seed=False)
+
+    assert seed_due_tournaments(now) == [due_id]
+    assert seed_due_tournaments(now) == []
+
+    assert db.session.get(Tournament, due_id).status == Tournament.STATUS_SEEDED
+    assert db.session.get(Tournament, open_id).status == Tournament.STATUS_DRAFT
+    assert Match.query.filter_by(tournament_id=due_id).count() == 3
+
+
+def test_detail_view_never_seeds_or_locks(app, client, make_tournament, assert_max_queries):
+    deadline = datetime.utcnow() - timedelta(hours=1)
+    tournament_id = make_tournament(4, signup_deadline=deadline, seed=False)
+
+    with assert_max_queries(3) as log:
+        response = client.get(f"/tournaments/{tournament_id}")
+
+    assert response.status_code == 200
+    assert b"bracket will be published" in response.data
+    assert not any(statement.startswith(("INSERT", "UPDATE")) for statement in log.sql)
+    assert Match.query.filter_by(tournament_id=tournament_id).count() == 0
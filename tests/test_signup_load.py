@@ -0,0 +1,37 @@
+import pytest
+
+from app.extensions import db
+from app.models import Tournament
+from app.services import report_load, signup_load
+from app.services.signup_load import run_signup_load
+
+
+@pytest.mark.parametrize("engine", ["seat_claim", "locking"])
+def test_concurrent_signups_never_overbook(threaded_app, engine):
+    with threaded_app.app_context():
+        dialect = db.engine.dialect.name
+    if engine == "locking" and dialect == "sqlite":
+        pytest.skip("SQLite has no row locks; run with TEST_DATABASE_URL on PostgreSQL")
+
+    report = run_signup_load(threaded_app, engine, applicants=60, seats=16, threads=8)
+    print(report.summary())
+
+    assert report.errors == 0
+    assert report.outcomes == {"registered": 16, "waitlisted": 44}
+    assert not report.overbooked
+    assert len(report.latencies) == 60
+    assert report.percentile(0.99) >= report.percentile(0.50) > 0
+
+
+@pytest.mark.parametrize("module", [signup_load, report_load], ids=["signups", "reports"])
+def test_load_test_cleanup_leaves_no_trace(app, client, make_tournament, module):
+    tournament_id = make_tournament(4, name="Throwaway Cup", seed=False)
+    organizer_id = db.session.get(Tournament, tournament_id).organizer_id
+    # Cached listing and search index both know the tournament
+    assert "Throwaway Cup" in client.get("/").get_data(as_text=True)
+    assert "Throwaway Cup" in client.get("/tournaments/?q=throwaway").get_data(as_text=True)
+
+    module._cleanup(tournament_id, [organizer_id])
+
+    assert "Throwaway Cup" not in client.get("/").get_data(as_text=True)
+    assert app.extensions["tournament_search"].search("throwaway") == []
@@ -0,0 +1,170 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models import Tournament, TournamentParticipant
+from app.services.seeding import seed_ids
+from app.services.signups import (
+    CLOSED,
+    DUPLICATE,
+    ENGINES,
+    FULL,
+    NOT_FOUND,
+    REGISTERED,
+    WAITLISTED,
+    promote_waitlisted,
+    register_participant,
+)
+
+
+def _count(tournament_id: int) -> int:
+    db.session.expire_all()
+    return db.session.get(Tournament, tournament_id).participant_count
+
+
+def test_orm_inserts_and_deletes_keep_the_counter(app, make_users, make_tournament):
+    user_ids = make_users(3)
+    tournament_id = make_tournament(organizer_id=user_ids[0], max_participants=8, seed=False)
+
+    participants = [
+        TournamentParticipant(
+            tournament_id=tournament_id,
+            user_id=user_id,
+            license_number=f"L{user_id}",
+            ranking=user_id,
+        )
+        for user_id in user_ids
+    ]
+    db.session.add_all(participants)
+    db.session.commit()
+    assert _count(tournament_id) == 3
+
+    db.session.delete(participants[0])
+    db.session.commit()
+    assert _count(tournament_id) == 2
+
+
+def test_seat_claim_fills_the_tournament_without_locking_or_counting(
+    app, make_users, make_tournament, assert_max_queries
+):
+    user_ids = make_users(4)
+    tournament_id = make_tournament(organizer_id=user_ids[0], max_participants=3, seed=False)
+
+    with assert_max_queries(9) as log:
+        outcomes = [
+            register_participant(tournament_id, user_id, f"L{user_id}", user_id)
+            for user_id in user_ids
+        ]
+    statements = log.sql
+
+    assert outcomes == [REGISTERED, REGISTERED, REGISTERED, WAITLISTED]
+    assert not any("FOR UPDATE" in statement for statement in statements)
+    assert not any("count(" in statement.lower() for statement in statements)
+    assert _count(tournament_id) == 3
+    waitlisted = TournamentParticipant.query.filter_by(
+        tournament_id=tournament_id, status=TournamentParticipant.STATUS_WAITLISTED
+    ).one()
+    assert waitlisted.user_id == user_ids[3]
+
+
+def test_refused_signups_give_the_seat_back(app, make_users, make_tournament):
+    user_ids = make_users(3)
+    tournament_id = make_tournament(organizer_id=user_ids[0], max_participants=8, seed=False)
+
+    assert register_participant(tournament_id, user_ids[0], "L1", 1) == REGISTERED
+    assert register_participant(tournament_id, user_ids[1], "L1", 2) == DUPLICATE
+    assert _count(tournament_id) == 1
+
+    later = datetime.utcnow() + timedelta(days=1, hours=1)
+    assert register_participant(tournament_id, user_ids[2], "L3", 3, now=later) == CLOSED
+    assert _count(tournament_id) == 1
+
+
+def test_apply_form_uses_the_seat_claim(app, client, make_users, make_tournament, login):
+    user_ids = make_users(2)
+    tournament_id = make_tournament(organizer_id=user_ids[0], max_participants=1, seed=False)
+
+    login(user_ids[1])
+    response = client.post(
+        f"/tournaments/{tournament_id}",
+        data={"license_number": "LIC-1", "ranking": 1},
+        follow_redirects=True,
+    )
+    assert "Application submitted." in response.get_data(as_text=True)
+    assert _count(tournament_id) == 1
+    participant = TournamentParticipant.query.filter_by(tournament_id=tournament_id).one()
+    assert participant.status == "pending"
+    assert participant.created_at is not None
+
+
+def test_engines_agree_on_outcomes(app, make_users, make_tournament):
+    user_ids = make_users(3)
+    now = datetime.utcnow()
+    for engine in sorted(ENGINES):
+        tournament_id = make_tournament(organizer_id=user_ids[0], max_participants=1, seed=False)
+        outcomes = [
+            register_participant(tournament_id, user_id, f"L{user_id}", user_id, engine=engine)
+            for user_id in user_ids[:2]
+        ]
+        assert outcomes == [REGISTERED, WAITLISTED], engine
+        assert _count(tournament_id) == 1
+
+        app.config["SIGNUP_WAITLIST"] = False
+        assert register_participant(tournament_id, user_ids[2], "L3", 3, engine=engine) == FULL
+        app.config["SIGNUP_WAITLIST"] = True
+
+        later = now + timedelta(days=1, hours=1)
+        assert (
+            register_participant(tournament_id, user_ids[2], "L3", 3, now=later, engine=engine)
+            == CLOSED
+        )
+
+
+def test_waitlisted_participants_are_not_seeded(app, make_users, make_tournament):
+    user_ids = make_users(3)
+    tournament_id = make_tournament(organizer_id=user_ids[0], max_participants=2, seed=False)
+    for user_id in user_ids:
+        register_participant(tournament_id, user_id, f"L{user_id}", user_id)
+
+    seeded = seed_ids(tournament_id)
+    assert len(seeded) == 2
+    waitlisted = TournamentParticipant.query.filter_by(status="waitlisted").one()
+    assert waitlisted.id not in seeded
+
+
+
+def test_waitlist_promotions_respect_capacity(app, make_users, make_tournament):
+    user_ids = make_users(3)
+    tournament_id = make_tournament(organizer_id=user_ids[0], max_participants=2, seed=False)
+    for user_id in user_ids:
+        register_participant(tournament_id, user_id, f"L{user_id}", user_id)
+    waitlisted = TournamentParticipant.query.filter_by(status="waitlisted").one()
+    waitlisted_id = waitlisted.id
+
+    waitlisted.status = TournamentParticipant.STATUS_PENDING
+    with pytest.raises(ValueError):
+        db.session.commit()
+    db.session.rollback()
+
+    assert promote_waitlisted(waitlisted_id) == FULL
+    seated = TournamentParticipant.query.filter_by(
+        tournament_id=tournament_id, status="pending"
+    ).first()
+    db.session.delete(seated)
+    db.session.commit()
+    assert _count(tournament_id) == 1
+
+    assert promote_waitlisted(waitlisted_id) == REGISTERED
+    assert _count(tournament_id) == 2
+    assert db.session.get(TournamentParticipant, waitlisted_id).status == "pending"
+    assert promote_waitlisted(waitlisted_id) == NOT_FOUND
+
+
+def test_deleting_a_tournament_skips_the_counter_updates(app, make_tournament, assert_max_queries):
+    tournament = db.session.get(Tournament, make_tournament(4, seed=False))
+
+    with assert_max_queries(4) as log:
+        db.session.delete(tournament)
+        db.session.commit()
+    assert not any(statement.startswith("UPDATE tournaments") for statement in log.sql)